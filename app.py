@@ -288,11 +288,12 @@ def setup_merino_background_services(socketio, socket_handlers, config):
                 if socket_handlers.get_connected_clients_count() > 0:
                     logger.info(f"🔄 Iniciando análisis automático Merino para {len(config.TRADING_SYMBOLS)} símbolos")
                     
-                    for symbol in config.TRADING_SYMBOLS:
+                    # Análisis completo según Merino (todos los símbolos en paralelo;
+                    # los 429 de Binance se reintentan con backoff en BinanceService)
+                    analyses = enhanced_analysis_service.analyze_symbols_merino(config.TRADING_SYMBOLS)
+                    
+                    for symbol, analysis in analyses.items():
                         try:
-                            # Análisis completo según Merino
-                            analysis = enhanced_analysis_service.analyze_symbol_merino(symbol)
-                            
                             if analysis:
                                 # Broadcast del análisis
                                 socket_handlers.broadcast_merino_analysis(symbol, analysis)
@@ -301,9 +302,6 @@ def setup_merino_background_services(socketio, socket_handlers, config):
                                 signal_strength = analysis.get('signal', {}).get('signal_strength', 0)
                                 if signal_strength >= config.SIGNALS['min_strength_for_trade']:
                                     logger.info(f"🎯 SEÑAL MERINO: {symbol} - {analysis.get('signal', {}).get('signal', 'UNKNOWN')} ({signal_strength}%)")
-                                
-                                # Pausa entre análisis para no sobrecargar
-                                time.sleep(5)
                             else:
                                 logger.warning(f"⚠️ Análisis Merino falló para {symbol}")
                                 
@@ -463,10 +461,11 @@ def perform_initial_merino_analysis(socket_handlers, config):
         completed = 0
         high_probability_signals = 0
         
-        for symbol in config.TRADING_SYMBOLS:
+        # Todos los símbolos en paralelo, igual que el análisis automático
+        analyses = enhanced_analysis_service.analyze_symbols_merino(config.TRADING_SYMBOLS)
+        
+        for symbol, analysis in analyses.items():
             try:
-                analysis = enhanced_analysis_service.analyze_symbol_merino(symbol)
-                
                 if analysis:
                     socket_handlers.cache_merino_analysis(symbol, analysis)
                     completed += 1
@@ -481,9 +480,6 @@ def perform_initial_merino_analysis(socket_handlers, config):
                 else:
                     logger.warning(f"⚠️ Análisis inicial falló: {symbol}")
                 
-                # Pausa entre análisis
-                time.sleep(3)
-                
             except Exception as e:
                 logger.error(f"❌ Error en análisis inicial de {symbol}: {e}")
                 continue
@@ -214,7 +214,7 @@ class MerinoBacktester:
                 
                 # Datos hasta el momento actual
                 current_df = df.iloc[:i+1]
-                current_price = df.iloc[i]['close']
+                current_price = float(df.iloc[i]['close'])
                 
                 # Verificar posiciones abiertas
                 self._check_open_positions(symbol, current_time, current_price, current_df)
@@ -270,10 +270,9 @@ class MerinoBacktester:
             df = binance_service.get_klines(symbol, timeframe, limit)
             
             if df is not None and len(df) > 0:
-                # Filtrar por fechas si es necesario
-                df = df[df['timestamp'] >= start_date - timedelta(days=100)]
-                df = df[df['timestamp'] <= end_date]
-                df.set_index('timestamp', inplace=True)
+                # get_klines indexa por open time en ms; aquí se necesitan fechas
+                df.index = pd.to_datetime(df.index, unit='ms')
+                df = df[(df.index >= start_date - timedelta(days=100)) & (df.index <= end_date)]
                 return df
             else:
                 backtest_logger.warning(f"⚠️ No se pudieron obtener datos históricos para {symbol}")
@@ -15,6 +15,7 @@ from flask import Flask, render_template, jsonify, request
 import sys
 from typing import Dict, Optional, List
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from utils.json_utils import json_loads
 
 try:
     from services.binance_service import BinanceService
@@ -167,7 +168,7 @@ def _get_binance_api_direct() -> Optional[Dict[str, float]]:
         response = requests.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
-        all_tickers = response.json()
+        all_tickers = json_loads(response.content)
         
         # Filtrar solo los símbolos que necesitamos
         prices = {}
@@ -238,7 +239,7 @@ def _get_coingecko_prices() -> Optional[Dict[str, float]]:
         response = requests.get(url, headers=headers, timeout=15)
         response.raise_for_status()
         
-        data = response.json()
+        data = json_loads(response.content)
         
         # Convertir de vuelta a símbolos de trading
         prices = {}
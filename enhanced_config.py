@@ -22,6 +22,17 @@ class MerinoConfig:
     BINANCE_API_KEY = os.environ.get('BINANCE_API_KEY', '')
     BINANCE_SECRET_KEY = os.environ.get('BINANCE_SECRET_KEY', '')
     
+    # Cache de precios (segundos): fresco se sirve directo; hasta STALE se sirve
+    # el valor cacheado y se refresca en segundo plano
+    PRICE_CACHE_FRESH_TTL = float(os.environ.get('PRICE_CACHE_FRESH_TTL', 5))
+    PRICE_CACHE_STALE_TTL = float(os.environ.get('PRICE_CACHE_STALE_TTL', 30))
+    # Redis opcional para compartir el cache de precios entre workers; conviene
+    # configurarlo con maxmemory-policy allkeys-lfu
+    REDIS_URL = os.environ.get('REDIS_URL', '')
+    
+    # Precios por WebSocket (!miniTicker@arr) en lugar de polling REST
+    PRICE_STREAM_ENABLED = os.environ.get('PRICE_STREAM_ENABLED', 'False').lower() == 'true'
+    
     # Símbolos principales según Jaime Merino (foco en Bitcoin y principales altcoins)
     TRADING_SYMBOLS = [
         'BTCUSDT',    # Bitcoin - Principal
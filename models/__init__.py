@@ -5,7 +5,7 @@ Metodología Trading Latino - Análisis Técnico Avanzado
 """
 
 # Modelos originales (mantener compatibilidad)
-from .trading_analysis import TradingAnalysis, MarketData, TechnicalIndicators, create_analysis
+from .trading_analysis import TradingAnalysis, MarketData, TechnicalIndicators, Klines, create_analysis
 
 # Modelos mejorados para metodología Jaime Merino
 from .enhanced_trading_model import (
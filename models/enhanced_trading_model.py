@@ -3,8 +3,48 @@ Modelos de datos mejorados para análisis según metodología Jaime Merino
 """
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict, List, Any
 import json
+import sys
+import numpy as np
+
+# Columnas de cada fila en high_volume_levels (ordenadas por volumen desc, fila 0 = VPoC)
+HIGH_VOLUME_LEVEL_COLUMNS = ('price', 'volume')
+
+@lru_cache(maxsize=4)
+def _iso_seconds(ts: datetime) -> str:
+    """isoformat() de un datetime truncado a segundos (compartido entre análisis del mismo segundo)"""
+    return ts.isoformat()
+
+def _isoformat(ts: datetime) -> str:
+    """Equivalente a ts.isoformat() reutilizando el formateo por segundo"""
+    if ts.tzinfo is not None:
+        return ts.isoformat()
+    base = _iso_seconds(ts.replace(microsecond=0))
+    return f"{base}.{ts.microsecond:06d}" if ts.microsecond else base
+
+def _intern(value: Any, default: str) -> str:
+    """Interna strings de alfabeto fijo (señal, sesgo, fuerza) para comparar por identidad"""
+    return sys.intern(value) if isinstance(value, str) else default
+
+def _last_emas(df, fast: int = 11, slow: int = 55) -> tuple:
+    """Últimos valores de EMA rápida/lenta sobre el cierre de un DataFrame de klines"""
+    if df is None or len(df) == 0:
+        return 0.0, 0.0
+    # Import diferido: importar los modelos no debe arrastrar la capa de
+    # servicios ni compilar los kernels de Numba
+    from services.kernels import ewma_last_pair
+    return ewma_last_pair(df['close'].to_numpy(dtype=np.float64), fast, slow)
+
+def _high_volume_levels_array(levels: Optional[List[Dict]]) -> np.ndarray:
+    """Convierte la lista de niveles de volumen en un array (N, 2) de float64"""
+    if not levels:
+        return np.empty((0, len(HIGH_VOLUME_LEVEL_COLUMNS)), dtype=np.float64)
+    return np.array(
+        [(level['price'], level['volume']) for level in levels],
+        dtype=np.float64
+    ).reshape(-1, len(HIGH_VOLUME_LEVEL_COLUMNS))
 
 @dataclass
 class MerinoTechnicalIndicators:
@@ -35,7 +75,7 @@ class MerinoTechnicalIndicators:
     # Volume Profile
     vpoc: float  # Volume Point of Control
     vpoc_distance_pct: float
-    high_volume_levels: List[Dict]
+    high_volume_levels: np.ndarray  # (N, 2): price, volume
     
     # Indicadores adicionales
     rsi_4h: float
@@ -147,7 +187,9 @@ class MerinoTradingAnalysis:
         """Convierte a diccionario para JSON"""
         result = asdict(self)
         # Convertir datetime a string
-        result['timestamp'] = self.timestamp.isoformat()
+        result['timestamp'] = _isoformat(self.timestamp)
+        # Arrays NumPy a listas solo en la frontera JSON
+        result['indicators']['high_volume_levels'] = self.indicators.high_volume_levels.tolist()
         return result
     
     def to_json(self) -> str:
@@ -180,17 +222,28 @@ def create_merino_analysis(
     Factory function para crear análisis completo de Merino
     """
     try:
+        volume_data = merino_signal_data.get('volume_profile') or {}
+        adx_data = (merino_signal_data.get('timeframe_4h') or {}).get('adx') or {}
+        signal_type = _intern(merino_signal_data.get('signal'), 'NO_SIGNAL')
+        bias = _intern(merino_signal_data.get('bias'), 'NEUTRAL')
+        adx_strength = _intern(adx_data.get('strength'), 'DEBIL')
+        
+        # EMAs 11/55 por timeframe
+        ema_11_4h, ema_55_4h = _last_emas(df_4h)
+        ema_11_1h, ema_55_1h = _last_emas(df_1h)
+        ema_11_daily, ema_55_daily = _last_emas(df_daily)
+        
         # Crear indicadores básicos
         indicators = MerinoTechnicalIndicators(
-            ema_11_4h=0,
-            ema_55_4h=0,
-            ema_11_1h=0,
-            ema_55_1h=0,
-            ema_11_daily=0,
-            ema_55_daily=0,
+            ema_11_4h=ema_11_4h,
+            ema_55_4h=ema_55_4h,
+            ema_11_1h=ema_11_1h,
+            ema_55_1h=ema_55_1h,
+            ema_11_daily=ema_11_daily,
+            ema_55_daily=ema_55_daily,
             adx=0,
             adx_modified=-23,
-            adx_strength='DEBIL',
+            adx_strength=adx_strength,
             adx_slope=0,
             adx_trending=False,
             adx_strengthening=False,
@@ -199,7 +252,7 @@ def create_merino_analysis(
             squeeze_just_released=False,
             vpoc=current_price,
             vpoc_distance_pct=0,
-            high_volume_levels=[],
+            high_volume_levels=_high_volume_levels_array(volume_data.get('high_volume_levels')),
             rsi_4h=50
         )
         
@@ -218,9 +271,9 @@ def create_merino_analysis(
         
         # Crear señal
         signal = MerinoSignal(
-            signal='NO_SIGNAL',
+            signal=signal_type,
             signal_strength=0,
-            bias_4h='NEUTRAL',
+            bias_4h=bias,
             confluence_score=0,
             reasons=[],
             invalidation_conditions=[],
@@ -261,7 +314,8 @@ def create_merino_analysis(
                 adx_strength='DEBIL', adx_slope=0, adx_trending=False,
                 adx_strengthening=False, squeeze_momentum=0, squeeze_on=True,
                 squeeze_just_released=False, vpoc=current_price,
-                vpoc_distance_pct=0, high_volume_levels=[], rsi_4h=50
+                vpoc_distance_pct=0, high_volume_levels=_high_volume_levels_array(None),
+                rsi_4h=50
             ),
             market_context=MerinoMarketContext(
                 macro_trend='UNKNOWN', weekly_bias='NEUTRAL', daily_bias='NEUTRAL',
@@ -2,12 +2,14 @@
 Modelos de datos para análisis de trading
 """
 from datetime import datetime
-from typing import Optional, List, Dict
-from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Callable, Optional, List, Dict, NamedTuple, Union
+from dataclasses import InitVar, asdict, dataclass
+import numpy as np
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
-    """Datos de mercado para un símbolo"""
+    """Datos de mercado para un símbolo (con __slots__: se crea uno por símbolo y tick)"""
     symbol: str
     open_price: float
     high_price: float
@@ -15,6 +17,17 @@ class MarketData:
     close_price: float
     volume: float
     timestamp: datetime
+    price_change: float = 0.0
+    price_change_percent: float = 0.0
+
+class Klines(NamedTuple):
+    """Velas OHLCV como columnas NumPy (timestamp en ms, precios en float64)"""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
 
 @dataclass
 class TechnicalIndicators:
@@ -27,24 +40,69 @@ class TechnicalIndicators:
     bb_upper: float
     bb_middle: float
     bb_lower: float
+    macd: Optional[float] = None
+    macd_signal: Optional[float] = None
+
+TextSource = Union[str, Callable[[], str]]
 
 @dataclass
 class TradingAnalysis:
-    """Análisis completo de trading"""
+    """
+    Análisis completo de trading
+    Los textos (análisis y recomendación) se generan al primer acceso
+    """
     symbol: str
     market_data: MarketData
     indicators: TechnicalIndicators
     signal: str
     signal_strength: float
     trend_bias: str
-    analysis_text: str
     timestamp: datetime
+    analysis_text_fn: InitVar[Callable[[], str]]
+    recommendation_fn: InitVar[Callable[[], str]]
+    
+    def __post_init__(self, analysis_text_fn: Callable[[], str],
+                      recommendation_fn: Callable[[], str]):
+        self._analysis_text_fn = analysis_text_fn
+        self._recommendation_fn = recommendation_fn
+    
+    @cached_property
+    def analysis_text(self) -> str:
+        """Texto detallado del análisis"""
+        return self._analysis_text_fn()
+    
+    @cached_property
+    def recommendation(self) -> str:
+        """Recomendación de trading"""
+        return self._recommendation_fn()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convierte a diccionario para JSON (genera los textos)"""
+        result = asdict(self)
+        result['analysis_text'] = self.analysis_text
+        result['recommendation'] = self.recommendation
+        result['timestamp'] = self.timestamp.isoformat()
+        return result
+
+def _text_source(text: TextSource) -> Callable[[], str]:
+    """Normaliza un texto ya generado o un callable que lo genera"""
+    if callable(text):
+        return text
+    return lambda: text
 
 def create_analysis(symbol: str, market_data: MarketData, 
                    indicators: TechnicalIndicators, signal: str,
                    signal_strength: float, trend_bias: str,
-                   analysis_text: str) -> TradingAnalysis:
-    """Crea un objeto TradingAnalysis"""
+                   analysis_text: TextSource, recommendation: TextSource = '',
+                   timestamp: Optional[datetime] = None) -> TradingAnalysis:
+    """
+    Crea un objeto TradingAnalysis
+    
+    Args:
+        analysis_text: Texto del análisis o callable sin argumentos que lo genera
+        recommendation: Recomendación o callable sin argumentos que la genera
+        timestamp: Momento del análisis (por defecto, ahora)
+    """
     return TradingAnalysis(
         symbol=symbol,
         market_data=market_data,
@@ -52,6 +110,7 @@ def create_analysis(symbol: str, market_data: MarketData,
         signal=signal,
         signal_strength=signal_strength,
         trend_bias=trend_bias,
-        analysis_text=analysis_text,
-        timestamp=datetime.now()
+        timestamp=timestamp or datetime.now(),
+        analysis_text_fn=_text_source(analysis_text),
+        recommendation_fn=_text_source(recommendation)
     )
\ No newline at end of file
@@ -2,11 +2,15 @@
 Indicadores técnicos mejorados siguiendo la metodología de Jaime Merino
 Incluye: Squeeze Momentum, Volume Profile, ADX modificado
 """
+import logging
 import pandas as pd
 import numpy as np
 from typing import Optional, Tuple, Dict
 import ta
 from models.trading_analysis import TechnicalIndicators
+from services.kernels import (
+    COMPILED_KERNELS, adx_kernel, move_mean, move_std, move_max, move_min, squeeze_kernel
+)
 from utils.logger import analysis_logger
 
 logger = analysis_logger
@@ -16,6 +20,50 @@ class JaimeMerinoIndicators:
     Calculadora de indicadores específicos de la metodología Jaime Merino
     """
     
+    @staticmethod
+    def _squeeze_arrays(df: pd.DataFrame, bb_length: int, kc_length: int,
+                        kc_mult: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Núcleo del Squeeze Momentum sobre ndarrays: (momentum, squeeze_on, squeeze_off)"""
+        h = df['high'].to_numpy(dtype=np.float64)
+        l = df['low'].to_numpy(dtype=np.float64)
+        c = df['close'].to_numpy(dtype=np.float64)
+        
+        if COMPILED_KERNELS:
+            # Kernel compilado: una sola pasada sin arrays intermedios
+            momentum, squeeze_on, squeeze_off = squeeze_kernel(
+                h, l, c, bb_length, kc_length, float(kc_mult)
+            )
+        else:
+            # Bollinger Bands
+            bb_basis = move_mean(c, bb_length)
+            bb_dev = kc_mult * move_std(c, bb_length)
+            bb_upper = bb_basis + bb_dev
+            bb_lower = bb_basis - bb_dev
+            
+            # Keltner Channels
+            kc_basis = move_mean(c, kc_length)
+            c_prev = np.empty_like(c)
+            c_prev[0] = np.nan
+            c_prev[1:] = c[:-1]
+            # fmax ignora NaN (primera vela) igual que DataFrame.max(axis=1)
+            tr = np.fmax.reduce([h - l, np.abs(h - c_prev), np.abs(l - c_prev)])
+            
+            kc_range = move_mean(tr, kc_length) * kc_mult
+            kc_upper = kc_basis + kc_range
+            kc_lower = kc_basis - kc_range
+            
+            # Squeeze detection
+            squeeze_on = (bb_lower > kc_lower) & (bb_upper < kc_upper)
+            squeeze_off = (bb_lower < kc_lower) | (bb_upper > kc_upper)
+            
+            # Momentum calculation
+            highest = move_max(h, kc_length)
+            lowest = move_min(l, kc_length)
+            m1 = (highest + lowest) / 2
+            momentum = c - ((m1 + kc_basis) / 2)
+        
+        return momentum, squeeze_on, squeeze_off
+    
     @staticmethod
     def calculate_squeeze_momentum(df: pd.DataFrame, bb_length: int = 20, 
                                  kc_length: int = 20, kc_mult: float = 1.5) -> pd.Series:
@@ -33,37 +81,14 @@ class JaimeMerinoIndicators:
             Serie con valores del Squeeze Momentum
         """
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            # Bollinger Bands
-            bb_basis = close.rolling(window=bb_length).mean()
-            bb_dev = kc_mult * close.rolling(window=bb_length).std()
-            bb_upper = bb_basis + bb_dev
-            bb_lower = bb_basis - bb_dev
-            
-            # Keltner Channels
-            kc_basis = close.rolling(window=kc_length).mean()
-            tr = pd.concat([
-                high - low,
-                abs(high - close.shift(1)),
-                abs(low - close.shift(1))
-            ], axis=1).max(axis=1)
-            
-            kc_range = tr.rolling(window=kc_length).mean() * kc_mult
-            kc_upper = kc_basis + kc_range
-            kc_lower = kc_basis - kc_range
-            
-            # Squeeze detection
-            squeeze_on = (bb_lower > kc_lower) & (bb_upper < kc_upper)
-            squeeze_off = (bb_lower < kc_lower) | (bb_upper > kc_upper)
+            momentum, squeeze_on, squeeze_off = JaimeMerinoIndicators._squeeze_arrays(
+                df, bb_length, kc_length, kc_mult
+            )
             
-            # Momentum calculation
-            highest = high.rolling(window=kc_length).max()
-            lowest = low.rolling(window=kc_length).min()
-            m1 = (highest + lowest) / 2
-            momentum = close - ((m1 + kc_basis) / 2)
+            index = df.index
+            momentum = pd.Series(momentum, index=index)
+            squeeze_on = pd.Series(squeeze_on, index=index)
+            squeeze_off = pd.Series(squeeze_off, index=index)
             
             logger.debug("✅ Squeeze Momentum calculado")
             return momentum, squeeze_on, squeeze_off
@@ -73,6 +98,37 @@ class JaimeMerinoIndicators:
             empty_series = pd.Series([np.nan] * len(df), index=df.index)
             return empty_series, empty_series, empty_series
     
+    @staticmethod
+    def calculate_squeeze_momentum_last(df: pd.DataFrame, bb_length: int = 20,
+                                        kc_length: int = 20,
+                                        kc_mult: float = 1.5) -> Tuple[float, bool, bool]:
+        """
+        Squeeze Momentum solo de la última vela (sin construir el histórico)
+        
+        Args:
+            df: DataFrame con datos OHLCV
+            bb_length: Período para Bollinger Bands
+            kc_length: Período para Keltner Channels
+            kc_mult: Multiplicador para Keltner Channels
+            
+        Returns:
+            Tupla (momentum, squeeze_on, squeeze_off) de la última vela
+        """
+        if len(df) == 0:
+            return 0.0, False, False
+        
+        try:
+            # Basta la ventana más larga; KC necesita además el cierre previo para el TR
+            recent = df.tail(max(bb_length, kc_length + 1))
+            momentum, squeeze_on, squeeze_off = JaimeMerinoIndicators._squeeze_arrays(
+                recent, bb_length, kc_length, kc_mult
+            )
+            return float(momentum[-1]), bool(squeeze_on[-1]), bool(squeeze_off[-1])
+            
+        except Exception as e:
+            logger.error(f"❌ Error calculando Squeeze Momentum: {e}")
+            return np.nan, False, False
+    
     @staticmethod
     def calculate_volume_profile_vpoc(df: pd.DataFrame, lookback: int = 100) -> Dict:
         """
@@ -90,37 +146,39 @@ class JaimeMerinoIndicators:
             if len(df) < lookback:
                 lookback = len(df)
             
-            recent_df = df.tail(lookback).copy()
+            # Solo lectura: columnas de la cola como ndarrays, sin copiar el DataFrame
+            # (float64 para los cálculos aunque las klines vengan en float32)
+            recent_df = df.tail(lookback)
+            high = recent_df['high'].to_numpy(dtype=np.float64)
+            low = recent_df['low'].to_numpy(dtype=np.float64)
+            close = recent_df['close'].to_numpy(dtype=np.float64)
+            volume = recent_df['volume'].to_numpy(dtype=np.float64)
             
             # Crear bins de precio
-            price_min = recent_df['low'].min()
-            price_max = recent_df['high'].max()
+            price_min = low.min()
+            price_max = high.max()
             num_bins = min(50, lookback // 2)  # Número de bins adaptativo
             
             price_bins = np.linspace(price_min, price_max, num_bins)
-            volume_profile = np.zeros(len(price_bins) - 1)
-            
-            # Distribuir volumen en bins
-            for i, row in recent_df.iterrows():
-                # Precio típico del período
-                typical_price = (row['high'] + row['low'] + row['close']) / 3
-                
-                # Encontrar bin correspondiente
-                bin_idx = np.digitize(typical_price, price_bins) - 1
-                bin_idx = max(0, min(bin_idx, len(volume_profile) - 1))
-                
-                # Asignar volumen
-                volume_profile[bin_idx] += row['volume']
+
+            # Precio típico de cada período
+            typical_price = (high + low + close) / 3.0
+
+            # Distribuir volumen en bins (suma ponderada vectorizada)
+            volume_profile, _ = np.histogram(typical_price, bins=price_bins, weights=volume)
             
             # Encontrar VPoC (precio con mayor volumen)
             vpoc_idx = np.argmax(volume_profile)
             vpoc_price = (price_bins[vpoc_idx] + price_bins[vpoc_idx + 1]) / 2
             
             # Niveles de soporte y resistencia basados en volumen
-            sorted_indices = np.argsort(volume_profile)[::-1]  # Ordenar por volumen desc
+            # Top 5 por selección parcial O(n); solo esos se ordenan por volumen desc
+            k = min(5, len(volume_profile))
+            top = np.argpartition(volume_profile, -k)[-k:]
+            sorted_indices = top[np.argsort(-volume_profile[top])]
             
             high_volume_levels = []
-            for i in range(min(5, len(sorted_indices))):  # Top 5 niveles
+            for i in range(k):  # Top 5 niveles
                 idx = sorted_indices[i]
                 level_price = (price_bins[idx] + price_bins[idx + 1]) / 2
                 level_volume = volume_profile[idx]
@@ -130,22 +188,24 @@ class JaimeMerinoIndicators:
                     'type': 'vpoc' if i == 0 else 'high_volume'
                 })
             
+            current_price = float(close[-1])
             result = {
                 'vpoc': vpoc_price,
                 'high_volume_levels': high_volume_levels,
-                'current_price': df['close'].iloc[-1],
-                'vpoc_distance_pct': ((df['close'].iloc[-1] - vpoc_price) / vpoc_price) * 100
+                'current_price': current_price,
+                'vpoc_distance_pct': ((current_price - vpoc_price) / vpoc_price) * 100
             }
             
-            logger.debug(f"✅ Volume Profile calculado - VPoC: ${vpoc_price:.4f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ Volume Profile calculado - VPoC: ${vpoc_price:.4f}")
             return result
             
         except Exception as e:
             logger.error(f"❌ Error calculando Volume Profile: {e}")
             return {
-                'vpoc': df['close'].iloc[-1] if len(df) > 0 else 0,
+                'vpoc': float(df['close'].iloc[-1]) if len(df) > 0 else 0,
                 'high_volume_levels': [],
-                'current_price': df['close'].iloc[-1] if len(df) > 0 else 0,
+                'current_price': float(df['close'].iloc[-1]) if len(df) > 0 else 0,
                 'vpoc_distance_pct': 0
             }
     
@@ -164,18 +224,22 @@ class JaimeMerinoIndicators:
             Diccionario con ADX y valores modificados
         """
         try:
-            # ADX tradicional
-            adx_indicator = ta.trend.ADXIndicator(high=high, low=low, close=close, window=period)
-            adx = adx_indicator.adx()
-            adx_pos = adx_indicator.adx_pos()
-            adx_neg = adx_indicator.adx_neg()
-            
-            # Modificación de Merino: punto 23 como 0
-            adx_modified = adx - 23
+            # ADX tradicional (+DI/-DI del mismo suavizado)
+            if COMPILED_KERNELS:
+                adx, adx_pos, adx_neg = adx_kernel(
+                    high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                    close.to_numpy(dtype=np.float64), period
+                )
+            else:
+                adx_indicator = ta.trend.ADXIndicator(high=high, low=low, close=close, window=period)
+                adx = adx_indicator.adx().to_numpy()
+                adx_pos = adx_indicator.adx_pos().to_numpy()
+                adx_neg = adx_indicator.adx_neg().to_numpy()
             
             # Clasificación de fuerza de tendencia según Merino
-            current_adx = adx.iloc[-1] if not adx.empty else 0
-            current_adx_mod = adx_modified.iloc[-1] if not adx_modified.empty else -23
+            current_adx = adx[-1] if len(adx) else 0
+            # Modificación de Merino: punto 23 como 0
+            current_adx_mod = current_adx - 23 if len(adx) else -23
             
             if current_adx > 50:
                 strength = "MUY_FUERTE"
@@ -189,20 +253,21 @@ class JaimeMerinoIndicators:
             # Pendiente del ADX para determinar si la tendencia se fortalece
             adx_slope = 0
             if len(adx) >= 3:
-                adx_slope = (adx.iloc[-1] - adx.iloc[-3]) / 2
+                adx_slope = (adx[-1] - adx[-3]) / 2
             
             result = {
                 'adx': current_adx,
                 'adx_modified': current_adx_mod,
-                'adx_pos': adx_pos.iloc[-1] if not adx_pos.empty else 0,
-                'adx_neg': adx_neg.iloc[-1] if not adx_neg.empty else 0,
+                'adx_pos': adx_pos[-1] if len(adx_pos) else 0,
+                'adx_neg': adx_neg[-1] if len(adx_neg) else 0,
                 'strength': strength,
                 'slope': adx_slope,
                 'trending': current_adx > 25,
                 'strengthening': adx_slope > 0.5
             }
             
-            logger.debug(f"✅ ADX modificado calculado: {current_adx:.1f} ({strength})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ ADX modificado calculado: {current_adx:.1f} ({strength})")
             return result
             
         except Exception as e:
@@ -244,9 +309,7 @@ class JaimeMerinoSignalGenerator:
             )
             
             # 3. Squeeze Momentum en 4H
-            momentum, squeeze_on, squeeze_off = self.indicators.calculate_squeeze_momentum(df_4h)
-            current_momentum = momentum.iloc[-1] if not momentum.empty else 0
-            is_squeeze = squeeze_on.iloc[-1] if not squeeze_on.empty else False
+            current_momentum, is_squeeze, _ = self.indicators.calculate_squeeze_momentum_last(df_4h)
             
             # 4. Volume Profile
             volume_data = self.indicators.calculate_volume_profile_vpoc(df_4h)
@@ -1,9 +1,14 @@
 """
 Servicio principal de análisis técnico
 """
+import threading
+import time
+from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
-from services.binance_service import binance_service
+from typing import Dict, List, Optional, Tuple
+from services.binance_service import BinanceService, get_binance_service
 from services.indicators import indicators_calculator, signal_generator
 from models.trading_analysis import TradingAnalysis, create_analysis
 from utils.logger import analysis_logger
@@ -11,126 +16,67 @@ from config import Config
 
 logger = analysis_logger
 
-class AnalysisService:
+# Ventana (segundos) en la que se reutiliza el análisis de un símbolo
+ANALYSIS_CACHE_TTL = 60
+# Cache en dos niveles: L1 de acceso directo (slot = hash(symbol) % slots)
+# para los símbolos del dashboard y L2 LRU acotado para el resto
+ANALYSIS_L1_SLOTS = 16
+ANALYSIS_L2_SIZE = 128
+
+# Hilos máximos para las descargas de analyze_symbols (2 requests por símbolo)
+BATCH_MAX_WORKERS = 16
+
+# Última marca de tiempo formateada: (segundo unix, texto)
+_last_timestamp: Tuple[int, str] = (0, '')
+
+def _timestamp_str(timestamp: datetime) -> str:
     """
-    Servicio principal para realizar análisis técnico completo
+    Fecha/hora como 'dd/mm/YYYY HH:MM:SS'; los análisis creados en el mismo
+    segundo comparten un único strftime
     """
-    
-    def __init__(self):
-        """Inicializa el servicio de análisis"""
-        self.binance = binance_service
-        self.indicators_calc = indicators_calculator
-        self.signal_gen = signal_generator
-        logger.info("🚀 Servicio de análisis inicializado")
-    
-    def analyze_symbol(self, symbol: str) -> Optional[TradingAnalysis]:
-        """
-        Realiza análisis técnico completo para un símbolo
-        
-        Args:
-            symbol: Símbolo a analizar (ej: 'BTCUSDT')
-            
-        Returns:
-            TradingAnalysis completo o None si hay error
-        """
-        try:
-            logger.info(f"📊 Iniciando análisis de {symbol}")
-            
-            # 1. Obtener datos de mercado
-            market_data = self.binance.get_market_data(symbol)
-            if not market_data:
-                logger.error(f"❌ No se pudieron obtener datos de mercado para {symbol}")
-                return None
-            
-            # 2. Obtener datos históricos para indicadores
-            df = self.binance.get_klines(symbol, interval='1h', limit=100)
-            if df is None or len(df) < 55:
-                logger.error(f"❌ Insuficientes datos históricos para {symbol}")
-                return None
-            
-            # 3. Calcular indicadores técnicos
-            indicators = self.indicators_calc.calculate_all_indicators(df)
-            
-            # 4. Generar señal de trading
-            signal, base_strength = self.signal_gen.generate_ema_signal(
-                indicators.ema_11, indicators.ema_55, market_data.close_price
-            )
-            
-            # 5. Determinar sesgo de tendencia
-            trend_bias = self.signal_gen.determine_trend_bias(
-                indicators.ema_11, indicators.ema_55, indicators.adx, indicators.rsi
-            )
-            
-            # 6. Calcular fuerza de señal refinada
-            signal_strength = self.signal_gen.calculate_signal_strength(
-                signal, indicators.ema_11, indicators.ema_55, 
-                indicators.adx, indicators.rsi, market_data.close_price
-            )
-            
-            # 7. Generar textos de análisis
-            analysis_text = self._generate_analysis_text(
-                symbol, market_data, indicators, signal, signal_strength, trend_bias
-            )
-            
-            recommendation = self._generate_recommendation(
-                symbol, market_data, indicators, signal, signal_strength, trend_bias
-            )
-            
-            # 8. Crear análisis completo
-            analysis = create_analysis(
-                symbol=symbol,
-                market_data=market_data,
-                indicators=indicators,
-                signal=signal,
-                signal_strength=signal_strength,
-                trend_bias=trend_bias,
-                analysis_text=analysis_text,
-                recommendation=recommendation
-            )
-            
-            logger.info(f"✅ Análisis completado para {symbol}: {signal} ({signal_strength}%)")
-            return analysis
-            
-        except Exception as e:
-            logger.error(f"❌ Error en análisis de {symbol}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return None
-    
-    def _generate_analysis_text(self, symbol: str, market_data, indicators, 
-                               signal: str, signal_strength: int, trend_bias: str) -> str:
-        """
-        Genera el texto detallado del análisis técnico
-        """
-        try:
-            # Calcular cambio porcentual
-            change_pct = ((market_data.close_price - market_data.open_price) / market_data.open_price) * 100
-            
-            # Determinar momentum
-            momentum = "POSITIVO" if change_pct > 0 else "NEGATIVO" if change_pct < 0 else "NEUTRAL"
-            
-            # Evaluar ADX
-            adx_strength = "FUERTE" if indicators.adx > 35 else "MODERADA" if indicators.adx > 25 else "DÉBIL"
-            
-            # Evaluar RSI
-            if indicators.rsi > 70:
-                rsi_status = "SOBRECOMPRADO"
-            elif indicators.rsi < 30:
-                rsi_status = "SOBREVENDIDO"
-            else:
-                rsi_status = "NEUTRAL"
-            
-            # Relación EMAs
-            ema_relation = "ALCISTA" if indicators.ema_11 > indicators.ema_55 else "BAJISTA"
-            ema_distance = abs((indicators.ema_11 - indicators.ema_55) / indicators.ema_55) * 100
-            
-            # Volatilidad
-            volatility = "ALTA" if abs(change_pct) > 3 else "MODERADA" if abs(change_pct) > 1 else "BAJA"
-            
-            analysis_text = f"""ANÁLISIS TÉCNICO COMPLETO - {symbol}
-{'='*50}
+    global _last_timestamp
+    second = int(timestamp.timestamp())
+    if second != _last_timestamp[0]:
+        _last_timestamp = (second, datetime.fromtimestamp(second).strftime('%d/%m/%Y %H:%M:%S'))
+    return _last_timestamp[1]
+
+# Nivel de confluencia según cuántas condiciones se cumplen (0..3)
+CONFLUENCE_LEVELS = ('BAJA', 'BAJA', 'MEDIA', 'ALTA')
+
+# Escalas de etiquetas: el índice es cuántos umbrales se superan
+# (int() explícito, igual que en _evaluate_confluence)
+ADX_LABELS = ('DÉBIL', 'MODERADA', 'FUERTE')              # > 25, > 35
+RSI_LABELS = ('SOBREVENDIDO', 'NEUTRAL', 'SOBRECOMPRADO')  # < 30, > 70
+VOLATILITY_LABELS = ('BAJA', 'MODERADA', 'ALTA')          # |cambio| > 1%, > 3%
+
+@lru_cache(maxsize=2048)
+def _fmt_price(value: float) -> str:
+    """
+    Precio con separador de miles y 4 decimales (ej: 65,432.1235)
+    Se repite entre refrescos del dashboard mientras el precio no cambia.
+    La clave es el float tal cual: redondearlo costaría más que formatear
+    """
+    return f"{value:,.4f}"
+
+def _adx_label(adx: float) -> str:
+    """Fuerza de tendencia según el ADX"""
+    return ADX_LABELS[int(adx > 25) + int(adx > 35)]
+
+def _rsi_label(rsi: float) -> str:
+    """Zona del RSI (NaN queda en NEUTRAL)"""
+    return RSI_LABELS[1 + int(rsi > 70) - int(rsi < 30)]
 
-💰 PRECIO ACTUAL: ${market_data.close_price:,.4f}
+def _volatility_label(change_pct: float) -> str:
+    """Volatilidad según el cambio porcentual del período"""
+    abs_change = abs(change_pct)
+    return VOLATILITY_LABELS[int(abs_change > 1) + int(abs_change > 3)]
+
+# Plantillas de texto (str.format_map). Se definen una sola vez a nivel de
+# módulo; los métodos solo calculan el contexto y eligen la plantilla
+ANALYSIS_TEMPLATE = """ANÁLISIS TÉCNICO COMPLETO - {symbol}
+==================================================
+
+💰 PRECIO ACTUAL: ${close_str}
 📈 CAMBIO 24H: {change_pct:+.2f}% | MOMENTUM: {momentum}
 📊 VOLATILIDAD: {volatility}
 
@@ -139,69 +85,48 @@ class AnalysisService:
 📊 SESGO DE TENDENCIA: {trend_bias}
 
 📉 MEDIAS MÓVILES EXPONENCIALES:
-   • EMA 11: ${indicators.ema_11:,.4f}
-   • EMA 55: ${indicators.ema_55:,.4f}
+   • EMA 11: ${ema_11_str}
+   • EMA 55: ${ema_55_str}
    • Relación: {ema_relation} ({ema_distance:.2f}% separación)
-   • Precio vs EMA11: {((market_data.close_price - indicators.ema_11) / indicators.ema_11) * 100:+.2f}%
+   • Precio vs EMA11: {price_vs_ema11:+.2f}%
 
 📊 INDICADORES TÉCNICOS:
-   • ADX: {indicators.adx:.1f} (Tendencia {adx_strength})
-   • RSI: {indicators.rsi:.1f} ({rsi_status})
-   • SMA 20: ${indicators.sma_20:.4f}
+   • ADX: {adx:.1f} (Tendencia {adx_strength})
+   • RSI: {rsi:.1f} ({rsi_status})
+   • SMA 20: ${sma_20:.4f}
 
 ⚠️ NIVELES CRÍTICOS:
-   • Soporte inmediato: ${market_data.low_price:.4f}
-   • Resistencia inmediata: ${market_data.high_price:.4f}
-   • Soporte técnico: ${market_data.close_price * 0.98:.4f} (-2%)
-   • Resistencia técnica: ${market_data.close_price * 1.02:.4f} (+2%)
+   • Soporte inmediato: ${low:.4f}
+   • Resistencia inmediata: ${high:.4f}
+   • Soporte técnico: ${support:.4f} (-2%)
+   • Resistencia técnica: ${resistance:.4f} (+2%)
 
 📈 CONTEXTO DE MERCADO:
-   • Rango 24h: ${market_data.low_price:.4f} - ${market_data.high_price:.4f}
-   • Volumen 24h: {market_data.volume:,.0f} {symbol[:3]}
-   • Precio vs máximo: {((market_data.close_price - market_data.high_price) / market_data.high_price) * 100:+.2f}%
-   • Precio vs mínimo: {((market_data.close_price - market_data.low_price) / market_data.low_price) * 100:+.2f}%
+   • Rango 24h: ${low:.4f} - ${high:.4f}
+   • Volumen 24h: {volume:,.0f} {base_asset}
+   • Precio vs máximo: {price_vs_high:+.2f}%
+   • Precio vs mínimo: {price_vs_low:+.2f}%
 
 🔍 EVALUACIÓN METODOLOGÍA JAIME MERINO:
-   • Confluencia técnica: {self._evaluate_confluence(indicators, signal)}
-   • Gestión de riesgo: {self._risk_assessment(signal_strength, indicators.adx)}
-   • Timing de entrada: {self._entry_timing(signal, signal_strength)}
+   • Confluencia técnica: {confluence}
+   • Gestión de riesgo: {risk}
+   • Timing de entrada: {timing}
 
-⏰ Análisis generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"""
+⏰ Análisis generado: {generated_at}"""
 
-            return analysis_text
-            
-        except Exception as e:
-            logger.error(f"❌ Error generando texto de análisis: {e}")
-            return f"Error generando análisis para {symbol}: {str(e)}"
-    
-    def _generate_recommendation(self, symbol: str, market_data, indicators, 
-                               signal: str, signal_strength: int, trend_bias: str) -> str:
-        """
-        Genera la recomendación específica de trading
-        """
-        try:
-            current_price = market_data.close_price
-            
-            if signal == 'LONG' and signal_strength >= 50:
-                # Recomendación de compra
-                entry_price = current_price
-                target_1 = current_price * 1.02  # +2%
-                target_2 = current_price * 1.05  # +5%
-                stop_loss = current_price * 0.98  # -2%
-                
-                recommendation = f"""🟢 RECOMENDACIÓN: COMPRAR (LONG)
-{'='*40}
+RECOMMENDATION_TRADE_TEMPLATE = """{header}
+========================================
 
 ✅ ENTRADA RECOMENDADA:
-   • Precio entrada: ${entry_price:.4f}
-   • Rango entrada: ${entry_price * 0.999:.4f} - ${entry_price * 1.001:.4f}
+   • Precio entrada: ${price:.4f}
+   • Rango entrada: ${entry_low:.4f} - ${entry_high:.4f}
 
 🎯 OBJETIVOS DE GANANCIA:
-   • Target 1: ${target_1:.4f} (+2.0%) - TOMA PARCIAL 50%
-   • Target 2: ${target_2:.4f} (+5.0%) - TOMA TOTAL
+   • Target 1: ${target_1:.4f} ({target_1_pct:+.1f}%) - TOMA PARCIAL 50%
+   • Target 2: ${target_2:.4f} ({target_2_pct:+.1f}%) - TOMA TOTAL
 
 🛑 GESTIÓN DE RIESGO:
-   • Stop Loss: ${stop_loss:.4f} (-2.0%)
+   • Stop Loss: ${stop_loss:.4f} ({stop_pct:+.1f}%)
    • Ratio R/R: 1:2.5 (EXCELENTE)
 
 💰 GESTIÓN DE CAPITAL:
@@ -210,77 +135,76 @@ class AnalysisService:
    • Timeframe: 1-4 horas
 
 📊 JUSTIFICACIÓN TÉCNICA:
-   • EMA 11 > EMA 55 (Tendencia alcista)
-   • Precio sobre EMA 11 (Confirmación)
-   • ADX: {indicators.adx:.1f} ({"Fuerte" if indicators.adx > 35 else "Moderada"} tendencia)
-   • RSI: {indicators.rsi:.1f} (Zona {"saludable" if 40 < indicators.rsi < 75 else "extrema"})
-   • Fuerza señal: {signal_strength}% ({"ALTA" if signal_strength > 70 else "MEDIA"})
+   • {ema_structure}
+   • {price_vs_ema}
+   • ADX: {adx:.1f} ({adx_label} tendencia)
+   • RSI: {rsi:.1f} (Zona {rsi_zone})
+   • Fuerza señal: {signal_strength}% ({strength_label})
 
 ⚠️ CONSIDERACIONES:
-   • Monitorear cierre bajo EMA 11 para salida anticipada
-   • Volumen debe acompañar el movimiento alcista
-   • Estar atento a resistencias en ${market_data.high_price:.4f}
+   • {exit_warning}
+   • {volume_note}
+   • {level_note} ${level:.4f}
 
-🔥 CONFLUENCIAS ALCISTAS DETECTADAS:
-   • ✅ Estructura técnica favorable
-   • ✅ Momentum positivo confirmado
+{confluence_header}
+   • ✅ Estructura técnica {structure}
+   • ✅ Momentum {momentum} confirmado
    • ✅ Indicadores en zona operativa"""
 
-            elif signal == 'SHORT' and signal_strength >= 50:
-                # Recomendación de venta
-                entry_price = current_price
-                target_1 = current_price * 0.98  # -2%
-                target_2 = current_price * 0.95  # -5%
-                stop_loss = current_price * 1.02  # +2%
-                
-                recommendation = f"""🔴 RECOMENDACIÓN: VENDER (SHORT)
-{'='*40}
-
-✅ ENTRADA RECOMENDADA:
-   • Precio entrada: ${entry_price:.4f}
-   • Rango entrada: ${entry_price * 0.999:.4f} - ${entry_price * 1.001:.4f}
-
-🎯 OBJETIVOS DE GANANCIA:
-   • Target 1: ${target_1:.4f} (-2.0%) - TOMA PARCIAL 50%
-   • Target 2: ${target_2:.4f} (-5.0%) - TOMA TOTAL
-
-🛑 GESTIÓN DE RIESGO:
-   • Stop Loss: ${stop_loss:.4f} (+2.0%)
-   • Ratio R/R: 1:2.5 (EXCELENTE)
-
-💰 GESTIÓN DE CAPITAL:
-   • Tamaño posición: 2-3% del capital total
-   • Apalancamiento: 1:1 a 1:3 máximo
-   • Timeframe: 1-4 horas
-
-📊 JUSTIFICACIÓN TÉCNICA:
-   • EMA 11 < EMA 55 (Tendencia bajista)
-   • Precio bajo EMA 11 (Confirmación)
-   • ADX: {indicators.adx:.1f} ({"Fuerte" if indicators.adx > 35 else "Moderada"} tendencia)
-   • RSI: {indicators.rsi:.1f} (Zona {"saludable" if 25 < indicators.rsi < 60 else "extrema"})
-   • Fuerza señal: {signal_strength}% ({"ALTA" if signal_strength > 70 else "MEDIA"})
-
-⚠️ CONSIDERACIONES:
-   • Monitorear cierre sobre EMA 11 para salida anticipada
-   • Confirmar presión vendedora con volumen
-   • Cuidado con soportes en ${market_data.low_price:.4f}
-
-📉 CONFLUENCIAS BAJISTAS DETECTADAS:
-   • ✅ Estructura técnica desfavorable
-   • ✅ Momentum negativo confirmado
-   • ✅ Indicadores en zona operativa"""
+# Partes de RECOMMENDATION_TRADE_TEMPLATE que dependen de la dirección
+# (direction: +1 LONG, -1 SHORT). rsi_zone = rango RSI "saludable"
+TRADE_DIRECTIONS = {
+    1: {
+        'direction': 1,
+        'header': "🟢 RECOMENDACIÓN: COMPRAR (LONG)",
+        'ema_structure': "EMA 11 > EMA 55 (Tendencia alcista)",
+        'price_vs_ema': "Precio sobre EMA 11 (Confirmación)",
+        'exit_warning': "Monitorear cierre bajo EMA 11 para salida anticipada",
+        'volume_note': "Volumen debe acompañar el movimiento alcista",
+        'level_note': "Estar atento a resistencias en",
+        'confluence_header': "🔥 CONFLUENCIAS ALCISTAS DETECTADAS:",
+        'structure': "favorable",
+        'momentum': "positivo",
+        'rsi_zone': (40, 75),
+    },
+    -1: {
+        'direction': -1,
+        'header': "🔴 RECOMENDACIÓN: VENDER (SHORT)",
+        'ema_structure': "EMA 11 < EMA 55 (Tendencia bajista)",
+        'price_vs_ema': "Precio bajo EMA 11 (Confirmación)",
+        'exit_warning': "Monitorear cierre sobre EMA 11 para salida anticipada",
+        'volume_note': "Confirmar presión vendedora con volumen",
+        'level_note': "Cuidado con soportes en",
+        'confluence_header': "📉 CONFLUENCIAS BAJISTAS DETECTADAS:",
+        'structure': "desfavorable",
+        'momentum': "negativo",
+        'rsi_zone': (25, 60),
+    },
+}
+
+def _levels(price: float, direction: int) -> Tuple[float, float, float]:
+    """
+    Objetivos y stop de una operación
+    
+    Args:
+        price: Precio de entrada
+        direction: +1 LONG, -1 SHORT
+        
+    Returns:
+        (target_1 ±2%, target_2 ±5%, stop_loss ∓2%)
+    """
+    return price * (1 + 0.02 * direction), price * (1 + 0.05 * direction), price * (1 - 0.02 * direction)
 
-            elif signal == 'WAIT':
-                recommendation = f"""🟡 RECOMENDACIÓN: ESPERAR
-{'='*30}
+RECOMMENDATION_WAIT_TEMPLATE = """🟡 RECOMENDACIÓN: ESPERAR
+==============================
 
 ⏳ RAZÓN: Condiciones de mercado indecisas
 
 📊 SITUACIÓN ACTUAL:
-   • Precio: ${current_price:.4f}
-   • EMA 11: ${indicators.ema_11:.4f}
-   • EMA 55: ${indicators.ema_55:.4f}
-   • ADX: {indicators.adx:.1f} (Tendencia {"débil" if indicators.adx < 25 else "moderada"})
+   • Precio: ${price:.4f}
+   • EMA 11: ${ema_11:.4f}
+   • EMA 55: ${ema_55:.4f}
+   • ADX: {adx:.1f} (Tendencia {adx_label})
 
 🔍 ESPERANDO CONFIRMACIÓN DE:
    • Ruptura clara de nivel clave
@@ -291,19 +215,18 @@ class AnalysisService:
 📋 PLAN DE ACCIÓN:
    • Monitorear cada 30-60 minutos
    • Establecer alertas en niveles clave:
-     - Soporte: ${current_price * 0.98:.4f}
-     - Resistencia: ${current_price * 1.02:.4f}
+     - Soporte: ${support:.4f}
+     - Resistencia: ${resistance:.4f}
    • Preparar entrada en ruptura confirmada
 
 💡 NIVELES DE ACTIVACIÓN:
-   • LONG si precio > ${indicators.ema_11 * 1.005:.4f} con volumen
-   • SHORT si precio < ${indicators.ema_11 * 0.995:.4f} con volumen
+   • LONG si precio > ${long_trigger:.4f} con volumen
+   • SHORT si precio < ${short_trigger:.4f} con volumen
 
 ⚠️ DISCIPLINA: No forzar operaciones en mercado lateral"""
 
-            else:
-                recommendation = f"""⚪ SIN SEÑAL OPERATIVA CLARA
-{'='*35}
+RECOMMENDATION_NONE_TEMPLATE = """⚪ SIN SEÑAL OPERATIVA CLARA
+===================================
 
 🚫 RAZÓN: Condiciones técnicas no favorables
 
@@ -329,38 +252,362 @@ class AnalysisService:
    
 ⏰ Mantener paciencia y disciplina."""
 
-            return recommendation
+class AnalysisService:
+    """
+    Servicio principal para realizar análisis técnico completo
+    """
+    
+    def __init__(self):
+        """Inicializa el servicio de análisis"""
+        self._binance: Optional[BinanceService] = None
+        self.indicators_calc = indicators_calculator
+        self.signal_gen = signal_generator
+        
+        # Cache de análisis por (symbol, ventana de tiempo)
+        # L1: slot -> (symbol, ventana, análisis); L2: LRU (symbol, ventana) -> análisis
+        self._l1: List[Optional[Tuple[str, int, TradingAnalysis]]] = [None] * ANALYSIS_L1_SLOTS
+        self._l2: 'OrderedDict[Tuple[str, int], TradingAnalysis]' = OrderedDict()
+        self._cache_lock = threading.RLock()
+        
+        # Renderer de recomendación por señal (el resto usa _rec_none)
+        self._renderers = {
+            'LONG': self._rec_long,
+            'SHORT': self._rec_short,
+            'WAIT': self._rec_wait,
+        }
+        logger.info("🚀 Servicio de análisis inicializado")
+    
+    @property
+    def binance(self) -> BinanceService:
+        """Servicio de Binance, resuelto en el primer uso (get_binance_service)"""
+        if self._binance is None:
+            self._binance = get_binance_service()
+        return self._binance
+    
+    def analyze_symbol(self, symbol: str) -> Optional[TradingAnalysis]:
+        """
+        Realiza análisis técnico completo para un símbolo
+        
+        Args:
+            symbol: Símbolo a analizar (ej: 'BTCUSDT')
+            
+        Returns:
+            TradingAnalysis completo o None si hay error
+        """
+        # Reutilizar el análisis si se pidió dentro de la misma ventana de ANALYSIS_CACHE_TTL
+        bucket = int(time.time() // ANALYSIS_CACHE_TTL)
+        cached = self._cache_get(symbol, bucket)
+        if cached is not None:
+            return cached
+        
+        try:
+            logger.info("📊 Iniciando análisis de %s", symbol)
+            
+            # 1-2. Datos de mercado y velas históricas en paralelo (son independientes)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                market_future = executor.submit(self.binance.get_market_data, symbol)
+                klines_future = executor.submit(self.binance.get_klines_arrays, symbol, '1h', 100)
+                market_data = market_future.result()
+                klines = klines_future.result()
+            
+            return self._build_analysis(symbol, market_data, klines, bucket)
+            
+        except Exception as e:
+            # logger.exception adjunta el traceback; el handler lo formatea una vez
+            logger.exception(f"❌ Error en análisis de {symbol}: {e}")
+            return None
+    
+    def analyze_symbols(self, symbols: List[str]) -> Dict[str, Optional[TradingAnalysis]]:
+        """
+        Analiza varios símbolos descargando todos sus datos en paralelo
+        
+        Args:
+            symbols: Lista de símbolos a analizar
+            
+        Returns:
+            Diccionario symbol -> TradingAnalysis (None si falló)
+        """
+        bucket = int(time.time() // ANALYSIS_CACHE_TTL)
+        results: Dict[str, Optional[TradingAnalysis]] = {}
+        pending = []
+        for symbol in dict.fromkeys(symbols):
+            cached = self._cache_get(symbol, bucket)
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                pending.append(symbol)
+        
+        if pending:
+            logger.info("📊 Iniciando análisis de %d símbolos", len(pending))
+            workers = min(BATCH_MAX_WORKERS, 2 * len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    symbol: (
+                        executor.submit(self.binance.get_market_data, symbol),
+                        executor.submit(self.binance.get_klines_arrays, symbol, '1h', 100)
+                    )
+                    for symbol in pending
+                }
+                # Los indicadores de un símbolo se calculan mientras siguen
+                # en vuelo las descargas de los demás
+                for symbol, (market_future, klines_future) in futures.items():
+                    try:
+                        results[symbol] = self._build_analysis(
+                            symbol, market_future.result(), klines_future.result(), bucket
+                        )
+                    except Exception as e:
+                        logger.exception(f"❌ Error en análisis de {symbol}: {e}")
+                        results[symbol] = None
+        
+        return {symbol: results[symbol] for symbol in symbols}
+    
+    def _build_analysis(self, symbol: str, market_data, klines,
+                        bucket: int) -> Optional[TradingAnalysis]:
+        """
+        Indicadores, señal y textos a partir de los datos ya descargados;
+        guarda el resultado en el cache de la ventana `bucket`
+        
+        Args:
+            symbol: Símbolo analizado
+            market_data: MarketData del símbolo
+            klines: Klines (1h) del símbolo
+            bucket: Ventana de ANALYSIS_CACHE_TTL del análisis
+            
+        Returns:
+            TradingAnalysis completo o None si faltan datos
+        """
+        if not market_data:
+            logger.error(f"❌ No se pudieron obtener datos de mercado para {symbol}")
+            return None
+        
+        if klines is None or len(klines.close) < 55:
+            logger.error(f"❌ Insuficientes datos históricos para {symbol}")
+            return None
+        
+        # 3. Calcular indicadores técnicos
+        indicators = self.indicators_calc.calculate_all_indicators(klines)
+        
+        # 4. Generar señal de trading
+        signal, base_strength = self.signal_gen.generate_ema_signal(
+            indicators.ema_11, indicators.ema_55, market_data.close_price
+        )
+        
+        # 5. Determinar sesgo de tendencia
+        trend_bias = self.signal_gen.determine_trend_bias(
+            indicators.ema_11, indicators.ema_55, indicators.adx, indicators.rsi
+        )
+        
+        # 6. Calcular fuerza de señal refinada
+        signal_strength = self.signal_gen.calculate_signal_strength(
+            signal, indicators.ema_11, indicators.ema_55, 
+            indicators.adx, indicators.rsi, market_data.close_price
+        )
+        
+        # 7-8. Crear análisis completo; los textos se generan al primer acceso
+        # pero muestran la hora del análisis, no la del primer acceso
+        timestamp = datetime.now()
+        text_args = (symbol, market_data, indicators, signal, signal_strength, trend_bias)
+        analysis = create_analysis(
+            symbol=symbol,
+            market_data=market_data,
+            indicators=indicators,
+            signal=signal,
+            signal_strength=signal_strength,
+            trend_bias=trend_bias,
+            analysis_text=lambda: self._generate_analysis_text(*text_args, generated_at=timestamp),
+            recommendation=lambda: self._generate_recommendation(*text_args),
+            timestamp=timestamp
+        )
+        
+        logger.info("✅ Análisis completado para %s: %s (%s%%)", symbol, signal, signal_strength)
+        # Solo se cachean los análisis exitosos
+        self._cache_put(symbol, bucket, analysis)
+        return analysis
+    
+    def _cache_get(self, symbol: str, bucket: int) -> Optional[TradingAnalysis]:
+        """
+        Busca el análisis de la ventana `bucket` en L1 y luego en L2
+        Un acierto en L2 se promueve a L1
+        """
+        slot = hash(symbol) % ANALYSIS_L1_SLOTS
+        with self._cache_lock:
+            entry = self._l1[slot]
+            if entry is not None and entry[0] == symbol and entry[1] == bucket:
+                return entry[2]
+            
+            analysis = self._l2.get((symbol, bucket))
+            if analysis is None:
+                return None
+            self._l2.move_to_end((symbol, bucket))
+            self._l1[slot] = (symbol, bucket, analysis)
+            return analysis
+    
+    def _cache_put(self, symbol: str, bucket: int, analysis: TradingAnalysis):
+        """Guarda el análisis en su slot de L1 (el ocupante queda en L2) y en L2"""
+        slot = hash(symbol) % ANALYSIS_L1_SLOTS
+        with self._cache_lock:
+            evicted = self._l1[slot]
+            if evicted is not None and evicted[0] != symbol:
+                self._l2_store((evicted[0], evicted[1]), evicted[2])
+            self._l1[slot] = (symbol, bucket, analysis)
+            self._l2_store((symbol, bucket), analysis)
+    
+    def _l2_store(self, key: Tuple[str, int], analysis: TradingAnalysis):
+        """Inserta en L2 descartando la entrada menos usada si se supera ANALYSIS_L2_SIZE"""
+        self._l2[key] = analysis
+        self._l2.move_to_end(key)
+        if len(self._l2) > ANALYSIS_L2_SIZE:
+            self._l2.popitem(last=False)
+    
+    def clear_cache(self):
+        """Limpia el cache de análisis"""
+        with self._cache_lock:
+            self._l1 = [None] * ANALYSIS_L1_SLOTS
+            self._l2.clear()
+        logger.info("🧹 Cache de análisis limpiado")
+    
+    def _generate_analysis_text(self, symbol: str, market_data, indicators, 
+                               signal: str, signal_strength: int, trend_bias: str,
+                               generated_at: Optional[datetime] = None) -> str:
+        """
+        Genera el texto detallado del análisis técnico
+        
+        Args:
+            generated_at: Momento del análisis (por defecto, ahora)
+        """
+        try:
+            # Escalares en locales una sola vez (varios se usan más de una vez)
+            cp, op = market_data.close_price, market_data.open_price
+            hp, lp = market_data.high_price, market_data.low_price
+            e11, e55 = indicators.ema_11, indicators.ema_55
+            adx, rsi = indicators.adx, indicators.rsi
+            
+            # Calcular cambio porcentual
+            change_pct = ((cp - op) / op) * 100
+            ema_diff_pct = ((e11 - e55) / e55) * 100
+            
+            ctx = {
+                'symbol': symbol,
+                'close_str': _fmt_price(cp),
+                'change_pct': change_pct,
+                'momentum': "POSITIVO" if change_pct > 0 else "NEGATIVO" if change_pct < 0 else "NEUTRAL",
+                'volatility': _volatility_label(change_pct),
+                'signal': signal,
+                'signal_strength': signal_strength,
+                'trend_bias': trend_bias,
+                'ema_11_str': _fmt_price(e11),
+                'ema_55_str': _fmt_price(e55),
+                'ema_relation': "ALCISTA" if e11 > e55 else "BAJISTA",
+                'ema_distance': abs(ema_diff_pct),
+                'price_vs_ema11': ((cp - e11) / e11) * 100,
+                'adx': adx,
+                'adx_strength': _adx_label(adx),
+                'rsi': rsi,
+                'rsi_status': _rsi_label(rsi),
+                'sma_20': indicators.sma_20,
+                'low': lp,
+                'high': hp,
+                'support': cp * 0.98,
+                'resistance': cp * 1.02,
+                'volume': market_data.volume,
+                'base_asset': symbol[:3],
+                'price_vs_high': ((cp - hp) / hp) * 100,
+                'price_vs_low': ((cp - lp) / lp) * 100,
+                'confluence': self._evaluate_confluence(indicators, signal),
+                'risk': self._risk_assessment(signal_strength, adx),
+                'timing': self._entry_timing(signal, signal_strength),
+                'generated_at': _timestamp_str(generated_at or datetime.now()),
+            }
+            return ANALYSIS_TEMPLATE.format_map(ctx)
+            
+        except Exception as e:
+            logger.error(f"❌ Error generando texto de análisis: {e}")
+            return f"Error generando análisis para {symbol}: {str(e)}"
+    
+    def _generate_recommendation(self, symbol: str, market_data, indicators, 
+                               signal: str, signal_strength: int, trend_bias: str) -> str:
+        """
+        Genera la recomendación específica de trading
+        """
+        try:
+            # LONG/SHORT por debajo de 50 de fuerza no son operativas
+            if signal in ('LONG', 'SHORT') and signal_strength < 50:
+                renderer = self._rec_none
+            else:
+                renderer = self._renderers.get(signal, self._rec_none)
+            return renderer(market_data, indicators, signal_strength)
             
         except Exception as e:
             logger.error(f"❌ Error generando recomendación: {e}")
             return f"Error generando recomendación para {symbol}: {str(e)}"
     
+    def _rec_long(self, market_data, indicators, signal_strength: int) -> str:
+        """Recomendación de compra (LONG)"""
+        return self._rec_trade(TRADE_DIRECTIONS[1], market_data, indicators, signal_strength)
+    
+    def _rec_short(self, market_data, indicators, signal_strength: int) -> str:
+        """Recomendación de venta (SHORT)"""
+        return self._rec_trade(TRADE_DIRECTIONS[-1], market_data, indicators, signal_strength)
+    
+    def _rec_trade(self, texts: Dict, market_data, indicators, signal_strength: int) -> str:
+        """Recomendación de entrada en la dirección de `texts` (TRADE_DIRECTIONS)"""
+        price, adx, rsi = market_data.close_price, indicators.adx, indicators.rsi
+        direction = texts['direction']
+        target_1, target_2, stop_loss = _levels(price, direction)
+        rsi_low, rsi_high = texts['rsi_zone']
+        return RECOMMENDATION_TRADE_TEMPLATE.format_map({
+            **texts,
+            'price': price,
+            'entry_low': price * 0.999,
+            'entry_high': price * 1.001,
+            'target_1': target_1,
+            'target_2': target_2,
+            'stop_loss': stop_loss,
+            'target_1_pct': 2.0 * direction,
+            'target_2_pct': 5.0 * direction,
+            'stop_pct': -2.0 * direction,
+            # LONG vigila la resistencia (máximo), SHORT el soporte (mínimo)
+            'level': market_data.high_price if direction > 0 else market_data.low_price,
+            'adx': adx,
+            'adx_label': "Fuerte" if adx > 35 else "Moderada",
+            'rsi': rsi,
+            'rsi_zone': "saludable" if rsi_low < rsi < rsi_high else "extrema",
+            'signal_strength': signal_strength,
+            'strength_label': "ALTA" if signal_strength > 70 else "MEDIA",
+        })
+    
+    def _rec_wait(self, market_data, indicators, signal_strength: int) -> str:
+        """Recomendación de esperar confirmación"""
+        price, ema_11, adx = market_data.close_price, indicators.ema_11, indicators.adx
+        return RECOMMENDATION_WAIT_TEMPLATE.format_map({
+            'price': price,
+            'ema_11': ema_11,
+            'ema_55': indicators.ema_55,
+            'adx': adx,
+            'adx_label': "débil" if adx < 25 else "moderada",
+            'support': price * 0.98,
+            'resistance': price * 1.02,
+            'long_trigger': ema_11 * 1.005,
+            'short_trigger': ema_11 * 0.995,
+        })
+    
+    def _rec_none(self, market_data, indicators, signal_strength: int) -> str:
+        """Sin señal operativa clara"""
+        return RECOMMENDATION_NONE_TEMPLATE.format_map({'signal_strength': signal_strength})
+    
     def _evaluate_confluence(self, indicators, signal: str) -> str:
         """Evalúa la confluencia técnica"""
-        confluences = 0
-        
-        # EMA alignment
-        if signal == 'LONG' and indicators.ema_11 > indicators.ema_55:
-            confluences += 1
-        elif signal == 'SHORT' and indicators.ema_11 < indicators.ema_55:
-            confluences += 1
+        ema_11, ema_55, rsi = indicators.ema_11, indicators.ema_55, indicators.rsi
+        is_long, is_short = signal == 'LONG', signal == 'SHORT'
         
-        # ADX strength
-        if indicators.adx > 25:
-            confluences += 1
-        
-        # RSI zone
-        if signal == 'LONG' and 40 < indicators.rsi < 75:
-            confluences += 1
-        elif signal == 'SHORT' and 25 < indicators.rsi < 60:
-            confluences += 1
-        
-        if confluences >= 3:
-            return "ALTA"
-        elif confluences >= 2:
-            return "MEDIA"
-        else:
-            return "BAJA"
+        # EMA alineada + ADX fuerte + RSI en zona (0..3). int() explícito:
+        # con valores NumPy la suma de np.bool_ sería un OR lógico
+        confluences = (
+            int(is_long and ema_11 > ema_55) + int(is_short and ema_11 < ema_55)
+            + int(indicators.adx > 25)
+            + int(is_long and 40 < rsi < 75) + int(is_short and 25 < rsi < 60)
+        )
+        return CONFLUENCE_LEVELS[confluences]
     
     def _risk_assessment(self, signal_strength: int, adx: float) -> str:
         """Evalúa el nivel de riesgo"""
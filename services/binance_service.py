@@ -1,50 +1,258 @@
 """
 Servicio refactorizado para conectar con Binance API - Optimizado para datos reales
 """
+import asyncio
+import json
+import logging
+import threading
 import time
+import uuid
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
-from models.trading_analysis import MarketData
+from binance.streams import ThreadedWebsocketManager
+from models.trading_analysis import Klines, MarketData
+from utils.json_utils import json_loads
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
 from utils.logger import binance_logger
 
 logger = binance_logger
 
+# TTL (segundos) del cache de klines por intervalo; el resto usa el default
+KLINES_CACHE_TTL = {'1m': 30, '5m': 60, '15m': 300, '1h': 900, '4h': 3600, '1d': 3600}
+KLINES_CACHE_TTL_DEFAULT = 30
+# Velas pedidas en una actualización incremental (peso mínimo); si llegan
+# todas puede haber más y se hace la descarga completa
+KLINES_INCREMENTAL_LIMIT = 10
+VALID_INTERVALS = frozenset({'1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h',
+                             '8h', '12h', '1d', '3d', '1w', '1M'})
+MARKET_DATA_CACHE_TTL = 30  # ticker 24hr
+
+# Cache de precios: fresco -> se sirve directo; obsoleto (< STALE) -> se sirve y
+# se refresca en segundo plano; más viejo -> request síncrono
+PRICE_CACHE_FRESH_TTL = 5
+PRICE_CACHE_STALE_TTL = 30
+PRICE_REFRESH_WORKERS = 4
+# Si Binance no responde se sirve el último precio conocido hasta esta antigüedad
+PRICE_STALE_FALLBACK_TTL = 3600
+# Timeout (s) de Redis: el cache compartido nunca debe frenar un request
+REDIS_SOCKET_TIMEOUT = 0.5
+PRICE_REQUEST_TIMEOUT = 3  # timeout por endpoint en la cascada de precio
+# Stream !miniTicker@arr: Binance empuja cada ~1 s los símbolos que cambiaron;
+# sin frames durante más de esto se vuelve al cache REST
+PRICE_STREAM_MAX_SILENCE = 3
+CONNECTION_CHECK_TTL = 30  # resultado de test_connection reutilizable
+BULK_SYMBOLS_MAX = 100  # símbolos por consulta ?symbols=; con más, lista completa
+ALL_PRICES_CACHE_TTL = 2  # snapshot de /ticker/price con todos los símbolos
+EXCHANGE_INFO_CACHE_TTL = 3600  # metadata de símbolos: cambia en días, no segundos
+PRICE_FALLBACK_CONCURRENCY = 8  # precios individuales simultáneos si falla el bulk
+
+# Pool HTTP: hosts distintos cacheados y conexiones keep-alive por host. Cubre el
+# batch de análisis (BATCH_MAX_WORKERS x 2 requests) más klines, precios y refrescos
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 64
+
+# Reintentos ante rate limit (429/418) y errores 5xx de Binance
+MAX_API_RETRIES = 4
+RETRY_STATUS_CODES = (418, 429, 500, 502, 503, 504)
+RATE_LIMIT_ERROR_CODES = {-1003, -1015}  # Códigos de error de la API por exceso de requests
+
+# Token bucket del peso de requests (Binance: 1200 de peso por minuto por IP)
+RATE_LIMIT_WEIGHT_PER_SEC = 20
+RATE_LIMIT_BURST = 40
+# Ventana deslizante global (Redis) compartida por todos los workers de la IP;
+# algo por debajo del límite de Binance para dejar margen
+GLOBAL_RATE_LIMIT_KEY = 'binance:rl:ip'
+GLOBAL_RATE_LIMIT_TOTAL_KEY = 'binance:rl:ip:total'
+GLOBAL_RATE_LIMIT_WINDOW_MS = 60000
+GLOBAL_RATE_LIMIT_WEIGHT = 1100
+# Lua atómico: un miembro '<id>:<peso>' por request en el sorted set y el peso
+# total de la ventana en KEYS[2]. Purga la ventana descontando el peso de lo
+# que caduca; si cabe el peso lo registra y retorna 0, si no, los ms hasta que
+# caduque el request más antiguo
+GLOBAL_RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local weight = tonumber(ARGV[4])
+local total = tonumber(redis.call('GET', KEYS[2]) or '0')
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], 0, now - window)
+if #expired > 0 then
+    for _, member in ipairs(expired) do
+        total = total - tonumber(string.match(member, ':(%d+)$'))
+    end
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+end
+if redis.call('ZCARD', KEYS[1]) == 0 then
+    total = 0
+end
+local fits = total + weight <= tonumber(ARGV[3])
+if fits then
+    redis.call('ZADD', KEYS[1], now, ARGV[5] .. ':' .. weight)
+    total = total + weight
+end
+redis.call('SET', KEYS[2], total, 'PX', window)
+redis.call('PEXPIRE', KEYS[1], window)
+if fits then
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return tonumber(oldest[2]) + window - now
+"""
+# Si X-MBX-USED-WEIGHT-1M supera este valor se reduce el ritmo a la mitad
+USED_WEIGHT_SLOWDOWN = 1000
+# Peso de cada endpoint (las klines dependen del limit, ver _klines_weight)
+WEIGHT_TICKER_PRICE = 2
+WEIGHT_ALL_PRICES = 4
+WEIGHT_TICKER_24HR = 2
+WEIGHT_EXCHANGE_INFO = 20
+
+# Cada cuánto se vuelve a medir el offset reloj local / servidor (segundos)
+SERVER_TIME_REFRESH = 1800
+
+# Columnas OHLCV (posiciones 1-5 de cada kline) que usan los indicadores
+KLINES_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _klines_weight(limit: int) -> int:
+    """Peso de /api/v3/klines según el número de velas pedidas"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+class TokenBucket:
+    """
+    Limitador token bucket thread-safe: repone rate tokens por segundo hasta
+    capacity; acquire(weight) reserva el peso y duerme lo necesario
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, weight: float = 1):
+        """
+        Consume weight tokens, esperando si el bucket no alcanza
+        
+        Args:
+            weight: Peso del request
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserva: el saldo puede quedar negativo y los siguientes esperan más
+            self._tokens -= weight
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
 class BinanceService:
     """
     Servicio mejorado para interactuar con la API de Binance
     Optimizado para obtener datos reales y manejar errores robustamente
     """
     
-    def __init__(self, api_key: str = None, secret_key: str = None):
+    def __init__(self, api_key: str = None, secret_key: str = None,
+                 price_fresh_ttl: float = PRICE_CACHE_FRESH_TTL,
+                 price_stale_ttl: float = PRICE_CACHE_STALE_TTL,
+                 redis_url: str = None):
         """
         Inicializa el servicio de Binance
         
         Args:
             api_key: API key de Binance (opcional para datos públicos)
             secret_key: Secret key de Binance (opcional para datos públicos)
+            price_fresh_ttl: Segundos en que un precio cacheado se sirve sin más
+            price_stale_ttl: Segundos en que se sirve mientras se refresca en segundo plano
+            redis_url: Redis para compartir el cache de precios entre workers (opcional)
         """
         self.api_key = api_key
         self.secret_key = secret_key
-        self.client = None
+        self.client = None  # Solo endpoints de cuenta; datos de mercado via REST público
         self.base_url = "https://api.binance.com"
+        # URLs de endpoints precalculadas (constantes durante toda la vida del servicio)
+        self._url_ticker_price = f"{self.base_url}/api/v3/ticker/price"
+        self._url_ticker_24hr = f"{self.base_url}/api/v3/ticker/24hr"
+        self._url_klines = f"{self.base_url}/api/v3/klines"
+        self._url_time = f"{self.base_url}/api/v3/time"
+        self._url_exchange_info = f"{self.base_url}/api/v3/exchangeInfo"
         self.session = self._create_session()
-        self._last_request_time = 0
-        self._min_request_interval = 0.1  # 100ms entre requests para evitar rate limits
+        # Cascada de precio: un solo intento por endpoint, el fallback es el reintento
+        self._price_session = self._create_session(max_retries=0)
+        # Presupuesto de peso de la API compartido por todos los hilos
+        self._bucket = TokenBucket(RATE_LIMIT_WEIGHT_PER_SEC, RATE_LIMIT_BURST)
+        for session in (self.session, self._price_session):
+            session.hooks['response'].append(self._track_used_weight)
         
         # Cache de precios para evitar requests excesivos
         self._price_cache = {}
-        self._cache_timeout = 30  # 30 segundos
+        self._price_fresh_ttl = price_fresh_ttl
+        self._cache_timeout = price_stale_ttl
+        # Refresco en segundo plano: un solo request en vuelo por símbolo
+        self._price_lock = threading.Lock()
+        self._price_refreshing = set()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        # Single-flight: requests en curso por clave, compartidos entre hilos
+        self._inflight: Dict[tuple, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Cache de precios compartido entre procesos (gunicorn) si hay Redis
+        self._redis = None
+        if redis_url:
+            if REDIS_AVAILABLE:
+                self._redis = redis.Redis.from_url(
+                    redis_url,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=REDIS_SOCKET_TIMEOUT
+                )
+                self._global_rate_limit = self._redis.register_script(GLOBAL_RATE_LIMIT_SCRIPT)
+            else:
+                logger.warning("⚠️ redis no instalado: cache de precios solo local")
+        # Precios en vivo por WebSocket (opcional, ver start_price_stream)
+        self._price_stream: Optional[ThreadedWebsocketManager] = None
+        self._stream_last_frame = float('-inf')
+        # Último miniTicker 24h por símbolo (o/h/l/c/v) para get_market_data
+        self._live_tickers: Dict[str, dict] = {}
+        
+        # Cache TTL de respuestas (klines, ticker 24hr): clave -> (timestamp, valor)
+        self._response_cache: Dict[tuple, Tuple[float, object]] = {}
+        
+        # Última ventana de klines por (symbol, interval) para pedir solo velas nuevas
+        self._kline_buffer: Dict[Tuple[str, str], pd.DataFrame] = {}
+        
+        # Offset (ms) entre el reloj de Binance y el local; se mide en test_connection
+        self._time_offset_ms = 0
+        self._offset_fetched: Optional[float] = None
+        self._time_rtt_ms = 0.0  # round-trip de la última medición
+        
+        # Último resultado de test_connection: (ok, instante monotonic)
+        self._last_connection_check: Tuple[bool, float] = (False, float('-inf'))
         
         # Inicializar cliente si hay credenciales
         if api_key and secret_key:
             try:
                 self.client = Client(api_key, secret_key)
+                # El cliente firmado usa su propia sesión: mismo adapter (pool + reintentos)
+                self.client.session.mount('https://', self.session.get_adapter(self.base_url))
                 # Test inicial
-                self.client.get_account()
+                self._with_retry(self.client.get_account)
                 logger.info("✅ Cliente Binance inicializado con credenciales")
             except Exception as e:
                 logger.error(f"❌ Error inicializando cliente Binance: {e}")
@@ -58,41 +266,201 @@ class BinanceService:
         else:
             logger.warning("⚠️ Problemas de conexión con Binance")
     
-    def _create_session(self) -> requests.Session:
-        """Crea una sesión HTTP optimizada"""
+    def _create_session(self, max_retries: int = MAX_API_RETRIES) -> requests.Session:
+        """
+        Crea una sesión HTTP optimizada
+        
+        Args:
+            max_retries: Reintentos del adapter (0 = un solo intento)
+        """
         session = requests.Session()
         session.headers.update({
             'User-Agent': 'JaimeMerino-TradingBot/1.0',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
         })
-        # Configurar timeouts y reintentos
-        adapter = requests.adapters.HTTPAdapter(max_retries=3)
+        # requests ya pide gzip/deflate; urllib3 añade br/zstd solo si el
+        # decodificador (brotli/zstandard) está instalado
+        session.headers['Accept-Encoding'] = make_headers(accept_encoding=True)['accept-encoding']
+        # Pool de conexiones keep-alive (reutiliza TLS) y reintentos con backoff
+        # exponencial que respetan el header Retry-After en 429/418/5xx
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=True
+        )
+        # pool_maxsize cubre las descargas concurrentes (varios símbolos x timeframes);
+        # sin pool_block, las que excedan abren una conexión extra que se descarta
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=retry,
+            pool_block=False
+        )
         session.mount('https://', adapter)
+        session.mount('http://', adapter)
         return session
     
-    def _rate_limit_check(self):
-        """Evita exceder los límites de rate de Binance"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self._min_request_interval:
-            time.sleep(self._min_request_interval - time_since_last)
-        self._last_request_time = time.time()
-    
-    def _is_cache_valid(self, symbol: str) -> bool:
-        """Verifica si el cache es válido para un símbolo"""
-        if symbol not in self._price_cache:
-            return False
+    def close(self):
+        """Cierra la sesión HTTP y libera las conexiones del pool"""
+        self.stop_price_stream()
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=False)
+        self.session.close()
+        self._price_session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _with_retry(self, fn: Callable, *args, **kwargs):
+        """
+        Ejecuta una llamada del cliente Binance reintentando con backoff
+        exponencial cuando la API responde por exceso de requests
+        """
+        for attempt in range(MAX_API_RETRIES + 1):
+            try:
+                return fn(*args, **kwargs)
+            except BinanceAPIException as e:
+                if e.code not in RATE_LIMIT_ERROR_CODES or attempt == MAX_API_RETRIES:
+                    raise
+                wait = min(60, 2 ** attempt)
+                logger.warning(f"⚠️ Rate limit de Binance ({e.code}), reintentando en {wait}s")
+                time.sleep(wait)
+    
+    def _rate_limit_check(self, weight: int = 1):
+        """
+        Evita exceder los límites de rate de Binance
+        
+        Args:
+            weight: Peso del request según la documentación de Binance
+        """
+        self._bucket.acquire(weight)
+        if self._redis is not None:
+            self._acquire_global_quota(weight)
+    
+    def _acquire_global_quota(self, weight: int):
+        """
+        Reserva peso en la ventana deslizante de Redis compartida por todos
+        los procesos; espera mientras la ventana esté llena
         
-        cache_time = self._price_cache[symbol].get('timestamp', 0)
-        return (time.time() - cache_time) < self._cache_timeout
+        Args:
+            weight: Peso del request
+        """
+        while True:
+            try:
+                wait_ms = self._global_rate_limit(
+                    keys=[GLOBAL_RATE_LIMIT_KEY, GLOBAL_RATE_LIMIT_TOTAL_KEY],
+                    args=[int(time.time() * 1000), GLOBAL_RATE_LIMIT_WINDOW_MS,
+                          GLOBAL_RATE_LIMIT_WEIGHT, weight, uuid.uuid4().hex]
+                )
+            except redis.RedisError as e:
+                # Sin Redis queda el token bucket local
+                logger.debug(f"Redis no disponible para rate limit: {e}")
+                return
+            if wait_ms <= 0:
+                return
+            logger.warning(f"⚠️ Cuota global de Binance agotada, esperando {wait_ms} ms")
+            time.sleep(max(wait_ms, 10) / 1000)
+    
+    def _track_used_weight(self, response: requests.Response, *args, **kwargs):
+        """
+        Hook de respuesta: ajusta el ritmo del bucket según el peso usado que
+        informa Binance en X-MBX-USED-WEIGHT-1M
+        """
+        used = response.headers.get('X-MBX-USED-WEIGHT-1M')
+        if used is not None:
+            slow = int(used) > USED_WEIGHT_SLOWDOWN
+            self._bucket.rate = RATE_LIMIT_WEIGHT_PER_SEC / 2 if slow else RATE_LIMIT_WEIGHT_PER_SEC
     
     def _update_cache(self, symbol: str, price: float):
-        """Actualiza el cache de precios"""
-        self._price_cache[symbol] = {
-            'price': price,
-            'timestamp': time.time()
+        """Actualiza el cache de precios (local y, si hay, el compartido en Redis)"""
+        self._update_cache_many({symbol: price})
+    
+    def _update_cache_many(self, prices: Dict[str, float]):
+        """
+        Actualiza varios precios de una vez: un update del dict local y un
+        solo pipeline a Redis
+        
+        Args:
+            prices: Diccionario {symbol: price}
+        """
+        now = time.time()
+        self._price_cache.update({
+            symbol: {'price': price, 'timestamp': now} for symbol, price in prices.items()
+        })
+        if self._redis is not None and prices:
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for symbol, price in prices.items():
+                    pipe.hset(f"price:{symbol}", mapping={'price': price, 'ts': now})
+                    pipe.expire(f"price:{symbol}", int(self._cache_timeout))
+                    # Copia de larga duración para servir si Binance no responde
+                    pipe.set(f"price_stale:{symbol}", price, ex=PRICE_STALE_FALLBACK_TTL)
+                pipe.execute()
+            except redis.RedisError as e:
+                logger.debug(f"Redis no disponible al guardar precios: {e}")
+    
+    def _shared_prices(self, symbols: List[str]) -> Dict[str, Dict]:
+        """
+        Lee de Redis (un solo round-trip) los precios que otros workers dejaron
+        
+        Args:
+            symbols: Lista de símbolos
+            
+        Returns:
+            Diccionario {symbol: {'price', 'timestamp'}} con los encontrados
+        """
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for symbol in symbols:
+                pipe.hmget(f"price:{symbol}", 'price', 'ts')
+            rows = pipe.execute()
+        except redis.RedisError as e:
+            logger.debug(f"Redis no disponible al leer precios: {e}")
+            return {}
+        return {
+            symbol: {'price': float(price), 'timestamp': float(ts)}
+            for symbol, (price, ts) in zip(symbols, rows)
+            if price is not None and ts is not None
         }
     
+    def _last_known_price(self, symbol: str) -> Optional[float]:
+        """
+        Último precio conocido (hasta PRICE_STALE_FALLBACK_TTL) para servir
+        cuando todos los endpoints fallan
+        """
+        cached = self._price_cache.get(symbol)
+        if cached is not None:
+            age = time.time() - cached['timestamp']
+            if age < PRICE_STALE_FALLBACK_TTL:
+                logger.warning(f"⚠️ Sirviendo último precio conocido de {symbol} (hace {age:.0f}s)")
+                return cached['price']
+        if self._redis is not None:
+            try:
+                price = self._redis.get(f"price_stale:{symbol}")
+            except redis.RedisError:
+                price = None
+            if price is not None:
+                logger.warning(f"⚠️ Sirviendo último precio conocido de {symbol} (Redis)")
+                return float(price)
+        return None
+    
+    def _get_cached_response(self, key: tuple, ttl: float):
+        """Retorna la respuesta cacheada si tiene menos de ttl segundos, si no None"""
+        hit = self._response_cache.get(key)
+        if hit and (time.monotonic() - hit[0]) < ttl:
+            return hit[1]
+        return None
+    
+    def _cache_response(self, key: tuple, value):
+        """Guarda una respuesta en el cache TTL"""
+        self._response_cache[key] = (time.monotonic(), value)
+    
     def get_current_price(self, symbol: str, use_cache: bool = True) -> Optional[float]:
         """
         Obtiene el precio actual de un símbolo - MÉTODO PRINCIPAL
@@ -104,15 +472,169 @@ class BinanceService:
         Returns:
             Precio actual como float o None si hay error
         """
-        # Verificar cache primero
-        if use_cache and self._is_cache_valid(symbol):
-            cached_price = self._price_cache[symbol]['price']
-            logger.debug(f"💾 Precio de cache para {symbol}: ${cached_price:,.4f}")
-            return cached_price
+        if use_cache and self._price_stream_alive():
+            # Solo se confía en lo que escribió el stream desde que arrancó o se
+            # reconectó: sin cambios = mismo precio
+            ticker = self._live_tickers.get(symbol)
+            if ticker is not None:
+                return float(ticker['c'])
         
-        self._rate_limit_check()
+        # Verificar cache (stale-while-revalidate)
+        cached = self._price_cache.get(symbol) if use_cache else None
+        now = time.time()  # una sola lectura del reloj por llamada
+        if (use_cache and self._redis is not None
+                and (cached is None or now - cached['timestamp'] >= self._price_fresh_ttl)):
+            # Otro worker pudo haberlo refrescado: se adopta si es más reciente
+            shared = self._shared_prices([symbol]).get(symbol)
+            if shared is not None and (cached is None or shared['timestamp'] > cached['timestamp']):
+                cached = self._price_cache[symbol] = shared
+        if cached is not None:
+            age = now - cached['timestamp']
+            if age < self._cache_timeout:
+                if age >= self._price_fresh_ttl:
+                    self._schedule_price_refresh(symbol)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"💾 Precio de cache para {symbol}: ${cached['price']:,.4f}")
+                return cached['price']
+        
+        return self._single_flight(('price', symbol), self._fetch_current_price, symbol)
+    
+    def start_price_stream(self):
+        """
+        Suscribe el stream !miniTicker@arr de Binance: los precios de todos los
+        símbolos llegan por push al cache de precios y get_current_price deja
+        de consultar la API REST mientras el stream esté vivo
+        """
+        if self._price_stream is not None:
+            return
+        try:
+            stream = ThreadedWebsocketManager()
+            stream.start()
+            stream.start_miniticker_socket(callback=self._on_miniticker)
+            self._price_stream = stream
+            logger.info("📡 Stream de precios !miniTicker@arr iniciado")
+        except Exception as e:
+            logger.error(f"❌ Error iniciando stream de precios: {e}")
+    
+    def stop_price_stream(self):
+        """Detiene el stream de precios; se vuelve al cache REST"""
+        if self._price_stream is None:
+            return
+        stream, self._price_stream = self._price_stream, None
+        self._stream_last_frame = float('-inf')
+        self._live_tickers.clear()
+        try:
+            stream.stop()
+        except Exception as e:
+            logger.warning(f"⚠️ Error deteniendo stream de precios: {e}")
+    
+    def _on_miniticker(self, msg):
+        """
+        Callback del stream: vuelca los precios de cierre ('c') al cache
+        
+        Args:
+            msg: Lista de miniTickers o dict de error de python-binance
+        """
+        if isinstance(msg, dict):
+            logger.warning(f"⚠️ Stream de precios: {msg.get('m', msg)}")
+            return
+        if not self._price_stream_alive():
+            # Arranque o reconexión tras un silencio: los tickers anteriores
+            # pueden estar viejos, solo valen los que lleguen desde ahora
+            self._live_tickers.clear()
+        now = time.time()
+        self._price_cache.update({
+            t['s']: {'price': float(t['c']), 'timestamp': now} for t in msg
+        })
+        self._live_tickers.update({t['s']: t for t in msg})
+        self._stream_last_frame = time.monotonic()
+    
+    def _price_stream_alive(self) -> bool:
+        """True si el stream recibió un frame en los últimos PRICE_STREAM_MAX_SILENCE s"""
+        return time.monotonic() - self._stream_last_frame < PRICE_STREAM_MAX_SILENCE
+    
+    def _live_prices(self, symbols: List[str]) -> Optional[Dict[str, float]]:
+        """
+        Precios servidos por el stream, o None si no está vivo o alguno de los
+        símbolos no llegó por el stream (entonces se usa la API REST)
+        """
+        if not self._price_stream_alive():
+            return None
+        tickers = self._live_tickers
+        if not all(symbol in tickers for symbol in symbols):
+            return None
+        return {symbol: float(tickers[symbol]['c']) for symbol in symbols}
+    
+    def _single_flight(self, key: tuple, fn: Callable, *args):
+        """
+        Ejecuta fn(*args) una sola vez por key aunque varios hilos la pidan a
+        la vez: el primero hace el request y el resto espera su resultado
+        
+        Args:
+            key: Identificador de la operación (ej: ('price', symbol))
+            fn: Función que hace el request
+            
+        Returns:
+            Resultado de fn (compartido entre los hilos que esperaban)
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    def _schedule_price_refresh(self, symbol: str):
+        """Refresca el precio en segundo plano si no hay ya un refresco en curso"""
+        with self._price_lock:
+            if symbol in self._price_refreshing:
+                return
+            self._price_refreshing.add(symbol)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=PRICE_REFRESH_WORKERS, thread_name_prefix='price-refresh'
+                )
+        try:
+            self._refresh_executor.submit(self._refresh_price, symbol)
+        except RuntimeError:
+            # Executor cerrado (close()): se refrescará en la próxima llamada síncrona
+            with self._price_lock:
+                self._price_refreshing.discard(symbol)
+    
+    def _refresh_price(self, symbol: str):
+        """Tarea de fondo: actualiza el cache y libera la marca de refresco"""
+        try:
+            self._single_flight(('price', symbol), self._fetch_current_price, symbol)
+        finally:
+            with self._price_lock:
+                self._price_refreshing.discard(symbol)
+    
+    def _fetch_current_price(self, symbol: str) -> Optional[float]:
+        """
+        Consulta el precio a la API (sin cache) y actualiza el cache
         
-        # Intentar múltiples métodos en orden de preferencia
+        Args:
+            symbol: Símbolo del activo
+            
+        Returns:
+            Precio actual o None si todos los métodos fallan
+        """
+        # Intentar múltiples métodos en orden de preferencia, cada uno con un
+        # solo intento y timeout corto: con Binance degradado se llega al
+        # siguiente endpoint en segundos en vez de acumular reintentos
         methods = [
             self._get_price_simple,
             self._get_price_24hr,
@@ -123,7 +645,8 @@ class BinanceService:
             try:
                 price = method(symbol)
                 if price and price > 0:
-                    logger.debug(f"✅ Precio {symbol}: ${price:,.4f} (método {i})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"✅ Precio {symbol}: ${price:,.4f} (método {i})")
                     self._update_cache(symbol, price)
                     return price
             except Exception as e:
@@ -131,44 +654,43 @@ class BinanceService:
                 continue
         
         logger.error(f"❌ Todos los métodos fallaron para obtener precio de {symbol}")
-        return None
+        return self._last_known_price(symbol)
     
     def _get_price_simple(self, symbol: str) -> Optional[float]:
         """Método 1: Endpoint simple de precio"""
-        if self.client:
-            # Con credenciales
-            ticker = self.client.get_symbol_ticker(symbol=symbol)
-            return float(ticker['price'])
-        else:
-            # API pública
-            url = f"{self.base_url}/api/v3/ticker/price"
-            response = self.session.get(url, params={'symbol': symbol}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            return float(data['price'])
+        self._rate_limit_check(WEIGHT_TICKER_PRICE)
+        url = self._url_ticker_price
+        response = self._price_session.get(url, params={'symbol': symbol},
+                                           timeout=PRICE_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = json_loads(response.content)
+        return float(data['price'])
     
     def _get_price_24hr(self, symbol: str) -> Optional[float]:
         """Método 2: Ticker 24hr (más información)"""
-        if self.client:
-            ticker = self.client.get_ticker(symbol=symbol)
-            return float(ticker['lastPrice'])
-        else:
-            url = f"{self.base_url}/api/v3/ticker/24hr"
-            response = self.session.get(url, params={'symbol': symbol}, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            return float(data['lastPrice'])
+        self._rate_limit_check(WEIGHT_TICKER_24HR)
+        url = self._url_ticker_24hr
+        response = self._price_session.get(url, params={'symbol': symbol},
+                                           timeout=PRICE_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        data = json_loads(response.content)
+        return float(data['lastPrice'])
     
     def _get_price_from_klines(self, symbol: str) -> Optional[float]:
-        """Método 3: Último precio de klines"""
-        df = self.get_klines(symbol, interval='1m', limit=1)
-        if df is not None and len(df) > 0:
-            return float(df.iloc[-1]['close'])
-        return None
+        """Método 3: Cierre de la última vela de 1m (sin el bucle de reintentos de get_klines)"""
+        self._rate_limit_check(_klines_weight(1))
+        url = self._url_klines
+        response = self._price_session.get(url, params={'symbol': symbol, 'interval': '1m', 'limit': 1},
+                                           timeout=PRICE_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        klines = json_loads(response.content)
+        return float(klines[-1][4]) if klines else None
     
     def get_multiple_prices(self, symbols: List[str]) -> Dict[str, float]:
         """
-        Obtiene precios múltiples de manera eficiente
+        Obtiene precios múltiples de manera eficiente: stream, precios frescos
+        de otro worker, snapshot de get_all_prices si está fresco, una consulta
+        ?symbols=[...] y, si falla, precios individuales
         
         Args:
             symbols: Lista de símbolos
@@ -176,6 +698,24 @@ class BinanceService:
         Returns:
             Diccionario {symbol: price}
         """
+        live = self._live_prices(symbols)
+        if live is not None:
+            return live
+        
+        if self._redis is not None:
+            # Si otro worker ya tiene todos los precios frescos, no hay request
+            shared = self._shared_prices(symbols)
+            now = time.time()
+            if len(shared) == len(symbols) and all(
+                    now - entry['timestamp'] < self._price_fresh_ttl for entry in shared.values()):
+                self._price_cache.update(shared)
+                return {symbol: entry['price'] for symbol, entry in shared.items()}
+        
+        # Snapshot reciente de todos los precios: se filtra sin request
+        snapshot = self._get_cached_response(('all_prices',), ALL_PRICES_CACHE_TTL)
+        if snapshot is not None and all(symbol in snapshot for symbol in symbols):
+            return {symbol: snapshot[symbol] for symbol in symbols}
+        
         logger.info(f"📊 Obteniendo precios para {len(symbols)} símbolos...")
         
         # Intentar obtener todos los precios de una vez
@@ -187,12 +727,15 @@ class BinanceService:
         except Exception as e:
             logger.warning(f"⚠️ Método bulk falló: {e}")
         
-        # Fallback: obtener precios individuales
+        # Fallback: obtener precios individuales en paralelo (la espera de red se
+        # solapa; el token bucket sigue limitando el peso total)
         logger.info("🔄 Obteniendo precios individuales...")
         prices = {}
-        for symbol in symbols:
+        with ThreadPoolExecutor(max_workers=PRICE_FALLBACK_CONCURRENCY) as executor:
+            futures = {symbol: executor.submit(self.get_current_price, symbol) for symbol in symbols}
+        for symbol, future in futures.items():
             try:
-                price = self.get_current_price(symbol)
+                price = future.result()
                 if price:
                     prices[symbol] = price
                 else:
@@ -204,94 +747,141 @@ class BinanceService:
         return prices
     
     def _get_all_prices_bulk(self, symbols: List[str]) -> Dict[str, float]:
-        """Obtiene todos los precios de una vez usando el endpoint bulk"""
-        self._rate_limit_check()
+        """
+        Obtiene los precios de los símbolos pedidos en una sola llamada
+        usando ?symbols=[...] (solo se descarga el subconjunto necesario);
+        con más de BULK_SYMBOLS_MAX se filtra el snapshot de todos los precios
+        """
+        if len(symbols) > BULK_SYMBOLS_MAX:
+            all_prices = self.get_all_prices()
+            prices = {s: all_prices[s] for s in symbols if all_prices.get(s, 0) > 0}
+            self._update_cache_many(prices)
+            return prices
+        
+        self._rate_limit_check(WEIGHT_ALL_PRICES)
         
-        url = f"{self.base_url}/api/v3/ticker/price"
-        response = self.session.get(url, timeout=15)
+        url = self._url_ticker_price
+        params = {'symbols': json.dumps(list(symbols), separators=(',', ':'))}
+        response = self.session.get(url, params=params, timeout=15)
+        
+        # 400: algún símbolo no existe; se resuelve con llamadas individuales
+        if response.status_code == 400:
+            logger.warning(f"⚠️ Símbolo inválido en consulta bulk: {response.text}")
+            return {}
         response.raise_for_status()
         
-        all_tickers = response.json()
+        prices = {t['symbol']: float(t['price']) for t in json_loads(response.content)}
+        prices = {symbol: price for symbol, price in prices.items() if price > 0}
+        self._update_cache_many(prices)
+        return prices
+    
+    def get_all_prices(self) -> Dict[str, float]:
+        """
+        Precios de todos los símbolos de Binance en una sola llamada
+        (/api/v3/ticker/price sin parámetros), cacheados ALL_PRICES_CACHE_TTL s
         
-        # Filtrar solo los símbolos que necesitamos
-        prices = {}
-        for ticker in all_tickers:
-            symbol = ticker['symbol']
-            if symbol in symbols:
-                price = float(ticker['price'])
-                if price > 0:
-                    prices[symbol] = price
-                    self._update_cache(symbol, price)
+        Returns:
+            Diccionario {symbol: price}; vacío si hay error
+        """
+        cache_key = ('all_prices',)
+        cached = self._get_cached_response(cache_key, ALL_PRICES_CACHE_TTL)
+        if cached is not None:
+            return cached
         
+        self._rate_limit_check(WEIGHT_ALL_PRICES)
+        try:
+            response = self.session.get(self._url_ticker_price, timeout=15)
+            response.raise_for_status()
+            prices = {t['symbol']: float(t['price']) for t in json_loads(response.content)}
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo todos los precios: {e}")
+            return {}
+        
+        self._cache_response(cache_key, prices)
         return prices
     
-    def get_market_data(self, symbol: str) -> Optional['MarketData']:
+    def get_market_data(self, symbol: str, use_cache: bool = True) -> Optional['MarketData']:
         """
         Obtiene datos completos de mercado para un símbolo
         
         Args:
             symbol: Símbolo del activo
+            use_cache: Si usar cache (TTL del ticker 24hr)
             
         Returns:
             Objeto MarketData o None si hay error
         """
-        self._rate_limit_check()
+        if use_cache and self._price_stream_alive():
+            ticker = self._live_tickers.get(symbol)
+            if ticker is not None:
+                return self._market_data_from_miniticker(ticker)
+        
+        cache_key = ('market_data', symbol)
+        if use_cache:
+            cached = self._get_cached_response(cache_key, MARKET_DATA_CACHE_TTL)
+            if cached is not None:
+                return cached
+        
+        self._rate_limit_check(WEIGHT_TICKER_24HR)
         
         try:
-            if self.client:
-                # Usar cliente con credenciales
-                ticker = self.client.get_ticker(symbol=symbol)
-                data = {
-                    'symbol': symbol,
-                    'price': float(ticker['lastPrice']),
-                    'high': float(ticker['highPrice']),
-                    'low': float(ticker['lowPrice']),
-                    'volume': float(ticker['volume']),
-                    'change': float(ticker['priceChange']),
-                    'change_percent': float(ticker['priceChangePercent'])
-                }
-            else:
-                # Usar API pública
-                url = f"{self.base_url}/api/v3/ticker/24hr"
-                params = {'symbol': symbol}
-                response = self.session.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                ticker = response.json()
-                
-                data = {
-                    'symbol': symbol,
-                    'price': float(ticker['lastPrice']),
-                    'high': float(ticker['highPrice']),
-                    'low': float(ticker['lowPrice']),
-                    'volume': float(ticker['volume']),
-                    'change': float(ticker['priceChange']),
-                    'change_percent': float(ticker['priceChangePercent'])
-                }
+            url = self._url_ticker_24hr
+            params = {'symbol': symbol}
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            ticker = json_loads(response.content)
             
-            # Crear objeto MarketData
-            from models.trading_analysis import MarketData
+            # MarketData directo desde el ticker; timestamp = closeTime del payload
             market_data = MarketData(
-                symbol=data['symbol'],
-                close_price=data['price'],
-                high_price=data['high'],
-                low_price=data['low'],
-                volume=data['volume'],
-                price_change=data['change'],
-                price_change_percent=data['change_percent'],
-                timestamp=datetime.now()
+                symbol=symbol,
+                open_price=float(ticker['openPrice']),
+                high_price=float(ticker['highPrice']),
+                low_price=float(ticker['lowPrice']),
+                close_price=float(ticker['lastPrice']),
+                volume=float(ticker['volume']),
+                timestamp=datetime.fromtimestamp(ticker['closeTime'] / 1000),
+                price_change=float(ticker['priceChange']),
+                price_change_percent=float(ticker['priceChangePercent'])
             )
             
             # Actualizar cache
-            self._update_cache(symbol, data['price'])
+            self._update_cache(symbol, market_data.close_price)
+            self._cache_response(cache_key, market_data)
             
-            logger.debug(f"✅ Market data obtenida para {symbol}: ${data['price']:,.4f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✅ Market data obtenida para {symbol}: ${market_data.close_price:,.4f}")
             return market_data
             
         except Exception as e:
             logger.error(f"❌ Error obteniendo market data para {symbol}: {e}")
             return None
     
-    def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100) -> Optional[pd.DataFrame]:
+    @staticmethod
+    def _market_data_from_miniticker(ticker: dict) -> MarketData:
+        """
+        MarketData a partir de un miniTicker 24h del stream (mismos datos que
+        /ticker/24hr; el cambio se deriva de apertura y cierre)
+        
+        Args:
+            ticker: Evento miniTicker ('s', 'E', 'o', 'h', 'l', 'c', 'v')
+        """
+        open_price = float(ticker['o'])
+        close_price = float(ticker['c'])
+        change = close_price - open_price
+        return MarketData(
+            symbol=ticker['s'],
+            open_price=open_price,
+            high_price=float(ticker['h']),
+            low_price=float(ticker['l']),
+            close_price=close_price,
+            volume=float(ticker['v']),
+            timestamp=datetime.fromtimestamp(ticker['E'] / 1000),
+            price_change=change,
+            price_change_percent=change / open_price * 100 if open_price else 0.0
+        )
+    
+    def get_klines(self, symbol: str, interval: str = '1h', limit: int = 100,
+                   use_cache: bool = True) -> Optional[pd.DataFrame]:
         """
         Obtiene datos de velas (klines) para análisis técnico - MEJORADO
         
@@ -299,93 +889,136 @@ class BinanceService:
             symbol: Símbolo del trading pair
             interval: Intervalo de tiempo ('1m', '5m', '1h', '4h', '1d')
             limit: Número de velas (máximo 1000)
+            use_cache: Si usar cache (TTL según intervalo)
             
         Returns:
-            DataFrame con datos OHLCV o None si hay error
+            DataFrame OHLCV indexado por open time (ms, int64) o None si hay error
         """
         # Validar parámetros
         if limit > 1000:
             limit = 1000
             logger.warning(f"⚠️ Límite reducido a 1000 para {symbol}")
         
-        valid_intervals = ['1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M']
-        if interval not in valid_intervals:
+        if interval not in VALID_INTERVALS:
             logger.error(f"❌ Intervalo inválido: {interval}")
             return None
         
-        self._rate_limit_check()
+        cache_key = ('klines', symbol, interval, limit)
+        if use_cache:
+            cached = self._get_cached_response(
+                cache_key, KLINES_CACHE_TTL.get(interval, KLINES_CACHE_TTL_DEFAULT)
+            )
+            if cached is not None:
+                # Copia para que mutaciones aguas abajo no alteren el cache
+                return cached.copy()
         
+        # Single-flight: llamadas simultáneas con cache frío comparten la descarga
+        df = self._single_flight(cache_key, self._download_klines, symbol, interval, limit)
+        # Copia para que mutaciones aguas abajo no alteren el cache
+        return df.copy() if df is not None else None
+    
+    def _download_klines(self, symbol: str, interval: str, limit: int) -> Optional[pd.DataFrame]:
+        """
+        Descarga (incremental si hay buffer) y valida las klines; las cachea
+        
+        Args:
+            symbol: Símbolo del trading pair
+            interval: Intervalo de tiempo
+            limit: Número de velas
+            
+        Returns:
+            DataFrame OHLCV (el mismo objeto que queda en cache) o None si hay error
+        """
+        cache_key = ('klines', symbol, interval, limit)
+        buffer_key = (symbol, interval)
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                if self.client:
-                    # Usar cliente con credenciales
-                    klines = self.client.get_klines(
-                        symbol=symbol,
-                        interval=interval,
-                        limit=limit
-                    )
-                else:
-                    # Usar API pública
-                    url = f"{self.base_url}/api/v3/klines"
-                    params = {
-                        'symbol': symbol,
-                        'interval': interval,
-                        'limit': limit
-                    }
-                    
+                url = self._url_klines
+                params = {
+                    'symbol': symbol,
+                    'interval': interval,
+                    'limit': limit
+                }
+                
+                # Con ventana previa suficiente solo se piden las velas nuevas:
+                # desde la última del buffer (seguía abierta y se reemplaza)
+                buffer = self._kline_buffer.get(buffer_key)
+                incremental = buffer is not None and len(buffer) >= limit
+                if incremental:
+                    params['startTime'] = int(buffer.index[-1])
+                    params['limit'] = min(limit, KLINES_INCREMENTAL_LIMIT)
+                
+                self._rate_limit_check(_klines_weight(params['limit']))
+                response = self.session.get(url, params=params, timeout=20)
+                response.raise_for_status()
+                klines = json_loads(response.content)
+                
+                if incremental and len(klines) >= params['limit']:
+                    # Respuesta llena: puede haber un hueco mayor, descarga completa
+                    incremental = False
+                    del params['startTime']
+                    params['limit'] = limit
+                    self._rate_limit_check(_klines_weight(limit))
                     response = self.session.get(url, params=params, timeout=20)
                     response.raise_for_status()
-                    klines = response.json()
+                    klines = json_loads(response.content)
                 
                 if not klines or len(klines) == 0:
                     logger.error(f"❌ API retornó datos vacíos para {symbol}")
                     return None
                 
-                # Convertir a DataFrame con validación robusta
-                df = pd.DataFrame(klines, columns=[
-                    'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                    'close_time', 'quote_asset_volume', 'number_of_trades',
-                    'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-                ])
-                
-                # Convertir tipos de datos con manejo de errores
+                # Parseo único a arrays tipados; solo se usan timestamp + OHLCV
+                # (close_time, quote_asset_volume, etc. no se convierten).
+                # OHLCV en float32: ~7 dígitos significativos bastan para los
+                # indicadores y el cache ocupa la mitad; los kernels operan en float64
                 try:
-                    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                    numeric_columns = ['open', 'high', 'low', 'close', 'volume']
-                    
-                    for col in numeric_columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
+                    arr = np.asarray(klines, dtype=object)
+                    # Strings no numéricos o nulos lanzan aquí (-> except)
+                    ohlcv = arr[:, 1:6].astype(np.float32)
+                    timestamps = arr[:, 0].astype(np.int64)
                     
-                    # Verificar datos válidos
-                    if df[numeric_columns].isnull().any().any():
-                        null_counts = df[numeric_columns].isnull().sum()
-                        logger.warning(f"⚠️ Datos nulos en {symbol}: {null_counts.to_dict()}")
+                    # Verificar datos válidos sobre el array, sin máscaras DataFrame
+                    finite = np.isfinite(ohlcv).all(axis=1)
+                    if not finite.all():
+                        logger.warning(f"⚠️ Datos nulos en {symbol}: {int((~finite).sum())} velas descartadas")
                         # Eliminar filas con datos nulos
-                        df = df.dropna(subset=numeric_columns)
+                        ohlcv = ohlcv[finite]
+                        timestamps = timestamps[finite]
                     
-                    if len(df) == 0:
+                    if len(ohlcv) == 0:
                         logger.error(f"❌ No hay datos válidos para {symbol}")
                         return None
                     
-                    # Validar que los precios son lógicos
-                    for col in ['open', 'high', 'low', 'close']:
-                        if (df[col] <= 0).any():
-                            logger.error(f"❌ Precios inválidos en columna {col} para {symbol}")
-                            return None
+                    # Validar que los precios (open, high, low, close) son lógicos
+                    if (ohlcv[:, :4] <= 0).any():
+                        logger.error(f"❌ Precios inválidos para {symbol}")
+                        return None
                     
                     # Verificar que high >= low, etc.
-                    if not (df['high'] >= df['low']).all():
+                    if not (ohlcv[:, 1] >= ohlcv[:, 2]).all():
                         logger.error(f"❌ Datos inconsistentes (high < low) para {symbol}")
                         return None
                     
+                    df = pd.DataFrame(
+                        ohlcv,
+                        columns=KLINES_COLUMNS,
+                        # Open time en ms (int64); sin DatetimeIndex, que nadie
+                        # usa en el cálculo de indicadores
+                        index=pd.Index(timestamps, name='timestamp')
+                    )
+                    
                 except Exception as e:
                     logger.error(f"❌ Error procesando datos de {symbol}: {e}")
                     return None
                 
-                # Mantener solo columnas necesarias y establecer índice
-                df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].copy()
-                df.set_index('timestamp', inplace=True)
+                if incremental:
+                    # Ventana deslizante: velas previas + nuevas, mismas dtypes
+                    df = pd.concat([buffer[buffer.index < df.index[0]], df])
+                    self._kline_buffer[buffer_key] = df.iloc[-len(buffer):]
+                    df = df.iloc[-limit:]
+                else:
+                    self._kline_buffer[buffer_key] = df
                 
                 # Verificar cantidad mínima de datos
                 min_required = min(20, limit // 2)
@@ -395,6 +1028,7 @@ class BinanceService:
                         continue
                 
                 logger.info(f"✅ Klines obtenidas para {symbol} ({interval}): {len(df)} velas")
+                self._cache_response(cache_key, df)
                 return df
                 
             except requests.exceptions.RequestException as e:
@@ -413,28 +1047,141 @@ class BinanceService:
         logger.error(f"❌ Falló obtener klines para {symbol} después de {max_retries} intentos")
         return None
     
-    def test_connection(self) -> bool:
+    def get_klines_arrays(self, symbol: str, interval: str = '1h',
+                          limit: int = 100) -> Optional[Klines]:
+        """
+        Velas como columnas NumPy (Klines) para los cálculos que no necesitan
+        pandas. Reutiliza el buffer y el cache de get_klines y convierte una
+        sola vez a float64; los arrays son de solo lectura y se comparten
+        entre llamadas sin copiar
+        
+        Args:
+            symbol: Símbolo del trading pair
+            interval: Intervalo de tiempo
+            limit: Número de velas
+            
+        Returns:
+            Klines con timestamp (ms) y OHLCV o None si hay error
+        """
+        cache_key = ('klines_arrays', symbol, interval, limit)
+        cached = self._get_cached_response(
+            cache_key, KLINES_CACHE_TTL.get(interval, KLINES_CACHE_TTL_DEFAULT)
+        )
+        if cached is not None:
+            return cached
+        
+        df = self.get_klines(symbol, interval, limit)
+        if df is None:
+            return None
+        
+        columns = [df.index.to_numpy(dtype=np.int64)]
+        columns.extend(df[col].to_numpy(dtype=np.float64) for col in KLINES_COLUMNS)
+        for column in columns:
+            column.flags.writeable = False
+        
+        klines = Klines(*columns)
+        self._cache_response(cache_key, klines)
+        return klines
+    
+    async def get_klines_async(self, symbol: str, interval: str = '1h',
+                               limit: int = 100) -> Optional[pd.DataFrame]:
+        """
+        Versión asíncrona de get_klines para lanzar varias descargas en paralelo
+        (ej: asyncio.gather de 4h y 1h). Reutiliza la sesión HTTP con pool.
+        
+        Args:
+            symbol: Símbolo del trading pair
+            interval: Intervalo de tiempo
+            limit: Número de velas
+            
+        Returns:
+            DataFrame con datos OHLCV o None si hay error
+        """
+        return await asyncio.to_thread(self.get_klines, symbol, interval, limit)
+    
+    def _refresh_time_offset(self, timeout: int = 10) -> int:
+        """
+        Mide el offset entre el reloj de Binance y el local con /api/v3/time
+        
+        Returns:
+            Tiempo del servidor en milisegundos
+        """
+        self._rate_limit_check()
+        url = self._url_time
+        sent_ms = time.time() * 1000
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        received_ms = time.time() * 1000
+        server_ms = json_loads(response.content)['serverTime']
+        
+        # El servidor respondió aprox. a mitad del round-trip
+        self._time_rtt_ms = received_ms - sent_ms
+        self._time_offset_ms = int(server_ms - (sent_ms + received_ms) / 2)
+        self._offset_fetched = time.monotonic()
+        if self.client is not None:
+            # python-binance suma este offset al timestamp de los requests firmados
+            self.client.timestamp_offset = self._time_offset_ms
+        return server_ms
+    
+    def get_server_time_ms(self, force_refresh: bool = False) -> int:
+        """
+        Hora actual de Binance en ms (int) derivada del reloj local más el
+        offset medido. Solo consulta la API si el offset no existe, tiene más
+        de SERVER_TIME_REFRESH segundos o se pide force_refresh
+        
+        Args:
+            force_refresh: Consultar /api/v3/time aunque el offset sea reciente
+            
+        Returns:
+            Epoch del servidor en milisegundos
+        """
+        if (force_refresh or self._offset_fetched is None
+                or time.monotonic() - self._offset_fetched > SERVER_TIME_REFRESH):
+            return self._refresh_time_offset()
+        return time.time_ns() // 1_000_000 + self._time_offset_ms
+    
+    def get_server_time(self, force_refresh: bool = False) -> datetime:
+        """
+        Hora actual de Binance como datetime (ver get_server_time_ms)
+        
+        Args:
+            force_refresh: Consultar /api/v3/time aunque el offset sea reciente
+            
+        Returns:
+            datetime con la hora del servidor
+        """
+        return datetime.fromtimestamp(self.get_server_time_ms(force_refresh) / 1000)
+    
+    def test_connection(self, use_cache: bool = True) -> bool:
         """
         Prueba la conexión con Binance API - MEJORADO
         
+        Args:
+            use_cache: Reutilizar el resultado de los últimos CONNECTION_CHECK_TTL s
+            
         Returns:
             True si la conexión es exitosa
         """
+        ok, checked_at = self._last_connection_check
+        if use_cache and time.monotonic() - checked_at < CONNECTION_CHECK_TTL:
+            return ok
+        
+        ok = self._check_connection()
+        self._last_connection_check = (ok, time.monotonic())
+        return ok
+    
+    def _check_connection(self) -> bool:
+        """Ejecuta la prueba de conexión contra la API (sin cache)"""
         try:
-            # Test 1: Ping básico
-            url = f"{self.base_url}/api/v3/ping"
-            response = self.session.get(url, timeout=5)
-            response.raise_for_status()
+            # Test 1: Tiempo del servidor; confirma conectividad y API viva
+            # en un solo request (un /ping previo no aporta nada) y mide el
+            # offset de reloj
+            self._refresh_time_offset(timeout=5)
             
-            # Test 2: Tiempo del servidor
-            url_time = f"{self.base_url}/api/v3/time"
-            time_response = self.session.get(url_time, timeout=5)
-            time_response.raise_for_status()
-            
-            # Test 3: Si hay cliente, probar credenciales
+            # Test 2: Si hay cliente, probar credenciales
             if self.client:
                 try:
-                    account_info = self.client.get_account()
+                    account_info = self._with_retry(self.client.get_account)
                     logger.info("✅ Conexión Binance exitosa (con credenciales)")
                     return True
                 except Exception as e:
@@ -457,6 +1204,73 @@ class BinanceService:
             logger.error(f"❌ Error de conexión Binance: {e}")
             return False
     
+    def _get_exchange_info_map(self, ttl: float = EXCHANGE_INFO_CACHE_TTL) -> Dict[str, dict]:
+        """
+        Metadata de exchangeInfo indexada por símbolo, cacheada ttl segundos
+        
+        Args:
+            ttl: Segundos de validez del cache
+            
+        Returns:
+            Diccionario {symbol: info}
+        """
+        cache_key = ('exchange_info',)
+        cached = self._get_cached_response(cache_key, ttl)
+        if cached is not None:
+            return cached
+        
+        self._rate_limit_check(WEIGHT_EXCHANGE_INFO)
+        response = self.session.get(self._url_exchange_info, timeout=20)
+        response.raise_for_status()
+        exchange_info = json_loads(response.content)
+        symbols = {s['symbol']: s for s in exchange_info['symbols']}
+        
+        self._cache_response(cache_key, symbols)
+        return symbols
+    
+    def test_symbol_data(self, symbol: str) -> Dict:
+        """
+        Diagnóstico de un símbolo: existencia en el exchange, klines y precio
+        
+        Args:
+            symbol: Símbolo del trading pair
+            
+        Returns:
+            Diccionario con connection_ok, symbol_info, klines_1h, klines_4h,
+            current_price y la lista de errors
+        """
+        result = {
+            'symbol': symbol,
+            'connection_ok': False,
+            'symbol_info': None,
+            'klines_1h': 0,
+            'klines_4h': 0,
+            'current_price': None,
+            'errors': []
+        }
+        
+        try:
+            result['symbol_info'] = self._get_exchange_info_map().get(symbol)
+            result['connection_ok'] = True
+            if result['symbol_info'] is None:
+                result['errors'].append(f"Símbolo {symbol} no encontrado en exchangeInfo")
+        except Exception as e:
+            result['errors'].append(f"Error obteniendo exchangeInfo: {e}")
+            return result
+        
+        for interval in ('1h', '4h'):
+            df = self.get_klines(symbol, interval, 100)
+            if df is not None:
+                result[f'klines_{interval}'] = len(df)
+            else:
+                result['errors'].append(f"Sin klines {interval}")
+        
+        result['current_price'] = self.get_current_price(symbol)
+        if result['current_price'] is None:
+            result['errors'].append("Sin precio actual")
+        
+        return result
+    
     def get_server_status(self) -> Dict:
         """
         Obtiene estado completo del servidor Binance y capacidades
@@ -467,6 +1281,7 @@ class BinanceService:
         status = {
             'connected': False,
             'server_time': None,
+            'server_time_ms': None,
             'local_time': datetime.now(),
             'api_type': 'none',
             'rate_limits': {},
@@ -482,19 +1297,16 @@ class BinanceService:
                 
                 # Obtener tiempo del servidor y calcular latencia
                 try:
-                    start_time = time.time()
-                    url = f"{self.base_url}/api/v3/time"
-                    response = self.session.get(url, timeout=10)
-                    response.raise_for_status()
-                    latency = (time.time() - start_time) * 1000  # ms
+                    # Offset ya medido por test_connection: sin otro /api/v3/time
+                    server_ms = self.get_server_time_ms()
+                    status['latency_ms'] = round(self._time_rtt_ms, 2)
+                    status['server_time_ms'] = server_ms
+                    # datetime solo para mostrar
+                    status['server_time'] = datetime.fromtimestamp(server_ms / 1000)
                     
-                    time_data = response.json()
-                    status['server_time'] = datetime.fromtimestamp(time_data['serverTime'] / 1000)
-                    status['latency_ms'] = round(latency, 2)
-                    
-                    # Verificar sincronización de tiempo
-                    time_diff = abs((status['server_time'] - status['local_time']).total_seconds())
-                    status['time_sync_ok'] = time_diff < 60  # Menos de 1 minuto de diferencia
+                    # Verificar sincronización de tiempo (aritmética entera en ms)
+                    time_diff_ms = abs(self._time_offset_ms)
+                    status['time_sync_ok'] = time_diff_ms < 60_000  # Menos de 1 minuto de diferencia
                     
                 except Exception as e:
                     status['errors'].append(f"Error obteniendo tiempo servidor: {e}")
@@ -502,7 +1314,7 @@ class BinanceService:
                 # Determinar tipo de API
                 if self.client:
                     try:
-                        account_info = self.client.get_account()
+                        account_info = self._with_retry(self.client.get_account)
                         status['api_type'] = 'authenticated'
                         status['account_type'] = account_info.get('accountType', 'unknown')
                     except:
@@ -513,22 +1325,16 @@ class BinanceService:
                 
                 # Test símbolos principales con detalles
                 test_symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+                start_time = time.monotonic()
+                prices = self.get_multiple_prices(test_symbols)
+                response_time = round((time.monotonic() - start_time) * 1000, 2)
                 for symbol in test_symbols:
-                    try:
-                        start_time = time.time()
-                        price = self.get_current_price(symbol, use_cache=False)
-                        response_time = (time.time() - start_time) * 1000
-                        
-                        status['symbols_tested'][symbol] = {
-                            'accessible': price is not None,
-                            'price': price,
-                            'response_time_ms': round(response_time, 2)
-                        }
-                    except Exception as e:
-                        status['symbols_tested'][symbol] = {
-                            'accessible': False,
-                            'error': str(e)
-                        }
+                    price = prices.get(symbol)
+                    status['symbols_tested'][symbol] = {
+                        'accessible': price is not None,
+                        'price': price,
+                        'response_time_ms': response_time
+                    }
                 
                 # Información de rate limits (si está disponible)
                 try:
@@ -549,8 +1355,10 @@ class BinanceService:
         return status
     
     def clear_cache(self):
-        """Limpia el cache de precios"""
+        """Limpia el cache de precios y de respuestas"""
         self._price_cache.clear()
+        self._response_cache.clear()
+        self._kline_buffer.clear()
         logger.info("🧹 Cache de precios limpiado")
     
     def get_cache_info(self) -> Dict:
@@ -566,18 +1374,54 @@ class BinanceService:
             'total_entries': len(self._price_cache),
             'valid_entries': valid_entries,
             'cache_timeout': self._cache_timeout,
-            'symbols': list(self._price_cache.keys())
+            'symbols': list(self._price_cache.keys()),
+            'response_entries': len(self._response_cache),
+            'kline_buffers': len(self._kline_buffer)
         }
 
-# INSTANCIA GLOBAL - Configurada desde enhanced_config
-try:
-    from enhanced_config import MerinoConfig
-    binance_service = BinanceService(
+# INSTANCIA GLOBAL - Configurada desde enhanced_config y creada en el primer
+# uso: importar el módulo no abre conexiones ni construye el cliente Binance
+_binance_service_instance: Optional[BinanceService] = None
+_binance_service_lock = threading.Lock()
+
+def get_binance_service() -> BinanceService:
+    """
+    Retorna la instancia global de BinanceService, creándola la primera vez
+    
+    Returns:
+        Instancia compartida del servicio
+    """
+    global _binance_service_instance
+    if _binance_service_instance is None:
+        with _binance_service_lock:
+            if _binance_service_instance is None:
+                _binance_service_instance = _create_global_service()
+    return _binance_service_instance
+
+def _create_global_service() -> BinanceService:
+    """Construye la instancia global con la configuración de MerinoConfig"""
+    try:
+        from enhanced_config import MerinoConfig
+    except ImportError:
+        # Fallback si no hay config
+        service = BinanceService()
+        logger.warning("⚠️ BinanceService inicializado sin configuración")
+        return service
+    
+    service = BinanceService(
         api_key=MerinoConfig.BINANCE_API_KEY,
-        secret_key=MerinoConfig.BINANCE_SECRET_KEY
+        secret_key=MerinoConfig.BINANCE_SECRET_KEY,
+        price_fresh_ttl=MerinoConfig.PRICE_CACHE_FRESH_TTL,
+        price_stale_ttl=MerinoConfig.PRICE_CACHE_STALE_TTL,
+        redis_url=MerinoConfig.REDIS_URL
     )
+    if MerinoConfig.PRICE_STREAM_ENABLED:
+        service.start_price_stream()
     logger.info("🚀 BinanceService global inicializado")
-except ImportError:
-    # Fallback si no hay config
-    binance_service = BinanceService()
-    logger.warning("⚠️ BinanceService inicializado sin configuración")
\ No newline at end of file
+    return service
+
+def __getattr__(name: str):
+    """Compatibilidad: `from services.binance_service import binance_service`"""
+    if name == 'binance_service':
+        return get_binance_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,50 @@
+"""
+Compilación AOT (numba.pycc) de los kernels de calculate_all_indicators
+y de las EMAs de la metodología Merino
+
+Genera services/_kernels_aot.*.so; services/kernels.py lo importa si existe,
+así el servidor no paga el JIT en frío y ni siquiera necesita Numba instalado.
+Requiere Numba y un compilador C solo en el paso de build.
+
+Uso:
+    python -m services.build_kernels_aot
+"""
+import os
+
+from numba.pycc import CC
+
+from services.kernels import JIT_KERNELS, _F8_1D
+
+AOT_MODULE = '_kernels_aot'
+
+# Mismas firmas que los @njit de JIT_KERNELS en services/kernels.py
+AOT_EXPORTS = {
+    'ewma_last': f'float64({_F8_1D}, int64)',
+    'ewma_last_pair': f'UniTuple(float64, 2)({_F8_1D}, int64, int64)',
+    'squeeze_kernel': (f'Tuple((float64[:], boolean[:], boolean[:]))'
+                       f'({_F8_1D}, {_F8_1D}, {_F8_1D}, int64, int64, float64)'),
+    'ema_last_recursive': f'float64({_F8_1D}, int64)',
+    'sma_last': f'float64({_F8_1D}, int64)',
+    'rsi_last': f'float64({_F8_1D}, int64)',
+    'bollinger_last': f'UniTuple(float64, 3)({_F8_1D}, int64, float64)',
+    'macd_last': f'UniTuple(float64, 2)({_F8_1D}, int64, int64, int64)',
+    'adx_kernel': f'UniTuple(float64[:], 3)({_F8_1D}, {_F8_1D}, {_F8_1D}, int64)',
+}
+
+def build(output_dir: str = None) -> None:
+    """
+    Compila AOT_EXPORTS en el módulo AOT_MODULE
+
+    Args:
+        output_dir: Carpeta destino (por defecto, la de este paquete)
+    """
+    cc = CC(AOT_MODULE)
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    for name, signature in AOT_EXPORTS.items():
+        # py_func: la función Python original detrás del dispatcher @njit
+        cc.export(name, signature)(JIT_KERNELS[name].py_func)
+    cc.compile()
+    print(f"✅ Kernels AOT compilados en {cc.output_dir}")
+
+if __name__ == '__main__':
+    build()
@@ -1,10 +1,17 @@
 """
 Servicio de análisis mejorado implementando la metodología completa de Jaime Merino
 """
+import asyncio
+import threading
+import time
+import numpy as np
 import pandas as pd  # ← NUEVO
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional, Dict
-from services.binance_service import binance_service
+from types import MappingProxyType
+from typing import Optional, Dict, List, Tuple
+from services.binance_service import BinanceService, get_binance_service
+from services.kernels import ewma_last_pair
 from services.enhanced_indicators import jaime_merino_signal_generator  # ← COMENTADA
 from models.trading_analysis import TradingAnalysis, create_analysis
 from utils.logger import analysis_logger
@@ -12,6 +19,258 @@ from enhanced_config import MerinoConfig  # ← También cambiar esto si está u
 
 logger = analysis_logger
 
+# Segundos durante los que se reutilizan los indicadores Merino de un símbolo
+# mientras no cierre una nueva vela de 4h/1h
+MERINO_CACHE_TTL = 30
+# Máximo de entradas en cache (LRU)
+MERINO_CACHE_SIZE = 128
+
+# Filosofía 40-30-20-10 de Merino (% de la cartera)
+MERINO_BASE_ALLOCATION = MappingProxyType({
+    'btc_long_term': 40,  # 40% Bitcoin largo plazo
+    'weekly_charts': 30,  # 30% gráficos semanales
+    'daily_trading': 20,  # 20% trading diario
+    'futures': 10         # 10% futuros
+})
+
+# Operación actual según la fuerza de la señal
+# Señal muy fuerte (>= 70): aumentar asignación a trading diario
+MERINO_ALLOC_STRONG = MappingProxyType({
+    'position_size': 3.0,  # 3% del capital total
+    'max_risk_per_trade': 1.0,  # 1% máximo riesgo
+    'recommended_timeframe': 'daily_trading'
+})
+# Señal moderada (>= 50)
+MERINO_ALLOC_MODERATE = MappingProxyType({
+    'position_size': 2.0,  # 2% del capital total
+    'max_risk_per_trade': 1.0,
+    'recommended_timeframe': 'daily_trading'
+})
+# Sin señal clara: preservar capital
+MERINO_ALLOC_NONE = MappingProxyType({
+    'position_size': 0.0,
+    'max_risk_per_trade': 0.0,
+    'recommended_timeframe': 'wait'
+})
+
+# Escala de asignación: el índice es cuántos umbrales de fuerza se superan
+# (>= 50, >= 70); las señales no direccionales quedan siempre en NONE
+MERINO_TRADE_ALLOCATIONS = (MERINO_ALLOC_NONE, MERINO_ALLOC_MODERATE, MERINO_ALLOC_STRONG)
+DIRECTIONAL_SIGNALS = frozenset({'LONG', 'SHORT'})
+MERINO_PHILOSOPHY = '40-30-20-10 (BTC_LT-Weekly-Daily-Futures)'
+
+# Reglas de confluencia de _analyze_confluence: (factor, se cumple(señal), descripción(señal))
+MERINO_CONFLUENCE_RULES = (
+    # EMAs
+    ('EMAs alineadas',
+     lambda s: s['bias'] != 'NEUTRAL',
+     lambda s: f"EMA 11 {'>' if s['bias'] == 'BULLISH' else '<'} EMA 55"),
+    # ADX
+    ('ADX trending',
+     lambda s: s['timeframe_4h'].get('adx', {}).get('trending', False),
+     lambda s: f"ADX {s['timeframe_4h'].get('adx', {}).get('adx', 0):.1f} > 25"),
+    # Momentum
+    ('Momentum direccional',
+     lambda s: abs(s['timeframe_4h'].get('momentum', 0)) > 0.001,
+     lambda s: f"Momentum {s['timeframe_4h'].get('momentum', 0):+.4f}"),
+    # Volume Profile
+    ('Cerca del VPoC',
+     lambda s: abs(s['volume_profile'].get('vpoc_distance_pct', 100)) < 3,
+     lambda s: f"Distancia VPoC: {s['volume_profile'].get('vpoc_distance_pct', 100):+.2f}%"),
+)
+# Nivel de confluencia según cuántas reglas se cumplen (0..4)
+MERINO_CONFLUENCE_LEVELS = ('BAJA', 'BAJA', 'MEDIA', 'ALTA', 'ALTA')
+
+# Plantillas de texto (str.format_map). Se definen una sola vez a nivel de
+# módulo; los métodos solo calculan el contexto y eligen la plantilla
+MERINO_ANALYSIS_TEMPLATE = """📊 ANÁLISIS TÉCNICO JAIME MERINO - {symbol}
+============================================================
+
+💰 PRECIO ACTUAL: ${price:,.4f}
+🎯 SEÑAL: {signal_type} | FUERZA: {signal_strength}/100
+📈 SESGO 4H: {bias} | CONFLUENCIAS: {confluence_score}/4
+
+🔍 ANÁLISIS MULTI-TEMPORAL:
+────────────────────────────────────────
+📊 Contexto Diario:
+   • Tendencia Macro: {macro_trend}
+   • EMA 11 Diario: ${ema_11_daily:,.4f}
+   • EMA 55 Diario: ${ema_55_daily:,.4f}
+   • Volatilidad: {volatility_pct:.2f}%
+
+⏰ Timeframe 4H (Principal):
+   • EMA 11: ${ema_11:,.4f}
+   • EMA 55: ${ema_55:,.4f}
+   • Relación EMAs: {ema_relation}
+   • Precio vs EMA11: {price_vs_ema11:+.2f}%
+
+📊 INDICADORES CLAVE:
+────────────────────────────────────────
+🎯 ADX (Fuerza de Tendencia):
+   • Valor: {adx:.1f} | Modificado: {adx_modified:.1f}
+   • Clasificación: {adx_strength}
+   • Pendiente: {adx_slope}
+   • Trending: {trending}
+
+⚡ Squeeze Momentum:
+   • Estado: {squeeze_state}
+   • Momentum: {momentum:+.4f}
+   • Dirección: {momentum_direction}
+
+📊 VOLUME PROFILE (VPVR):
+   • VPoC: ${vpoc:,.4f}
+   • Distancia del VPoC: {vpoc_distance_pct:+.2f}%
+   • Niveles de Alto Volumen: {high_volume_levels} identificados
+
+💡 METODOLOGÍA JAIME MERINO:
+────────────────────────────────────────
+✅ Criterios Cumplidos:
+   • EMAs alineadas para sesgo: {check_bias}
+   • ADX confirma tendencia: {check_adx}
+   • Momentum direccional: {check_momentum}
+   • Sin squeeze (consolidación): {check_squeeze}
+
+🎯 FILOSOFÍA CONTRARIA:
+   • Operando contra el 90% que pierde
+   • Disciplina > Análisis técnico perfecto
+   • "Solo operamos con alta probabilidad"
+
+📈 NIVELES CRÍTICOS:
+────────────────────────────────────────
+🛡️ Soporte 20D: ${support_20d:,.4f} ({price_vs_support:+.2f}%)
+🚫 Resistencia 20D: ${resistance_20d:,.4f} ({price_vs_resistance:+.2f}%)
+📊 VPoC: ${vpoc:,.4f} (Nivel de mayor volumen)
+
+⚠️ EVALUACIÓN DE RIESGO:
+────────────────────────────────────────
+🎲 Riesgo General: {risk_level}
+📊 Volatilidad: {volatility_pct:.2f}% ({volatility_label})
+🔍 Manipulación: {manipulation}
+
+⏰ Análisis generado: {generated_at}
+📚 Metodología: Jaime Merino - Trading Latino Avanzado"""
+
+MERINO_LONG_TEMPLATE = """🟢 RECOMENDACIÓN JAIME MERINO: POSICIÓN LARGA
+=======================================================
+
+✅ SETUP ALCISTA CONFIRMADO:
+   • Sesgo 4H: {bias}
+   • Confluencias técnicas: {confluence_score}/4
+   • Fuerza de señal: {strength}% ({strength_label})
+
+💰 GESTIÓN DE CAPITAL (Filosofía 40-30-20-10):
+   • Asignación recomendada: {position_size:.1f}% del capital total
+   • Riesgo máximo: {max_risk_per_trade:.1f}% por operación
+   • Timeframe: Trading diario (20% de la cartera)
+
+🎯 PLAN DE TRADING:
+   • Entrada: ${entry:,.4f}
+   • Target 1: ${target_1:,.4f} (+2%) - CERRAR 50%
+   • Target 2: ${target_2:,.4f} (+5%) - CERRAR RESTO
+   • Stop Loss: ${stop_loss:,.4f} (-2%)
+
+🛡️ REGLAS DE MERINO:
+   • Sin apalancamiento > 1:3
+   • Stop si cierra bajo EMA 11
+   • Máximo 6% pérdida diaria
+   • Máximo 8% pérdida semanal
+
+⚡ EJECUCIÓN:
+   1. Verificar volumen en breakout
+   2. Entrada gradual en 2-3 tramos
+   3. Mover stop a breakeven en +1%
+   4. Seguir plan sin emociones
+
+💡 METODOLOGÍA: "Tomar dinero de otros legalmente"
+⚠️ INVALIDACIÓN: Cierre bajo EMA 11 en 4H"""
+
+MERINO_SHORT_TEMPLATE = """🔴 RECOMENDACIÓN JAIME MERINO: POSICIÓN CORTA
+=======================================================
+
+✅ SETUP BAJISTA CONFIRMADO:
+   • Sesgo 4H: {bias}
+   • Confluencias técnicas: {confluence_score}/4
+   • Fuerza de señal: {strength}% ({strength_label})
+
+💰 GESTIÓN DE CAPITAL (Filosofía 40-30-20-10):
+   • Asignación recomendada: {position_size:.1f}% del capital total
+   • Riesgo máximo: {max_risk_per_trade:.1f}% por operación
+   • Timeframe: Trading diario (20% de la cartera)
+
+🎯 PLAN DE TRADING:
+   • Entrada: ${entry:,.4f}
+   • Target 1: ${target_1:,.4f} (-2%) - CERRAR 50%
+   • Target 2: ${target_2:,.4f} (-5%) - CERRAR RESTO
+   • Stop Loss: ${stop_loss:,.4f} (+2%)
+
+🛡️ REGLAS DE MERINO:
+   • Sin apalancamiento > 1:3
+   • Stop si cierra sobre EMA 11
+   • Máximo 6% pérdida diaria
+   • Máximo 8% pérdida semanal
+
+⚡ EJECUCIÓN:
+   1. Confirmar presión vendedora
+   2. Entrada gradual en 2-3 tramos
+   3. Mover stop a breakeven en +1%
+   4. Mantener disciplina total
+
+💡 METODOLOGÍA: "Operar contra el 90% que pierde"
+⚠️ INVALIDACIÓN: Cierre sobre EMA 11 en 4H"""
+
+MERINO_SQUEEZE_TEMPLATE = """🟡 RECOMENDACIÓN JAIME MERINO: ESPERAR - SQUEEZE DETECTADO
+============================================================
+
+⏳ SITUACIÓN: CONSOLIDACIÓN (SQUEEZE ON)
+   • El mercado está en compresión
+   • Esperando expansión de volatilidad
+   • Bollinger Bands dentro de Keltner Channels
+
+📊 ESTADO ACTUAL:
+   • Precio: ${price:,.4f}
+   • Momentum actual: {momentum:+.4f}
+   • ADX: {adx:.1f}
+
+🎯 PLAN DE ACCIÓN:
+   • ESPERAR ruptura del squeeze
+   • Preparar alertas en niveles clave
+   • NO forzar operaciones
+   • Preservar capital es prioridad
+
+🔔 ALERTAS SUGERIDAS:
+   • Ruptura alcista: > ${breakout_up:,.4f}
+   • Ruptura bajista: < ${breakout_down:,.4f}
+   • Activación ADX: > 25
+
+💡 FILOSOFÍA MERINO:
+   "Es mejor perder una oportunidad que perder dinero"
+   
+⏰ REVISIÓN: Cada 2-4 horas hasta expansión"""
+
+MERINO_NONE_TEMPLATE = """⚪ RECOMENDACIÓN JAIME MERINO: SIN OPERACIÓN
+==================================================
+
+🚫 RAZÓN: Condiciones técnicas insuficientes
+   • Fuerza de señal: {strength}% (Mínimo: 50%)
+   • Confluencias: {confluence_score}/4 (Mínimo: 3/4)
+
+📊 ESTADO ACTUAL:
+   • Señal: {signal_type}
+   • Sesgo: {bias}
+   • ADX: {adx:.1f}
+
+💰 ACCIÓN RECOMENDADA:
+   • PRESERVAR CAPITAL (40% en BTC largo plazo)
+   • ESPERAR mejor configuración
+   • MANTENER disciplina
+
+📚 RECORDATORIO MERINO:
+   "Solo operamos con alta probabilidad de éxito"
+   "El dinero no se hace forzando operaciones"
+
+🔍 PRÓXIMA REVISIÓN: 4 horas
+⚠️ NO OPERAR hasta confluencia ≥ 3/4"""
+
 class EnhancedAnalysisService:
     """
     Servicio de análisis mejorado siguiendo la metodología exacta de Jaime Merino
@@ -19,40 +278,129 @@ class EnhancedAnalysisService:
     
     def __init__(self):
         """Inicializa el servicio de análisis mejorado"""
-        self.binance = binance_service
+        self._binance: Optional[BinanceService] = None
         self.merino_generator = jaime_merino_signal_generator
+        
+        # Cache de indicadores (calculate_merino_features):
+        # (symbol, última vela 4h, última vela 1h) -> (monotonic, features)
+        self._cache: 'OrderedDict[Tuple[str, int, int], Tuple[float, Dict]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Event loop propio en un hilo daemon: las llamadas síncronas le envían
+        # sus corrutinas, también desde hilos que ya tienen un loop en marcha
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
         logger.info("🚀 Servicio de análisis mejorado inicializado - Metodología Jaime Merino")
     
+    @property
+    def binance(self) -> BinanceService:
+        """Servicio de Binance, resuelto en el primer uso (get_binance_service)"""
+        if self._binance is None:
+            self._binance = get_binance_service()
+        return self._binance
+    
+    def _run(self, coro):
+        """
+        Ejecuta una corrutina en el event loop del servicio y espera su resultado
+        
+        A diferencia de asyncio.run, funciona aunque el hilo llamante ya tenga
+        un event loop en ejecución y reutiliza el mismo loop entre peticiones.
+        
+        Args:
+            coro: Corrutina a ejecutar
+            
+        Returns:
+            Resultado de la corrutina
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name='merino-analysis-loop',
+                    daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
     # services/enhanced_analysis_service.py
 
     def analyze_symbol_merino(self, symbol: str) -> Optional[Dict]:
         """
         Realiza análisis completo siguiendo la metodología de Jaime Merino
         """
+        return self._run(self.analyze_symbol_async(symbol))
+    
+    def analyze_symbols_merino(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Analiza varios símbolos en paralelo: las descargas de todos los símbolos
+        se lanzan a la vez y el tiempo total tiende al del símbolo más lento
+        
+        Args:
+            symbols: Lista de símbolos
+            
+        Returns:
+            Diccionario {symbol: análisis o None}
+        """
+        return self._run(self.analyze_symbols_async(symbols))
+    
+    async def analyze_symbols_async(self, symbols: List[str]) -> Dict[str, Optional[Dict]]:
+        """Versión asíncrona de analyze_symbols_merino"""
+        results = await asyncio.gather(*(self.analyze_symbol_async(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+    
+    async def analyze_symbol_async(self, symbol: str) -> Optional[Dict]:
+        """
+        Análisis Merino asíncrono: klines y precio se descargan de forma concurrente
+        y el cálculo de indicadores se ejecuta en el executor por defecto
+        """
         try:
             logger.info(f"📊 Iniciando análisis Merino para {symbol}")
             
-            # 1. Obtener datos multi-temporales
-            df_4h = self.binance.get_klines(symbol, interval='4h', limit=100)
-            df_1h = self.binance.get_klines(symbol, interval='1h', limit=50)
-            df_daily = self.binance.get_klines(symbol, interval='1d', limit=30)
+            # 1. Obtener datos multi-temporales y precio actual (en paralelo)
+            (df_4h, df_1h), current_price = await asyncio.gather(
+                self._fetch_timeframes(symbol),
+                asyncio.to_thread(self.binance.get_current_price, symbol)
+            )
             
             if any(df is None or len(df) < 20 for df in [df_4h, df_1h]):
                 logger.error(f"❌ Insuficientes datos históricos para {symbol}")
                 return None
             
-            # 2. Obtener precio actual
-            current_price = self.binance.get_current_price(symbol)
+            # 2. Validar precio actual
             if not current_price:
                 logger.error(f"❌ No se pudo obtener precio actual de {symbol}")
                 return None
             
-            # 3. Generar señal completa de Merino
-            merino_signal = self.merino_generator.generate_merino_signal(
-                df_4h, df_1h, current_price
+            # 3. Señal e informe (CPU) fuera del event loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, self._merino_pipeline, symbol, df_4h, df_1h, current_price
             )
             
-            # 4. Análisis básico de contexto
+        except Exception as e:
+            logger.error(f"❌ Error en análisis Merino de {symbol}: {e}")
+            return None
+    
+    def _merino_pipeline(self, symbol: str, df_4h: pd.DataFrame, df_1h: pd.DataFrame,
+                         current_price: float) -> Optional[Dict]:
+        """
+        Parte de cálculo del análisis Merino (señal, contexto, capital y texto)
+        
+        Los indicadores (EMAs, RSI, volumen) se reutilizan durante MERINO_CACHE_TTL
+        segundos mientras las últimas velas de 4h y 1h sean las mismas; la señal,
+        los niveles de trading y el resto se recalculan siempre con el precio actual
+        """
+        try:
+            # 1. Generar señal completa de Merino (indicadores del cache si los hay)
+            key = (symbol, int(df_4h.index[-1]), int(df_1h.index[-1]))
+            features = self._cache_get(key)
+            if features is None:
+                features = self.merino_generator.calculate_merino_features(df_4h, df_1h, symbol)
+                if features is not None:
+                    self._cache_put(key, features)
+            merino_signal = self.merino_generator.signal_from_features(features, current_price)
+            
+            # 2. Análisis básico de contexto
             market_context = {
                 'macro_trend': 'NEUTRAL',
                 'ema_11_daily': float(current_price),
@@ -60,7 +408,7 @@ class EnhancedAnalysisService:
                 'volatility_pct': 2.0
             }
             
-            # 5. Gestión básica de capital
+            # 3. Gestión básica de capital
             capital_allocation = {
                 'current_trade': {
                     'position_size': 2.0 if merino_signal['signal'] in ['LONG', 'SHORT'] else 0.0,
@@ -69,10 +417,10 @@ class EnhancedAnalysisService:
                 'philosophy': '40-30-20-10'
             }
             
-            # 6. Análisis textual
+            # 4. Análisis textual
             analysis_text = f"Análisis Merino para {symbol}: {merino_signal['signal']} ({merino_signal['signal_strength']}%)"
             
-            # 7. Crear estructura compatible con el sistema de caché
+            # 5. Crear estructura compatible con el sistema de caché
             result = {
                 'symbol': symbol,
                 'timestamp': datetime.now().isoformat(),
@@ -99,14 +447,46 @@ class EnhancedAnalysisService:
         except Exception as e:
             logger.error(f"❌ Error en análisis Merino de {symbol}: {e}")
             return None
+    
+    def _cache_get(self, key: Tuple[str, int, int]) -> Optional[Dict]:
+        """Indicadores cacheados para `key` si no han superado MERINO_CACHE_TTL"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or time.monotonic() - entry[0] >= MERINO_CACHE_TTL:
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+    
+    def _cache_put(self, key: Tuple[str, int, int], features: Dict):
+        """Guarda los indicadores descartando los menos usados si se supera MERINO_CACHE_SIZE"""
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), features)
+            self._cache.move_to_end(key)
+            if len(self._cache) > MERINO_CACHE_SIZE:
+                self._cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """Limpia el cache de indicadores Merino"""
+        with self._cache_lock:
+            self._cache.clear()
+        logger.info("🧹 Cache de indicadores Merino limpiado")
+    
+    async def _fetch_timeframes(self, symbol: str):
+        """Descarga klines 4h y 1h (las que usa _merino_pipeline) de forma concurrente"""
+        return await asyncio.gather(
+            self.binance.get_klines_async(symbol, interval='4h', limit=100),
+            self.binance.get_klines_async(symbol, interval='1h', limit=50)
+        )
+    
     def _analyze_market_context(self, df_daily: pd.DataFrame, current_price: float) -> Dict:
         """
         Analiza el contexto general del mercado en timeframe diario
         """
         try:
-            # EMAs en diario para contexto macro
-            ema_11_daily = df_daily['close'].ewm(span=11).mean().iloc[-1]
-            ema_55_daily = df_daily['close'].ewm(span=55).mean().iloc[-1]
+            closes = df_daily['close'].to_numpy(dtype=np.float64)
+            
+            # EMAs en diario para contexto macro (solo el último valor, en una pasada)
+            ema_11_daily, ema_55_daily = ewma_last_pair(closes, 11, 55)
             
             # Determinar tendencia macro
             if ema_11_daily > ema_55_daily:
@@ -117,12 +497,12 @@ class EnhancedAnalysisService:
                 macro_trend = "SIDEWAYS"
             
             # Calcular volatilidad reciente
-            returns = df_daily['close'].pct_change().dropna()
-            volatility = returns.std() * 100
+            returns = np.diff(closes) / closes[:-1]
+            volatility = float(np.std(returns, ddof=1)) * 100
             
             # Niveles de soporte/resistencia diarios
-            high_20d = df_daily['high'].tail(20).max()
-            low_20d = df_daily['low'].tail(20).min()
+            high_20d = float(df_daily['high'].to_numpy()[-20:].max())
+            low_20d = float(df_daily['low'].to_numpy()[-20:].min())
             
             return {
                 'macro_trend': macro_trend,
@@ -142,41 +522,17 @@ class EnhancedAnalysisService:
     def _calculate_capital_allocation(self, signal: str, strength: int) -> Dict:
         """
         Calcula asignación de capital según filosofía 40-30-20-10 de Merino
-        """
-        base_allocation = {
-            'btc_long_term': 40,  # 40% Bitcoin largo plazo
-            'weekly_charts': 30,  # 30% gráficos semanales
-            'daily_trading': 20,  # 20% trading diario
-            'futures': 10         # 10% futuros
-        }
         
+        Las tablas son constantes de módulo; se devuelven copias (dict) para
+        que el resultado siga siendo serializable a JSON y modificable
+        """
         # Ajustar según fuerza de señal
-        if signal in ['LONG', 'SHORT'] and strength >= 70:
-            # Señal muy fuerte: aumentar asignación a trading diario
-            trading_allocation = {
-                'position_size': 3.0,  # 3% del capital total
-                'max_risk_per_trade': 1.0,  # 1% máximo riesgo
-                'recommended_timeframe': 'daily_trading'
-            }
-        elif signal in ['LONG', 'SHORT'] and strength >= 50:
-            # Señal moderada
-            trading_allocation = {
-                'position_size': 2.0,  # 2% del capital total
-                'max_risk_per_trade': 1.0,
-                'recommended_timeframe': 'daily_trading'
-            }
-        else:
-            # Sin señal clara: preservar capital
-            trading_allocation = {
-                'position_size': 0.0,
-                'max_risk_per_trade': 0.0,
-                'recommended_timeframe': 'wait'
-            }
+        tier = int(strength >= 50) + int(strength >= 70) if signal in DIRECTIONAL_SIGNALS else 0
         
         return {
-            'base_allocation': base_allocation,
-            'current_trade': trading_allocation,
-            'philosophy': '40-30-20-10 (BTC_LT-Weekly-Daily-Futures)'
+            'base_allocation': dict(MERINO_BASE_ALLOCATION),
+            'current_trade': dict(MERINO_TRADE_ALLOCATIONS[tier]),
+            'philosophy': MERINO_PHILOSOPHY
         }
     
     def _generate_merino_analysis_text(self, symbol: str, price: float, 
@@ -188,75 +544,56 @@ class EnhancedAnalysisService:
             timeframe_4h = signal['timeframe_4h']
             volume_data = signal['volume_profile']
             adx_data = timeframe_4h.get('adx', {})
+            strength = signal['signal_strength']
+            bias = signal['bias']
+            ema_11 = timeframe_4h.get('ema_11', 0)
+            ema_55 = timeframe_4h.get('ema_55', 0)
+            ema_11_ref = timeframe_4h.get('ema_11', price)
+            momentum = timeframe_4h.get('momentum', 0)
+            adx = adx_data.get('adx', 0)
+            trending = adx_data.get('trending', False)
+            volatility_pct = context.get('volatility_pct', 0)
             
-            analysis = f"""📊 ANÁLISIS TÉCNICO JAIME MERINO - {symbol}
-{'='*60}
-
-💰 PRECIO ACTUAL: ${price:,.4f}
-🎯 SEÑAL: {signal['signal']} | FUERZA: {signal['signal_strength']}/100
-📈 SESGO 4H: {signal['bias']} | CONFLUENCIAS: {signal['confluence_score']}/4
-
-🔍 ANÁLISIS MULTI-TEMPORAL:
-{'─'*40}
-📊 Contexto Diario:
-   • Tendencia Macro: {context['macro_trend']}
-   • EMA 11 Diario: ${context.get('ema_11_daily', 0):,.4f}
-   • EMA 55 Diario: ${context.get('ema_55_daily', 0):,.4f}
-   • Volatilidad: {context.get('volatility_pct', 0):.2f}%
-
-⏰ Timeframe 4H (Principal):
-   • EMA 11: ${timeframe_4h.get('ema_11', 0):,.4f}
-   • EMA 55: ${timeframe_4h.get('ema_55', 0):,.4f}
-   • Relación EMAs: {"ALCISTA" if timeframe_4h.get('ema_11', 0) > timeframe_4h.get('ema_55', 0) else "BAJISTA"}
-   • Precio vs EMA11: {((price - timeframe_4h.get('ema_11', price)) / timeframe_4h.get('ema_11', price)) * 100:+.2f}%
-
-📊 INDICADORES CLAVE:
-{'─'*40}
-🎯 ADX (Fuerza de Tendencia):
-   • Valor: {adx_data.get('adx', 0):.1f} | Modificado: {adx_data.get('adx_modified', -23):.1f}
-   • Clasificación: {adx_data.get('strength', 'DESCONOCIDA')}
-   • Pendiente: {"FORTALECIENDO" if adx_data.get('strengthening', False) else "DEBILITANDO"}
-   • Trending: {"SÍ" if adx_data.get('trending', False) else "NO"}
-
-⚡ Squeeze Momentum:
-   • Estado: {"SQUEEZE ON (Consolidación)" if timeframe_4h.get('squeeze', False) else "SQUEEZE OFF (Movimiento)"}
-   • Momentum: {timeframe_4h.get('momentum', 0):+.4f}
-   • Dirección: {"ALCISTA" if timeframe_4h.get('momentum', 0) > 0 else "BAJISTA" if timeframe_4h.get('momentum', 0) < 0 else "NEUTRAL"}
-
-📊 VOLUME PROFILE (VPVR):
-   • VPoC: ${volume_data.get('vpoc', 0):,.4f}
-   • Distancia del VPoC: {volume_data.get('vpoc_distance_pct', 0):+.2f}%
-   • Niveles de Alto Volumen: {len(volume_data.get('high_volume_levels', []))} identificados
-
-💡 METODOLOGÍA JAIME MERINO:
-{'─'*40}
-✅ Criterios Cumplidos:
-   • EMAs alineadas para sesgo: {"✓" if signal['bias'] != 'NEUTRAL' else "✗"}
-   • ADX confirma tendencia: {"✓" if adx_data.get('trending', False) else "✗"}
-   • Momentum direccional: {"✓" if abs(timeframe_4h.get('momentum', 0)) > 0.001 else "✗"}
-   • Sin squeeze (consolidación): {"✓" if not timeframe_4h.get('squeeze', True) else "✗"}
-
-🎯 FILOSOFÍA CONTRARIA:
-   • Operando contra el 90% que pierde
-   • Disciplina > Análisis técnico perfecto
-   • "Solo operamos con alta probabilidad"
-
-📈 NIVELES CRÍTICOS:
-{'─'*40}
-🛡️ Soporte 20D: ${context.get('support_20d', 0):,.4f} ({context.get('price_vs_support', 0):+.2f}%)
-🚫 Resistencia 20D: ${context.get('resistance_20d', 0):,.4f} ({context.get('price_vs_resistance', 0):+.2f}%)
-📊 VPoC: ${volume_data.get('vpoc', 0):,.4f} (Nivel de mayor volumen)
-
-⚠️ EVALUACIÓN DE RIESGO:
-{'─'*40}
-🎲 Riesgo General: {self._assess_risk_level(signal['signal_strength'], adx_data.get('adx', 0))}
-📊 Volatilidad: {context.get('volatility_pct', 0):.2f}% ({"ALTA" if context.get('volatility_pct', 0) > 4 else "MODERADA" if context.get('volatility_pct', 0) > 2 else "BAJA"})
-🔍 Manipulación: {"POSIBLE" if signal['signal_strength'] < 40 else "BAJA"}
-
-⏰ Análisis generado: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
-📚 Metodología: Jaime Merino - Trading Latino Avanzado"""
-
-            return analysis
+            ctx = {
+                'symbol': symbol,
+                'price': price,
+                'signal_type': signal['signal'],
+                'signal_strength': strength,
+                'bias': bias,
+                'confluence_score': signal['confluence_score'],
+                'macro_trend': context['macro_trend'],
+                'ema_11_daily': context.get('ema_11_daily', 0),
+                'ema_55_daily': context.get('ema_55_daily', 0),
+                'volatility_pct': volatility_pct,
+                'ema_11': ema_11,
+                'ema_55': ema_55,
+                'ema_relation': "ALCISTA" if ema_11 > ema_55 else "BAJISTA",
+                'price_vs_ema11': ((price - ema_11_ref) / ema_11_ref) * 100,
+                'adx': adx,
+                'adx_modified': adx_data.get('adx_modified', -23),
+                'adx_strength': adx_data.get('strength', 'DESCONOCIDA'),
+                'adx_slope': "FORTALECIENDO" if adx_data.get('strengthening', False) else "DEBILITANDO",
+                'trending': "SÍ" if trending else "NO",
+                'squeeze_state': "SQUEEZE ON (Consolidación)" if timeframe_4h.get('squeeze', False) else "SQUEEZE OFF (Movimiento)",
+                'momentum': momentum,
+                'momentum_direction': "ALCISTA" if momentum > 0 else "BAJISTA" if momentum < 0 else "NEUTRAL",
+                'vpoc': volume_data.get('vpoc', 0),
+                'vpoc_distance_pct': volume_data.get('vpoc_distance_pct', 0),
+                'high_volume_levels': len(volume_data.get('high_volume_levels', [])),
+                'check_bias': "✓" if bias != 'NEUTRAL' else "✗",
+                'check_adx': "✓" if trending else "✗",
+                'check_momentum': "✓" if abs(momentum) > 0.001 else "✗",
+                'check_squeeze': "✓" if not timeframe_4h.get('squeeze', True) else "✗",
+                'support_20d': context.get('support_20d', 0),
+                'price_vs_support': context.get('price_vs_support', 0),
+                'resistance_20d': context.get('resistance_20d', 0),
+                'price_vs_resistance': context.get('price_vs_resistance', 0),
+                'risk_level': self._assess_risk_level(strength, adx),
+                'volatility_label': "ALTA" if volatility_pct > 4 else "MODERADA" if volatility_pct > 2 else "BAJA",
+                'manipulation': "POSIBLE" if strength < 40 else "BAJA",
+                'generated_at': datetime.now().strftime('%d/%m/%Y %H:%M:%S'),
+            }
+            return MERINO_ANALYSIS_TEMPLATE.format_map(ctx)
             
         except Exception as e:
             logger.error(f"❌ Error generando análisis textual: {e}")
@@ -272,132 +609,42 @@ class EnhancedAnalysisService:
             strength = signal['signal_strength']
             levels = signal['trading_levels']
             
-            if signal_type == 'LONG' and strength >= 50:
-                recommendation = f"""🟢 RECOMENDACIÓN JAIME MERINO: POSICIÓN LARGA
-{'='*55}
-
-✅ SETUP ALCISTA CONFIRMADO:
-   • Sesgo 4H: {signal['bias']}
-   • Confluencias técnicas: {signal['confluence_score']}/4
-   • Fuerza de señal: {strength}% ({"EXCELENTE" if strength > 70 else "BUENA"})
-
-💰 GESTIÓN DE CAPITAL (Filosofía 40-30-20-10):
-   • Asignación recomendada: {capital['current_trade']['position_size']:.1f}% del capital total
-   • Riesgo máximo: {capital['current_trade']['max_risk_per_trade']:.1f}% por operación
-   • Timeframe: Trading diario (20% de la cartera)
-
-🎯 PLAN DE TRADING:
-   • Entrada: ${levels.get('entry', price):,.4f}
-   • Target 1: ${levels.get('targets', [price*1.02])[0]:,.4f} (+2%) - CERRAR 50%
-   • Target 2: ${levels.get('targets', [price*1.02, price*1.05])[1] if len(levels.get('targets', [])) > 1 else price*1.05:,.4f} (+5%) - CERRAR RESTO
-   • Stop Loss: ${levels.get('stop_loss', price*0.98):,.4f} (-2%)
-
-🛡️ REGLAS DE MERINO:
-   • Sin apalancamiento > 1:3
-   • Stop si cierra bajo EMA 11
-   • Máximo 6% pérdida diaria
-   • Máximo 8% pérdida semanal
-
-⚡ EJECUCIÓN:
-   1. Verificar volumen en breakout
-   2. Entrada gradual en 2-3 tramos
-   3. Mover stop a breakeven en +1%
-   4. Seguir plan sin emociones
-
-💡 METODOLOGÍA: "Tomar dinero de otros legalmente"
-⚠️ INVALIDACIÓN: Cierre bajo EMA 11 en 4H"""
-
-            elif signal_type == 'SHORT' and strength >= 50:
-                recommendation = f"""🔴 RECOMENDACIÓN JAIME MERINO: POSICIÓN CORTA
-{'='*55}
-
-✅ SETUP BAJISTA CONFIRMADO:
-   • Sesgo 4H: {signal['bias']}
-   • Confluencias técnicas: {signal['confluence_score']}/4
-   • Fuerza de señal: {strength}% ({"EXCELENTE" if strength > 70 else "BUENA"})
-
-💰 GESTIÓN DE CAPITAL (Filosofía 40-30-20-10):
-   • Asignación recomendada: {capital['current_trade']['position_size']:.1f}% del capital total
-   • Riesgo máximo: {capital['current_trade']['max_risk_per_trade']:.1f}% por operación
-   • Timeframe: Trading diario (20% de la cartera)
-
-🎯 PLAN DE TRADING:
-   • Entrada: ${levels.get('entry', price):,.4f}
-   • Target 1: ${levels.get('targets', [price*0.98])[0]:,.4f} (-2%) - CERRAR 50%
-   • Target 2: ${levels.get('targets', [price*0.98, price*0.95])[1] if len(levels.get('targets', [])) > 1 else price*0.95:,.4f} (-5%) - CERRAR RESTO
-   • Stop Loss: ${levels.get('stop_loss', price*1.02):,.4f} (+2%)
-
-🛡️ REGLAS DE MERINO:
-   • Sin apalancamiento > 1:3
-   • Stop si cierra sobre EMA 11
-   • Máximo 6% pérdida diaria
-   • Máximo 8% pérdida semanal
-
-⚡ EJECUCIÓN:
-   1. Confirmar presión vendedora
-   2. Entrada gradual en 2-3 tramos
-   3. Mover stop a breakeven en +1%
-   4. Mantener disciplina total
-
-💡 METODOLOGÍA: "Operar contra el 90% que pierde"
-⚠️ INVALIDACIÓN: Cierre sobre EMA 11 en 4H"""
-
-            elif signal_type == 'WAIT_SQUEEZE':
-                recommendation = f"""🟡 RECOMENDACIÓN JAIME MERINO: ESPERAR - SQUEEZE DETECTADO
-{'='*60}
-
-⏳ SITUACIÓN: CONSOLIDACIÓN (SQUEEZE ON)
-   • El mercado está en compresión
-   • Esperando expansión de volatilidad
-   • Bollinger Bands dentro de Keltner Channels
-
-📊 ESTADO ACTUAL:
-   • Precio: ${price:,.4f}
-   • Momentum actual: {signal['timeframe_4h'].get('momentum', 0):+.4f}
-   • ADX: {signal['timeframe_4h'].get('adx', {}).get('adx', 0):.1f}
-
-🎯 PLAN DE ACCIÓN:
-   • ESPERAR ruptura del squeeze
-   • Preparar alertas en niveles clave
-   • NO forzar operaciones
-   • Preservar capital es prioridad
-
-🔔 ALERTAS SUGERIDAS:
-   • Ruptura alcista: > ${price * 1.015:,.4f}
-   • Ruptura bajista: < ${price * 0.985:,.4f}
-   • Activación ADX: > 25
-
-💡 FILOSOFÍA MERINO:
-   "Es mejor perder una oportunidad que perder dinero"
-   
-⏰ REVISIÓN: Cada 2-4 horas hasta expansión"""
-
-            else:
-                recommendation = f"""⚪ RECOMENDACIÓN JAIME MERINO: SIN OPERACIÓN
-{'='*50}
-
-🚫 RAZÓN: Condiciones técnicas insuficientes
-   • Fuerza de señal: {strength}% (Mínimo: 50%)
-   • Confluencias: {signal['confluence_score']}/4 (Mínimo: 3/4)
-
-📊 ESTADO ACTUAL:
-   • Señal: {signal_type}
-   • Sesgo: {signal['bias']}
-   • ADX: {signal['timeframe_4h'].get('adx', {}).get('adx', 0):.1f}
-
-💰 ACCIÓN RECOMENDADA:
-   • PRESERVAR CAPITAL (40% en BTC largo plazo)
-   • ESPERAR mejor configuración
-   • MANTENER disciplina
-
-📚 RECORDATORIO MERINO:
-   "Solo operamos con alta probabilidad de éxito"
-   "El dinero no se hace forzando operaciones"
-
-🔍 PRÓXIMA REVISIÓN: 4 horas
-⚠️ NO OPERAR hasta confluencia ≥ 3/4"""
-
-            return recommendation
+            if signal_type in ('LONG', 'SHORT') and strength >= 50:
+                # direction: +1 LONG, -1 SHORT (objetivos ±2%/±5%, stop ∓2%)
+                direction = 1 if signal_type == 'LONG' else -1
+                targets = levels.get('targets', [])
+                current_trade = capital['current_trade']
+                template = MERINO_LONG_TEMPLATE if direction > 0 else MERINO_SHORT_TEMPLATE
+                return template.format_map({
+                    'bias': signal['bias'],
+                    'confluence_score': signal['confluence_score'],
+                    'strength': strength,
+                    'strength_label': "EXCELENTE" if strength > 70 else "BUENA",
+                    'position_size': current_trade['position_size'],
+                    'max_risk_per_trade': current_trade['max_risk_per_trade'],
+                    'entry': levels.get('entry', price),
+                    'target_1': levels.get('targets', [price * (1 + 0.02 * direction)])[0],
+                    'target_2': targets[1] if len(targets) > 1 else price * (1 + 0.05 * direction),
+                    'stop_loss': levels.get('stop_loss', price * (1 - 0.02 * direction)),
+                })
+            
+            adx = signal['timeframe_4h'].get('adx', {}).get('adx', 0)
+            if signal_type == 'WAIT_SQUEEZE':
+                return MERINO_SQUEEZE_TEMPLATE.format_map({
+                    'price': price,
+                    'momentum': signal['timeframe_4h'].get('momentum', 0),
+                    'adx': adx,
+                    'breakout_up': price * 1.015,
+                    'breakout_down': price * 0.985,
+                })
+            
+            return MERINO_NONE_TEMPLATE.format_map({
+                'strength': strength,
+                'confluence_score': signal['confluence_score'],
+                'signal_type': signal_type,
+                'bias': signal['bias'],
+                'adx': adx,
+            })
             
         except Exception as e:
             logger.error(f"❌ Error generando recomendación: {e}")
@@ -412,62 +659,19 @@ class EnhancedAnalysisService:
         else:
             return "ALTO (No recomendado)"
     
-    def _get_risk_management_rules(self) -> Dict:
-        """Retorna las reglas de gestión de riesgo de Merino"""
-        return {
-            'max_risk_per_trade': 1.0,  # 1% máximo por operación
-            'max_daily_loss': 6.0,      # 6% máximo diario
-            'max_weekly_loss': 8.0,     # 8% máximo semanal  
-            'max_monthly_loss': 10.0,   # 10% máximo mensual
-            'leverage_limit': 3.0,      # Máximo 1:3
-            'capital_allocation': '40-30-20-10',
-            'position_sizing': 'Division en 20 partes iguales',
-            'stop_strategy': 'Donde retail NO pone stops'
-        }
-    
     def _analyze_confluence(self, signal: Dict) -> Dict:
         """Analiza la confluencia técnica detallada"""
-        confluences = []
-        
-        # EMAs
-        if signal['bias'] != 'NEUTRAL':
-            confluences.append({
-                'factor': 'EMAs alineadas',
-                'status': True,
-                'description': f"EMA 11 {'>' if signal['bias'] == 'BULLISH' else '<'} EMA 55"
-            })
-        
-        # ADX
-        adx_data = signal['timeframe_4h'].get('adx', {})
-        if adx_data.get('trending', False):
-            confluences.append({
-                'factor': 'ADX trending',
-                'status': True,
-                'description': f"ADX {adx_data.get('adx', 0):.1f} > 25"
-            })
-        
-        # Momentum
-        momentum = signal['timeframe_4h'].get('momentum', 0)
-        if abs(momentum) > 0.001:
-            confluences.append({
-                'factor': 'Momentum direccional', 
-                'status': True,
-                'description': f"Momentum {momentum:+.4f}"
-            })
-        
-        # Volume Profile
-        vpoc_distance = signal['volume_profile'].get('vpoc_distance_pct', 100)
-        if abs(vpoc_distance) < 3:
-            confluences.append({
-                'factor': 'Cerca del VPoC',
-                'status': True, 
-                'description': f"Distancia VPoC: {vpoc_distance:+.2f}%"
-            })
+        confluences = [
+            {'factor': factor, 'status': True, 'description': describe(signal)}
+            for factor, applies, describe in MERINO_CONFLUENCE_RULES
+            if applies(signal)
+        ]
+        total = len(confluences)
         
         return {
-            'total_confluences': len(confluences),
+            'total_confluences': total,
             'details': confluences,
-            'strength': 'ALTA' if len(confluences) >= 3 else 'MEDIA' if len(confluences) >= 2 else 'BAJA'
+            'strength': MERINO_CONFLUENCE_LEVELS[total]
         }
 
 # Instancia global del servicio mejorado
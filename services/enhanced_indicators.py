@@ -18,9 +18,65 @@ class JaimeMerinoSignalGenerator:
     def __init__(self):
         logger.info("🎯 Generador de señales Jaime Merino inicializado")
         self._last_signal_strength = 50
+        # Estado EMA por (symbol, periodo de vela, span): (open time de la última
+        # vela cerrada, su cierre, cierre de la primera vela, nº de velas cerradas, num, den)
+        self._ema_state: Dict[tuple, Tuple[int, float, float, int, float, float]] = {}
+    
+    def _last_ema(self, close: pd.Series, span: int, symbol: Optional[str] = None) -> float:
+        """
+        Último valor de Series.ewm(span=span).mean() actualizado de forma incremental
+        
+        Guarda numerador/denominador de la EMA (adjust=True) sobre las velas
+        cerradas de la ventana. get_klines devuelve siempre las últimas `limit`
+        velas, así que al cerrarse una vela nueva entra su cierre y sale el de la
+        más antigua: basta una multiplicación-suma y una resta, y el resultado
+        sigue siendo el de ewm sobre la misma ventana.
+        Sin símbolo, con saltos de más de una vela, otro tamaño de ventana o
+        cierres que no coinciden con el estado se recalcula completa.
+        
+        Args:
+            close: Serie de cierres indexada por open time en ms (int64, como
+                devuelve get_klines); la última vela sigue abierta
+            span: Período de la EMA
+            symbol: Símbolo para indexar el estado
+            
+        Returns:
+            Valor final de la EMA
+        """
+        index = close.index
+        if symbol is None or len(close) < 3 or not pd.api.types.is_integer_dtype(index):
+            return close.ewm(span=span).mean().iloc[-1]
+        
+        values = close.to_numpy(dtype=np.float64)
+        decay = 1.0 - 2.0 / (span + 1.0)
+        # Duración de la vela en ms (14_400_000 en 4h)
+        period = int(index[-1] - index[-2])
+        closed_ts = int(index[-2])
+        n_closed = len(values) - 1
+        key = (symbol, period, span)
+        state = self._ema_state.get(key)
+        
+        if (state is not None and state[3] == n_closed
+                and state[0] == closed_ts and state[1] == values[-2]):
+            # Misma vela cerrada: solo cambia la vela abierta
+            num, den = state[4], state[5]
+        elif (state is not None and state[3] == n_closed
+                and closed_ts - state[0] == period and state[1] == values[-3]):
+            # Una vela nueva: entra values[-2] y sale la primera de la ventana anterior
+            num = values[-2] + decay * state[4] - decay ** n_closed * state[2]
+            den = state[5]
+        else:
+            # Semilla: pasada completa sobre las velas cerradas
+            closed = values[:-1]
+            weights = decay ** np.arange(n_closed - 1, -1, -1, dtype=np.float64)
+            num = float(weights @ closed)
+            den = float(weights.sum())
+        
+        self._ema_state[key] = (closed_ts, float(values[-2]), float(values[0]), n_closed, num, den)
+        return (values[-1] + decay * num) / (1.0 + decay * den)
     
     def generate_merino_signal(self, df_4h: pd.DataFrame, df_1h: pd.DataFrame, 
-                             current_price: float) -> Dict:
+                             current_price: float, symbol: Optional[str] = None) -> Dict:
         """
         Genera señal básica siguiendo la metodología de Jaime Merino
         
@@ -28,20 +84,35 @@ class JaimeMerinoSignalGenerator:
             df_4h: DataFrame de 4 horas
             df_1h: DataFrame de 1 hora
             current_price: Precio actual
+            symbol: Símbolo analizado (habilita las EMAs incrementales)
             
         Returns:
             Diccionario con señal completa
         """
-        try:
-            logger.debug(f"🔍 Generando señal Merino para precio: ${current_price:,.4f}")
+        features = self.calculate_merino_features(df_4h, df_1h, symbol)
+        return self.signal_from_features(features, current_price)
+    
+    def calculate_merino_features(self, df_4h: pd.DataFrame, df_1h: pd.DataFrame,
+                                  symbol: Optional[str] = None) -> Optional[Dict]:
+        """
+        Parte de la señal que no depende del precio actual: EMAs, sesgo, RSI y volumen
+        
+        Args:
+            df_4h: DataFrame de 4 horas
+            df_1h: DataFrame de 1 hora
+            symbol: Símbolo analizado (habilita las EMAs incrementales)
             
+        Returns:
+            Diccionario de indicadores para signal_from_features o None si hay error
+        """
+        try:
             # 1. Calcular EMAs en 4H
-            ema_11_4h = df_4h['close'].ewm(span=11).mean().iloc[-1]
-            ema_55_4h = df_4h['close'].ewm(span=55).mean().iloc[-1]
+            ema_11_4h = self._last_ema(df_4h['close'], 11, symbol)
+            ema_55_4h = self._last_ema(df_4h['close'], 55, symbol)
             
             # 2. Calcular EMAs en 1H para timing
-            ema_11_1h = df_1h['close'].ewm(span=11).mean().iloc[-1]
-            ema_55_1h = df_1h['close'].ewm(span=55).mean().iloc[-1]
+            ema_11_1h = self._last_ema(df_1h['close'], 11, symbol)
+            ema_55_1h = self._last_ema(df_1h['close'], 55, symbol)
             
             # 3. Determinar sesgo principal (4H)
             if ema_11_4h > ema_55_4h * 1.001:  # 0.1% de separación mínima
@@ -60,12 +131,51 @@ class JaimeMerinoSignalGenerator:
             current_volume = df_4h['volume'].iloc[-1]
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
             
+            return {
+                'ema_11_4h': ema_11_4h,
+                'ema_55_4h': ema_55_4h,
+                'ema_11_1h': ema_11_1h,
+                'ema_55_1h': ema_55_1h,
+                'bias': bias,
+                'rsi': current_rsi,
+                'avg_volume': avg_volume,
+                'current_volume': current_volume,
+                'volume_ratio': volume_ratio
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Error generando señal Merino: {e}")
+            return None
+    
+    def signal_from_features(self, features: Optional[Dict], current_price: float) -> Dict:
+        """
+        Completa la señal con el precio actual: señal, fuerza, niveles y confluencias
+        
+        Args:
+            features: Resultado de calculate_merino_features (no se modifica)
+            current_price: Precio actual
+            
+        Returns:
+            Diccionario con señal completa (vacía si no hay features)
+        """
+        if features is None:
+            return self._get_empty_signal()
+        
+        try:
+            logger.debug(f"🔍 Generando señal Merino para precio: ${current_price:,.4f}")
+            
+            ema_11_4h, ema_55_4h = features['ema_11_4h'], features['ema_55_4h']
+            ema_11_1h, ema_55_1h = features['ema_11_1h'], features['ema_55_1h']
+            bias = features['bias']
+            current_rsi = features['rsi']
+            volume_ratio = features['volume_ratio']
+            
             # ✅ CREAR VOLUME_DATA AQUÍ
             volume_data = {
                 'vpoc_distance_pct': float((current_price - ema_11_4h) / ema_11_4h * 100),
                 'volume_ratio': float(volume_ratio),
-                'avg_volume': float(avg_volume),
-                'current_volume': float(current_volume)
+                'avg_volume': float(features['avg_volume']),
+                'current_volume': float(features['current_volume'])
             }
             # 6. Generar señal principal
             signal = self._determine_basic_signal(
@@ -3,9 +3,13 @@ Indicadores técnicos para análisis de trading
 """
 import pandas as pd
 import numpy as np
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 import ta
-from models.trading_analysis import TechnicalIndicators
+from models.trading_analysis import Klines, TechnicalIndicators
+from services.kernels import (
+    COMPILED_KERNELS, adx_kernel, bollinger_last, ema_last_recursive, macd_last,
+    rsi_last, sma_last
+)
 from utils.logger import analysis_logger
 
 logger = analysis_logger
@@ -182,39 +186,67 @@ class TechnicalIndicatorsCalculator:
             return empty_series, empty_series
     
     @classmethod
-    def calculate_all_indicators(cls, df: pd.DataFrame) -> TechnicalIndicators:
+    def calculate_all_indicators(cls, df: Union[pd.DataFrame, Klines]) -> TechnicalIndicators:
         """
-        Calcula todos los indicadores técnicos para un DataFrame
+        Calcula todos los indicadores técnicos para un DataFrame o Klines
         
         Args:
-            df: DataFrame con columnas OHLCV
+            df: DataFrame con columnas OHLCV o Klines (columnas NumPy)
             
         Returns:
             TechnicalIndicators con todos los valores calculados
         """
         try:
-            if len(df) < 55:  # Necesitamos suficientes datos
-                logger.warning(f"⚠️ Insuficientes datos para indicadores: {len(df)} velas")
+            is_klines = isinstance(df, Klines)
+            n_bars = len(df.close) if is_klines else len(df)
+            if n_bars < 55:  # Necesitamos suficientes datos
+                logger.warning(f"⚠️ Insuficientes datos para indicadores: {n_bars} velas")
                 return cls._get_empty_indicators()
             
-            # Calcular EMAs
-            ema_11 = cls.calculate_ema(df['close'], 11).iloc[-1]
-            ema_55 = cls.calculate_ema(df['close'], 55).iloc[-1]
-            
-            # Calcular ADX
-            adx = cls.calculate_adx(df['high'], df['low'], df['close'], 14).iloc[-1]
-            
-            # Calcular RSI
-            rsi = cls.calculate_rsi(df['close'], 14).iloc[-1]
-            
-            # Calcular SMA 20
-            sma_20 = cls.calculate_sma(df['close'], 20).iloc[-1]
-            
-            # Calcular Bandas de Bollinger
-            bb_upper, bb_middle, bb_lower = cls.calculate_bollinger_bands(df['close'], 20, 2)
-            
-            # Calcular MACD
-            macd_line, macd_signal, macd_hist = cls.calculate_macd(df['close'])
+            if COMPILED_KERNELS:
+                # Kernels compilados: solo el último valor, sin Series intermedias
+                if is_klines:
+                    close, high, low = df.close, df.high, df.low
+                else:
+                    close = df['close'].to_numpy(dtype=np.float64)
+                    high = df['high'].to_numpy(dtype=np.float64)
+                    low = df['low'].to_numpy(dtype=np.float64)
+                
+                ema_11 = ema_last_recursive(close, 11)
+                ema_55 = ema_last_recursive(close, 55)
+                adx = adx_kernel(high, low, close, 14)[0][-1]
+                rsi = rsi_last(close, 14)
+                sma_20 = sma_last(close, 20)
+                bb_upper_last, bb_middle_last, bb_lower_last = bollinger_last(close, 20, 2.0)
+                macd_last_value, macd_signal_last = macd_last(close, 12, 26, 9)
+            else:
+                if is_klines:
+                    df = pd.DataFrame({'high': df.high, 'low': df.low, 'close': df.close})
+                
+                # Calcular EMAs
+                ema_11 = cls.calculate_ema(df['close'], 11).iloc[-1]
+                ema_55 = cls.calculate_ema(df['close'], 55).iloc[-1]
+                
+                # Calcular ADX
+                adx = cls.calculate_adx(df['high'], df['low'], df['close'], 14).iloc[-1]
+                
+                # Calcular RSI
+                rsi = cls.calculate_rsi(df['close'], 14).iloc[-1]
+                
+                # Calcular SMA 20
+                sma_20 = cls.calculate_sma(df['close'], 20).iloc[-1]
+                
+                # Calcular Bandas de Bollinger
+                bb_upper, bb_middle, bb_lower = cls.calculate_bollinger_bands(df['close'], 20, 2)
+                
+                # Calcular MACD
+                macd_line, macd_signal, macd_hist = cls.calculate_macd(df['close'])
+                
+                bb_upper_last = bb_upper.iloc[-1] if not bb_upper.empty else None
+                bb_middle_last = bb_middle.iloc[-1] if not bb_middle.empty else None
+                bb_lower_last = bb_lower.iloc[-1] if not bb_lower.empty else None
+                macd_last_value = macd_line.iloc[-1] if not macd_line.empty else None
+                macd_signal_last = macd_signal.iloc[-1] if not macd_signal.empty else None
             
             indicators = TechnicalIndicators(
                 ema_11=ema_11,
@@ -222,10 +254,11 @@ class TechnicalIndicatorsCalculator:
                 adx=adx,
                 rsi=rsi,
                 sma_20=sma_20,
-                bollinger_upper=bb_upper.iloc[-1] if not bb_upper.empty else None,
-                bollinger_lower=bb_lower.iloc[-1] if not bb_lower.empty else None,
-                macd=macd_line.iloc[-1] if not macd_line.empty else None,
-                macd_signal=macd_signal.iloc[-1] if not macd_signal.empty else None
+                bb_upper=bb_upper_last,
+                bb_middle=bb_middle_last,
+                bb_lower=bb_lower_last,
+                macd=macd_last_value,
+                macd_signal=macd_signal_last
             )
             
             logger.debug("✅ Todos los indicadores calculados exitosamente")
@@ -244,10 +277,9 @@ class TechnicalIndicatorsCalculator:
             adx=0.0,
             rsi=50.0,  # RSI neutral
             sma_20=0.0,
-            bollinger_upper=None,
-            bollinger_lower=None,
-            macd=None,
-            macd_signal=None
+            bb_upper=0.0,
+            bb_middle=0.0,
+            bb_lower=0.0
         )
 
 class SignalGenerator:
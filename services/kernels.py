@@ -0,0 +1,411 @@
+"""
+Kernels numéricos para los indicadores de la metodología Jaime Merino
+Usa Numba / Bottleneck si están instalados; si no, funciona con NumPy/pandas
+"""
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    bn = None
+    BOTTLENECK_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Decorador no-op cuando Numba no está disponible"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Ventanas móviles sobre ndarrays (equivalentes a Series.rolling(window).<op>())
+# bottleneck rechaza ventanas más largas que el array; pandas devuelve todo NaN
+
+def move_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Media móvil; NaN hasta completar la ventana"""
+    if bn is not None and window <= x.shape[0]:
+        return bn.move_mean(x, window, min_count=window)
+    return pd.Series(x).rolling(window=window).mean().to_numpy()
+
+def move_std(x: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Desviación estándar móvil (ddof=1 como pandas)"""
+    if bn is not None and window <= x.shape[0]:
+        return bn.move_std(x, window, min_count=window, ddof=ddof)
+    return pd.Series(x).rolling(window=window).std(ddof=ddof).to_numpy()
+
+def move_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Máximo móvil"""
+    if bn is not None and window <= x.shape[0]:
+        return bn.move_max(x, window, min_count=window)
+    return pd.Series(x).rolling(window=window).max().to_numpy()
+
+def move_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Mínimo móvil"""
+    if bn is not None and window <= x.shape[0]:
+        return bn.move_min(x, window, min_count=window)
+    return pd.Series(x).rolling(window=window).min().to_numpy()
+
+# Versión AOT de los kernels (python -m services.build_kernels_aot). Se importa
+# antes de definirlos: si el .so existe se usa siempre, no hay JIT en frío y no
+# requiere Numba.
+try:
+    from services import _kernels_aot as _aot
+    AOT_AVAILABLE = True
+except ImportError:
+    _aot = None
+    AOT_AVAILABLE = False
+
+def _kernel(signature: str):
+    """
+    Decorador de los kernels compilados
+
+    Sin AOT, la firma explícita hace que Numba compile al importar el módulo
+    (y cache=True reutiliza el binario entre procesos), así la primera
+    petición en producción no paga el coste del JIT. Con AOT el dispatcher
+    queda perezoso: solo lo usa build_kernels_aot vía py_func.
+
+    Args:
+        signature: Firma Numba del kernel
+    """
+    if AOT_AVAILABLE:
+        return njit(cache=True)
+    return njit(signature, cache=True)
+
+# Los arrays se declaran readonly/layout 'A' porque Series.to_numpy() devuelve
+# vistas de solo lectura con copy-on-write (pandas >= 3).
+_F8_1D = 'Array(float64, 1, "A", readonly=True)'
+
+@_kernel(f'float64({_F8_1D}, int64)')
+def ewma_last(x: np.ndarray, span: int) -> float:
+    """
+    Último valor de la EMA equivalente a Series.ewm(span=span).mean().iloc[-1]
+
+    Args:
+        x: Array de precios (float64, sin NaN)
+        span: Período de la EMA
+
+    Returns:
+        Valor final de la EMA
+    """
+    if x.shape[0] == 0:
+        return np.nan
+    decay = 1.0 - 2.0 / (span + 1.0)
+    num = 0.0
+    den = 0.0
+    for i in range(x.shape[0]):
+        num = x[i] + decay * num
+        den = 1.0 + decay * den
+    return num / den
+
+@_kernel(f'UniTuple(float64, 2)({_F8_1D}, int64, int64)')
+def ewma_last_pair(x: np.ndarray, span_fast: int, span_slow: int) -> Tuple[float, float]:
+    """
+    Últimos valores de dos EMAs (rápida y lenta) en una sola pasada
+
+    Args:
+        x: Array de precios (float64, sin NaN)
+        span_fast: Período de la EMA rápida (ej: 11)
+        span_slow: Período de la EMA lenta (ej: 55)
+
+    Returns:
+        Tupla (ema_rapida, ema_lenta)
+    """
+    if x.shape[0] == 0:
+        return np.nan, np.nan
+    decay_fast = 1.0 - 2.0 / (span_fast + 1.0)
+    decay_slow = 1.0 - 2.0 / (span_slow + 1.0)
+    num_fast = 0.0
+    den_fast = 0.0
+    num_slow = 0.0
+    den_slow = 0.0
+    for i in range(x.shape[0]):
+        num_fast = x[i] + decay_fast * num_fast
+        den_fast = 1.0 + decay_fast * den_fast
+        num_slow = x[i] + decay_slow * num_slow
+        den_slow = 1.0 + decay_slow * den_slow
+    return num_fast / den_fast, num_slow / den_slow
+
+@_kernel(f'Tuple((float64[:], boolean[:], boolean[:]))'
+         f'({_F8_1D}, {_F8_1D}, {_F8_1D}, int64, int64, float64)')
+def squeeze_kernel(h: np.ndarray, l: np.ndarray, c: np.ndarray, bb_length: int,
+                   kc_length: int, mult: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Squeeze Momentum (LazyBear) en una sola pasada: BB, KC, momentum y flags
+
+    Equivale a la versión NumPy de calculate_squeeze_momentum (std con ddof=1,
+    True Range de la primera vela = high - low). Las ventanas son cortas (~20),
+    así que cada una se recorre directamente sin arrays intermedios.
+
+    Args:
+        h, l, c: Arrays high/low/close (float64, sin NaN)
+        bb_length: Período para Bollinger Bands
+        kc_length: Período para Keltner Channels
+        mult: Multiplicador de BB y KC
+
+    Returns:
+        Tupla (momentum, squeeze_on, squeeze_off)
+    """
+    n = c.shape[0]
+    momentum = np.full(n, np.nan)
+    squeeze_on = np.zeros(n, dtype=np.bool_)
+    squeeze_off = np.zeros(n, dtype=np.bool_)
+
+    tr = np.empty(n)
+    for i in range(n):
+        if i == 0:
+            tr[i] = h[i] - l[i]
+        else:
+            tr[i] = max(h[i] - l[i], abs(h[i] - c[i - 1]), abs(l[i] - c[i - 1]))
+
+    start = max(bb_length, kc_length) - 1
+    for i in range(n):
+        # Keltner Channels + momentum (ventana kc_length)
+        if i >= kc_length - 1:
+            s = 0.0
+            tr_sum = 0.0
+            highest = h[i]
+            lowest = l[i]
+            for j in range(i - kc_length + 1, i + 1):
+                s += c[j]
+                tr_sum += tr[j]
+                if h[j] > highest:
+                    highest = h[j]
+                if l[j] < lowest:
+                    lowest = l[j]
+            kc_basis = s / kc_length
+            kc_range = tr_sum / kc_length * mult
+            momentum[i] = c[i] - ((highest + lowest) / 2.0 + kc_basis) / 2.0
+
+            # Bollinger Bands (ventana bb_length) y detección del squeeze
+            if i >= start:
+                s = 0.0
+                for j in range(i - bb_length + 1, i + 1):
+                    s += c[j]
+                bb_basis = s / bb_length
+                ss = 0.0
+                for j in range(i - bb_length + 1, i + 1):
+                    d = c[j] - bb_basis
+                    ss += d * d
+                bb_dev = mult * np.sqrt(ss / (bb_length - 1))
+                bb_upper = bb_basis + bb_dev
+                bb_lower = bb_basis - bb_dev
+                kc_upper = kc_basis + kc_range
+                kc_lower = kc_basis - kc_range
+                squeeze_on[i] = (bb_lower > kc_lower) and (bb_upper < kc_upper)
+                squeeze_off[i] = (bb_lower < kc_lower) or (bb_upper > kc_upper)
+
+    return momentum, squeeze_on, squeeze_off
+
+@_kernel(f'UniTuple(float64[:], 3)({_F8_1D}, {_F8_1D}, {_F8_1D}, int64)')
+def adx_kernel(h: np.ndarray, l: np.ndarray, c: np.ndarray,
+               window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ADX, +DI y -DI con suavizado de Wilder en una sola llamada
+
+    Reproduce ta.trend.ADXIndicator(...).adx()/.adx_pos()/.adx_neg() (mismas
+    posiciones en cero al inicio) sin recalcular el suavizado por cada accesor.
+
+    Args:
+        h, l, c: Arrays high/low/close (float64, sin NaN)
+        window: Período del ADX
+
+    Returns:
+        Tupla (adx, adx_pos, adx_neg) con la longitud de la entrada
+    """
+    n = c.shape[0]
+    m = n - window + 1
+    if window <= 0 or m <= window:
+        raise ValueError("ADX necesita al menos 2 * window velas")
+
+    # Sumas iniciales (velas 1..window) y suavizado de Wilder de TR, +DM, -DM
+    trs = np.zeros(m)
+    dip = np.zeros(m)
+    din = np.zeros(m)
+    for i in range(1, n):
+        tr = max(h[i], c[i - 1]) - min(l[i], c[i - 1])
+        up = h[i] - h[i - 1]
+        down = l[i - 1] - l[i]
+        pos = up if (up > down and up > 0) else 0.0
+        neg = down if (down > up and down > 0) else 0.0
+        if i <= window:
+            trs[0] += tr
+            dip[0] += pos
+            din[0] += neg
+        else:
+            k = i - window
+            if k < m - 1:
+                trs[k] = trs[k - 1] - trs[k - 1] / window + tr
+                dip[k] = dip[k - 1] - dip[k - 1] / window + pos
+                din[k] = din[k - 1] - din[k - 1] / window + neg
+
+    adx = np.zeros(n)
+    adx_pos = np.zeros(n)
+    adx_neg = np.zeros(n)
+    dx = np.zeros(m)
+    for k in range(m):
+        di_pos = 100.0 * dip[k] / trs[k] if trs[k] != 0 else 0.0
+        di_neg = 100.0 * din[k] / trs[k] if trs[k] != 0 else 0.0
+        if di_pos + di_neg != 0:
+            dx[k] = 100.0 * abs((di_pos - di_neg) / (di_pos + di_neg))
+        if 1 <= k < m - 1:
+            adx_pos[k + window] = di_pos
+            adx_neg[k + window] = di_neg
+
+    # ADX: media de los primeros DX y luego suavizado de Wilder
+    offset = window - 1
+    value = 0.0
+    for k in range(window):
+        value += dx[k]
+    value /= window
+    adx[offset + window] = value
+    for k in range(window + 1, m):
+        value = (value * (window - 1) + dx[k - 1]) / window
+        adx[offset + k] = value
+
+    return adx, adx_pos, adx_neg
+
+# Últimos valores de los indicadores clásicos (services/indicators.py).
+# Replican a pandas/ta con los mismos parámetros para no alterar las señales.
+
+@_kernel(f'float64({_F8_1D}, int64)')
+def ema_last_recursive(x: np.ndarray, span: int) -> float:
+    """Último valor de Series.ewm(span=span, adjust=False).mean()"""
+    n = x.shape[0]
+    if n == 0:
+        return np.nan
+    alpha = 2.0 / (span + 1.0)
+    value = x[0]
+    for i in range(1, n):
+        value = (1.0 - alpha) * value + alpha * x[i]
+    return value
+
+@_kernel(f'float64({_F8_1D}, int64)')
+def sma_last(x: np.ndarray, period: int) -> float:
+    """Último valor de Series.rolling(period).mean()"""
+    n = x.shape[0]
+    if n < period:
+        return np.nan
+    total = 0.0
+    for i in range(n - period, n):
+        total += x[i]
+    return total / period
+
+@_kernel(f'float64({_F8_1D}, int64)')
+def rsi_last(x: np.ndarray, period: int) -> float:
+    """Último valor de ta.momentum.RSIIndicator(close, window=period).rsi()"""
+    n = x.shape[0]
+    if n < period:
+        return np.nan
+    alpha = 1.0 / period
+    up = 0.0
+    down = 0.0
+    for i in range(1, n):
+        diff = x[i] - x[i - 1]
+        up = (1.0 - alpha) * up + alpha * (diff if diff > 0 else 0.0)
+        down = (1.0 - alpha) * down + alpha * (-diff if diff < 0 else 0.0)
+    if down == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + up / down)
+
+@_kernel(f'UniTuple(float64, 3)({_F8_1D}, int64, float64)')
+def bollinger_last(x: np.ndarray, period: int, std_dev: float) -> Tuple[float, float, float]:
+    """Última banda (superior, media, inferior) de ta.volatility.BollingerBands (std con ddof=0)"""
+    n = x.shape[0]
+    if n < period:
+        return np.nan, np.nan, np.nan
+    total = 0.0
+    for i in range(n - period, n):
+        total += x[i]
+    middle = total / period
+    ss = 0.0
+    for i in range(n - period, n):
+        d = x[i] - middle
+        ss += d * d
+    width = std_dev * np.sqrt(ss / period)
+    return middle + width, middle, middle - width
+
+@_kernel(f'UniTuple(float64, 2)({_F8_1D}, int64, int64, int64)')
+def macd_last(x: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[float, float]:
+    """Últimos valores (MACD, señal) de ta.trend.MACD"""
+    n = x.shape[0]
+    if n < slow:
+        return np.nan, np.nan
+    alpha_fast = 2.0 / (fast + 1.0)
+    alpha_slow = 2.0 / (slow + 1.0)
+    alpha_signal = 2.0 / (signal + 1.0)
+    ema_fast = x[0]
+    ema_slow = x[0]
+    macd = np.nan
+    signal_line = np.nan
+    for i in range(n):
+        if i > 0:
+            ema_fast = (1.0 - alpha_fast) * ema_fast + alpha_fast * x[i]
+            ema_slow = (1.0 - alpha_slow) * ema_slow + alpha_slow * x[i]
+        if i >= slow - 1:
+            # El MACD existe desde la vela slow-1; la señal arranca ahí
+            macd = ema_fast - ema_slow
+            if i == slow - 1:
+                signal_line = macd
+            else:
+                signal_line = (1.0 - alpha_signal) * signal_line + alpha_signal * macd
+    if n - (slow - 1) < signal:
+        return macd, np.nan
+    return macd, signal_line
+
+# Kernels con versión AOT; services/build_kernels_aot.py compila estas funciones
+JIT_KERNELS = {
+    'ewma_last': ewma_last,
+    'ewma_last_pair': ewma_last_pair,
+    'squeeze_kernel': squeeze_kernel,
+    'ema_last_recursive': ema_last_recursive,
+    'sma_last': sma_last,
+    'rsi_last': rsi_last,
+    'bollinger_last': bollinger_last,
+    'macd_last': macd_last,
+    'adx_kernel': adx_kernel,
+}
+
+# Con AOT los nombres públicos pasan a envolver el .so. El módulo AOT no valida
+# dtypes (un float32 daría resultados basura), por eso cada llamada convierte a
+# float64; sin copia si el array ya lo es.
+if AOT_AVAILABLE:
+    def ewma_last(x: np.ndarray, span: int) -> float:
+        return _aot.ewma_last(np.asarray(x, dtype=np.float64), span)
+
+    def ewma_last_pair(x: np.ndarray, span_fast: int, span_slow: int) -> Tuple[float, float]:
+        return _aot.ewma_last_pair(np.asarray(x, dtype=np.float64), span_fast, span_slow)
+
+    def squeeze_kernel(h: np.ndarray, l: np.ndarray, c: np.ndarray, bb_length: int,
+                       kc_length: int, mult: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return _aot.squeeze_kernel(np.asarray(h, dtype=np.float64), np.asarray(l, dtype=np.float64),
+                                   np.asarray(c, dtype=np.float64), bb_length, kc_length, float(mult))
+
+    def ema_last_recursive(x: np.ndarray, span: int) -> float:
+        return _aot.ema_last_recursive(np.asarray(x, dtype=np.float64), span)
+
+    def sma_last(x: np.ndarray, period: int) -> float:
+        return _aot.sma_last(np.asarray(x, dtype=np.float64), period)
+
+    def rsi_last(x: np.ndarray, period: int) -> float:
+        return _aot.rsi_last(np.asarray(x, dtype=np.float64), period)
+
+    def bollinger_last(x: np.ndarray, period: int, std_dev: float) -> Tuple[float, float, float]:
+        return _aot.bollinger_last(np.asarray(x, dtype=np.float64), period, float(std_dev))
+
+    def macd_last(x: np.ndarray, fast: int, slow: int, signal: int) -> Tuple[float, float]:
+        return _aot.macd_last(np.asarray(x, dtype=np.float64), fast, slow, signal)
+
+    def adx_kernel(h: np.ndarray, l: np.ndarray, c: np.ndarray,
+                   window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return _aot.adx_kernel(np.asarray(h, dtype=np.float64), np.asarray(l, dtype=np.float64),
+                               np.asarray(c, dtype=np.float64), window)
+
+# Kernels compilados (JIT o AOT) disponibles
+COMPILED_KERNELS = NUMBA_AVAILABLE or AOT_AVAILABLE
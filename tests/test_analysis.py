@@ -0,0 +1,85 @@
+"""
+Tests del cálculo de indicadores técnicos (services/indicators.py)
+"""
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import services.indicators as indicators_module
+from models.trading_analysis import Klines, TechnicalIndicators
+from services.indicators import TechnicalIndicatorsCalculator
+
+INDICATOR_FIELDS = ('ema_11', 'ema_55', 'sma_20', 'rsi', 'adx',
+                    'bb_upper', 'bb_middle', 'bb_lower', 'macd', 'macd_signal')
+
+@pytest.fixture
+def ohlcv() -> pd.DataFrame:
+    """100 velas de 1h con precios aleatorios reproducibles"""
+    rng = np.random.default_rng(42)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, 100)))
+    spread = close * rng.uniform(0.001, 0.01, 100)
+    index = pd.Index(1_700_000_000_000 + np.arange(100, dtype=np.int64) * 3_600_000, name='timestamp')
+    return pd.DataFrame({
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(10, 100, 100),
+    }, index=index)
+
+def _calculate(df, compiled: bool, monkeypatch) -> TechnicalIndicators:
+    monkeypatch.setattr(indicators_module, 'COMPILED_KERNELS', compiled)
+    return TechnicalIndicatorsCalculator.calculate_all_indicators(df)
+
+def test_calculate_all_indicators_returns_values(ohlcv, monkeypatch):
+    for compiled in (True, False):
+        indicators = _calculate(ohlcv, compiled, monkeypatch)
+        assert isinstance(indicators, TechnicalIndicators)
+        for field in INDICATOR_FIELDS:
+            value = getattr(indicators, field)
+            assert value is not None and math.isfinite(value), (compiled, field)
+        assert indicators.bb_lower < indicators.bb_middle < indicators.bb_upper
+        assert 0 < indicators.rsi < 100
+
+def test_kernels_match_pandas_path(ohlcv, monkeypatch):
+    compiled = _calculate(ohlcv, True, monkeypatch)
+    reference = _calculate(ohlcv, False, monkeypatch)
+    for field in INDICATOR_FIELDS:
+        assert getattr(compiled, field) == pytest.approx(getattr(reference, field), rel=1e-9), field
+
+def test_kernels_accept_klines(ohlcv, monkeypatch):
+    klines = Klines(
+        timestamp=ohlcv.index.to_numpy(),
+        **{column: ohlcv[column].to_numpy(dtype=np.float64) for column in Klines._fields[1:]}
+    )
+    from_klines = _calculate(klines, True, monkeypatch)
+    from_frame = _calculate(ohlcv, True, monkeypatch)
+    for field in INDICATOR_FIELDS:
+        assert getattr(from_klines, field) == pytest.approx(getattr(from_frame, field), rel=1e-12), field
+
+def test_insufficient_data_returns_empty_indicators(ohlcv):
+    indicators = TechnicalIndicatorsCalculator.calculate_all_indicators(ohlcv.iloc[:30])
+    assert indicators.ema_11 == 0.0
+    assert indicators.rsi == 50.0
+    assert indicators.macd is None
+
+def test_json_serialization_includes_lazy_texts(ohlcv):
+    from datetime import datetime
+    from models.trading_analysis import MarketData, create_analysis
+    from utils.json_utils import make_json_serializable
+    
+    indicators = TechnicalIndicatorsCalculator.calculate_all_indicators(ohlcv)
+    market_data = MarketData('BTCUSDT', 1.0, 2.0, 0.5, 1.5, 100.0, datetime(2024, 1, 1))
+    analysis = create_analysis(
+        symbol='BTCUSDT', market_data=market_data, indicators=indicators,
+        signal='WAIT', signal_strength=0, trend_bias='NEUTRAL',
+        analysis_text=lambda: 'texto', recommendation=lambda: 'recomendación'
+    )
+    
+    result = make_json_serializable(analysis)
+    assert result['analysis_text'] == 'texto'
+    assert result['recommendation'] == 'recomendación'
+    assert result['market_data']['close_price'] == 1.5
+    assert isinstance(result['indicators']['ema_11'], float)
@@ -0,0 +1,249 @@
+"""
+Tests del rate limiting, el single-flight, el cache de precios y las klines de
+services/binance_service.py (sin red: las respuestas se simulan)
+"""
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('binance')
+
+import services.binance_service as binance_module
+from services.binance_service import (
+    GLOBAL_RATE_LIMIT_KEY, GLOBAL_RATE_LIMIT_SCRIPT, GLOBAL_RATE_LIMIT_TOTAL_KEY,
+    GLOBAL_RATE_LIMIT_WEIGHT, GLOBAL_RATE_LIMIT_WINDOW_MS, BinanceService, TokenBucket,
+    _klines_weight
+)
+
+@pytest.fixture
+def service(monkeypatch):
+    """BinanceService sin conexión real con Binance"""
+    monkeypatch.setattr(BinanceService, '_check_connection', lambda self: True)
+    svc = BinanceService(price_fresh_ttl=5, price_stale_ttl=30)
+    yield svc
+    svc.close()
+
+def test_single_flight_shares_one_call(service):
+    calls = []
+    release = threading.Event()
+
+    def fetch(symbol):
+        calls.append(symbol)
+        release.wait(5)
+        return 42.0
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            service._single_flight(('price', 'BTCUSDT'), fetch, 'BTCUSDT')))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    # Todos los hilos deben estar esperando el mismo request antes de liberarlo
+    deadline = time.monotonic() + 5
+    while not calls and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ['BTCUSDT']
+    assert results == [42.0] * 8
+    assert service._inflight == {}
+
+def test_single_flight_propagates_exceptions(service):
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        raise ValueError('binance caído')
+
+    errors = []
+
+    def call():
+        try:
+            service._single_flight(('price', 'ETHUSDT'), fetch)
+        except ValueError as e:
+            errors.append(str(e))
+
+    owner = threading.Thread(target=call)
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+
+    assert errors == ['binance caído'] * 2
+    # La clave se libera: la siguiente llamada vuelve a ejecutar fn
+    assert service._single_flight(('price', 'ETHUSDT'), lambda: 1.0) == 1.0
+
+def test_token_bucket_waits_for_negative_balance(monkeypatch):
+    clock = [1000.0]
+    sleeps = []
+    monkeypatch.setattr(binance_module.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(binance_module.time, 'sleep', sleeps.append)
+
+    bucket = TokenBucket(rate=10, capacity=20)
+    bucket.acquire(15)  # saldo 5: no espera
+    assert sleeps == []
+    bucket.acquire(10)  # saldo -5: 0.5 s
+    assert sleeps == [pytest.approx(0.5)]
+    bucket.acquire(5)   # saldo -10: la reserva anterior alarga la espera
+    assert sleeps[-1] == pytest.approx(1.0)
+
+    clock[0] += 2.0     # +20 tokens -> saldo 10
+    bucket.acquire(10)
+    assert len(sleeps) == 2
+
+def test_klines_weight_tiers():
+    assert [_klines_weight(n) for n in (1, 99, 100, 499, 500, 1000, 1001)] == [1, 1, 2, 2, 5, 5, 10]
+
+def test_price_cache_fresh_stale_and_expired(service, monkeypatch):
+    now = [10_000.0]
+    fetches, refreshes = [], []
+    monkeypatch.setattr(binance_module.time, 'time', lambda: now[0])
+    monkeypatch.setattr(service, '_fetch_current_price',
+                        lambda symbol: fetches.append(symbol) or 2.0)
+    monkeypatch.setattr(service, '_schedule_price_refresh', refreshes.append)
+    service._price_cache['BTCUSDT'] = {'price': 1.0, 'timestamp': now[0]}
+
+    # Fresco: se sirve sin refrescar
+    now[0] += 4
+    assert service.get_current_price('BTCUSDT') == 1.0
+    assert refreshes == [] and fetches == []
+
+    # Obsoleto: se sirve y se refresca en segundo plano
+    now[0] += 2
+    assert service.get_current_price('BTCUSDT') == 1.0
+    assert refreshes == ['BTCUSDT'] and fetches == []
+
+    # Caducado: request síncrono
+    now[0] += 30
+    assert service.get_current_price('BTCUSDT') == 2.0
+    assert fetches == ['BTCUSDT']
+
+def test_global_quota_script(service, monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    service._redis = fakeredis.FakeRedis()
+    service._global_rate_limit = service._redis.register_script(GLOBAL_RATE_LIMIT_SCRIPT)
+    redis_client = service._redis
+
+    now_ms = 1_700_000_000_000
+
+    def run(weight, now=now_ms):
+        return service._global_rate_limit(
+            keys=[GLOBAL_RATE_LIMIT_KEY, GLOBAL_RATE_LIMIT_TOTAL_KEY],
+            args=[now, GLOBAL_RATE_LIMIT_WINDOW_MS, GLOBAL_RATE_LIMIT_WEIGHT, weight, f'req{now}']
+        )
+
+    def total():
+        return int(redis_client.get(GLOBAL_RATE_LIMIT_TOTAL_KEY))
+
+    assert run(GLOBAL_RATE_LIMIT_WEIGHT - 5) == 0
+    # Un miembro por request, con su peso; el total lleva la suma
+    assert redis_client.zrange(GLOBAL_RATE_LIMIT_KEY, 0, -1) == [
+        f'req{now_ms}:{GLOBAL_RATE_LIMIT_WEIGHT - 5}'.encode()
+    ]
+    assert total() == GLOBAL_RATE_LIMIT_WEIGHT - 5
+    # Ventana llena: ms hasta que caduque la reserva más antigua
+    assert run(10, now_ms + 1000) == GLOBAL_RATE_LIMIT_WINDOW_MS - 1000
+    assert total() == GLOBAL_RATE_LIMIT_WEIGHT - 5
+    assert run(5, now_ms + 2000) == 0
+    assert total() == GLOBAL_RATE_LIMIT_WEIGHT
+    # Pasada la ventana de la primera reserva se descuenta su peso
+    assert run(10, now_ms + GLOBAL_RATE_LIMIT_WINDOW_MS) == 0
+    assert total() == 15
+    assert redis_client.zcard(GLOBAL_RATE_LIMIT_KEY) == 2
+    assert run(20, now_ms + GLOBAL_RATE_LIMIT_WINDOW_MS + 2000) == 0
+    assert total() == 30
+
+    # _acquire_global_quota espera lo que indica el script y reintenta
+    redis_client.flushall()
+    run(GLOBAL_RATE_LIMIT_WEIGHT, int(time.time() * 1000))
+    sleeps = []
+    monkeypatch.setattr(binance_module.time, 'sleep', lambda s: (sleeps.append(s), redis_client.flushall()))
+    service._acquire_global_quota(5)
+    assert len(sleeps) == 1 and sleeps[0] > 0
+    assert redis_client.zcard(GLOBAL_RATE_LIMIT_KEY) == 1
+    assert total() == 5
+
+def test_stream_serves_only_its_own_prices(service, monkeypatch):
+    fetches = []
+    monkeypatch.setattr(service, '_fetch_current_price',
+                        lambda symbol: fetches.append(symbol) or 3.0)
+    # Precio REST de antes del stream, ya caducado
+    service._price_cache['ETHUSDT'] = {'price': 1.0, 'timestamp': time.time() - 600}
+
+    service._on_miniticker([{'s': 'BTCUSDT', 'c': '50000.5'}])
+    assert service.get_current_price('BTCUSDT') == 50000.5
+    assert service._live_prices(['BTCUSDT']) == {'BTCUSDT': 50000.5}
+    # ETHUSDT no llegó por el stream: TTL normal -> request
+    assert service._live_prices(['BTCUSDT', 'ETHUSDT']) is None
+    assert service.get_current_price('ETHUSDT') == 3.0
+    assert fetches == ['ETHUSDT']
+
+    # Reconexión tras un silencio: los tickers previos dejan de valer
+    service._stream_last_frame = time.monotonic() - 60
+    service._on_miniticker([{'s': 'SOLUSDT', 'c': '150'}])
+    assert 'BTCUSDT' not in service._live_tickers
+    assert service._live_prices(['SOLUSDT']) == {'SOLUSDT': 150.0}
+
+class _KlinesResponse:
+    """Respuesta mínima de requests con el JSON de /api/v3/klines"""
+
+    def __init__(self, rows):
+        self.content = json.dumps(rows).encode()
+
+    def raise_for_status(self):
+        pass
+
+def _kline_rows(start: int, count: int, step: int = 3_600_000):
+    return [[start + i * step, '1', '2', '0.5', str(1 + i), '10'] for i in range(count)]
+
+def test_incremental_klines_request_small_limit(service, monkeypatch):
+    step = 3_600_000
+    requests_sent = []
+
+    def fake_get(url, params=None, timeout=None):
+        requests_sent.append(dict(params))
+        if 'startTime' not in params:
+            return _KlinesResponse(_kline_rows(0, params['limit']))
+        start = params['startTime']
+        available = 2 if len(requests_sent) == 2 else 50
+        return _KlinesResponse(_kline_rows(start, min(available, params['limit'])))
+
+    monkeypatch.setattr(service.session, 'get', fake_get)
+
+    full = service._download_klines('BTCUSDT', '1h', 100)
+    assert len(full) == 100 and requests_sent[0]['limit'] == 100
+
+    # Vela abierta + 1 nueva: un request pequeño y la ventana se desliza
+    df = service._download_klines('BTCUSDT', '1h', 100)
+    assert requests_sent[1]['limit'] == binance_module.KLINES_INCREMENTAL_LIMIT
+    assert len(df) == 100
+    assert int(df.index[-1]) == 100 * step
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+
+    # Respuesta llena: se repite la descarga completa
+    df = service._download_klines('BTCUSDT', '1h', 100)
+    assert requests_sent[2]['limit'] == binance_module.KLINES_INCREMENTAL_LIMIT
+    assert 'startTime' not in requests_sent[3] and requests_sent[3]['limit'] == 100
+    assert len(df) == 100
+
+def test_multiple_prices_filters_fresh_snapshot(service, monkeypatch):
+    def no_request(*args, **kwargs):
+        raise AssertionError('no debería haber request')
+
+    monkeypatch.setattr(service.session, 'get', no_request)
+    service._cache_response(('all_prices',), {'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0, 'BNBUSDT': 600.0})
+    assert service.get_multiple_prices(['BTCUSDT', 'ETHUSDT']) == {'BTCUSDT': 50000.0, 'ETHUSDT': 3000.0}
@@ -3,7 +3,7 @@
 Utilidades para la aplicación de trading
 """
 from .logger import setup_logger, app_logger, analysis_logger, websocket_logger, binance_logger
-from .json_utils import make_json_serializable, safe_json_dumps, debug_json_serialization, clean_analysis_dict
+from .json_utils import make_json_serializable, safe_json_dumps, debug_json_serialization, clean_analysis_dict, json_loads
 
 __all__ = [
     'setup_logger',
@@ -14,5 +14,6 @@ __all__ = [
     'make_json_serializable',
     'safe_json_dumps', 
     'debug_json_serialization',
-    'clean_analysis_dict'
+    'clean_analysis_dict',
+    'json_loads'
 ]
\ No newline at end of file
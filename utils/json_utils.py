@@ -10,6 +10,21 @@ from dataclasses import asdict, is_dataclass
 from typing import Any, Dict, List, Union
 from utils.logger import app_logger
 
+# Decodificador JSON más rápido disponible; todos aceptan bytes (response.content)
+try:
+    import orjson
+    json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    try:
+        # ujson (en requirements.txt) sigue siendo más rápido que json estándar
+        import ujson
+        json_loads = ujson.loads
+    except ImportError:
+        # json estándar también acepta bytes (UTF-8)
+        json_loads = json.loads
+
 logger = app_logger
 
 def make_json_serializable(obj: Any) -> Any:
@@ -30,11 +45,13 @@ def make_json_serializable(obj: Any) -> Any:
         return [make_json_serializable(item) for item in obj]
     elif isinstance(obj, bool):
         return obj  # Los bool de Python SÍ son JSON serializables
-    elif isinstance(obj, (np.bool_, np.bool8)):
+    elif isinstance(obj, (str, int)):
+        return obj
+    elif isinstance(obj, np.bool_):
         return bool(obj)  # Convertir numpy bool a Python bool
     elif isinstance(obj, (np.integer, np.int8, np.int16, np.int32, np.int64)):
         return int(obj)
-    elif isinstance(obj, (np.floating, np.float16, np.float32, np.float64)):
+    elif isinstance(obj, (float, np.floating)):
         if np.isnan(obj) or np.isinf(obj):
             logger.warning(f"Convirtiendo NaN/Inf a None: {obj}")
             return None
@@ -45,6 +62,10 @@ def make_json_serializable(obj: Any) -> Any:
         return obj.isoformat()
     elif isinstance(obj, Decimal):
         return float(obj)
+    elif not isinstance(obj, type) and callable(getattr(obj, 'to_dict', None)):
+        # to_dict propio antes que asdict: TradingAnalysis genera ahí sus
+        # textos (cached_property), que asdict no incluye
+        return make_json_serializable(obj.to_dict())
     elif is_dataclass(obj):
         return make_json_serializable(asdict(obj))
     elif hasattr(obj, '__dict__'):
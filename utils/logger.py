@@ -79,6 +79,8 @@ class ColoredFormatter(logging.Formatter):
         if not any(emoji in original_msg for emoji in ['🔍', '📊', '⚠️', '❌', '🚨']):
             emoji = emoji_map.get(record.levelname.replace(level_color, '').replace(reset_color, ''), '')
             record.msg = f"{emoji} {original_msg}"
+            # El mensaje ya va interpolado: sin args para no formatearlo dos veces
+            record.args = None
         
         return super().format(record)
 